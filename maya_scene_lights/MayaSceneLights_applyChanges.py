@@ -2,21 +2,26 @@ __author__ = 'Carlos Montes'
 
 ''' Modifies intensity, color and/or shadow color of selected lights by a certain amount. '''
 
-import pymel.core as pmc
+import maya.cmds as cmds
+
+import mayautils
 
 def change_intensity(quantity, operator, lights, keyframe):
 
     """
     Changes the intensity of passed array of Maya Light Transform nodes; may set animation keyframe.
     :param quantity: Amount of intensity to change
-    :param operator: Modifying operator value. 0 = fixed quantity, 1 = addition, 2 = multiplication, 3 = add percentage
-    :param lights: Array of Light nodeTypes
+    :param operator: Modifying operator value. 0 = fixed quantity, 1 = addition, 2 = multiplication, 3 = add percentage,
+    4 = set exposure stops (EV), 5 = add exposure stops
+    :param lights: Array of Light nodeTypes, by name or by MObjectHandle
     :param keyframe: Boolean to define whether to set a keyframe or not
     :return: None
     """
 
+    lights = mayautils.light_names(lights)
+
     if not lights:
-        pmc.warning('Please select one or more lights in the Light Interface window\'s list')
+        cmds.warning('Please select one or more lights in the Light Interface window\'s list')
         return
 
     # Closure that returns a calculated value according to the selected operator
@@ -30,47 +35,55 @@ def change_intensity(quantity, operator, lights, keyframe):
         mult = lambda x: x * quantity
         percentage = lambda x: x + (x * quantity / 100.0)
 
+        # Exposure stops are powers of two of the intensity; EV 0 is an intensity of 1
+        set_stops = lambda x: 2.0 ** quantity
+        add_stops = lambda x: x * 2.0 ** quantity
+
         # Choose an operation based on the passed operator
         operation = {
             0: fixed,
             1: add,
             2: mult,
-            3: percentage
+            3: percentage,
+            4: set_stops,
+            5: add_stops
         }[operator]
 
         return operation(current_value)
 
     # Retrieves current frame the user is on
-    currentFrame = pmc.currentTime(query=True)
+    currentFrame = cmds.currentTime(query=True)
 
     for light in lights:
 
         # Get Intensity attribute of this specific light
-        new_value = calculate_value(pmc.getAttr('%s.intensity' % light))
+        new_value = calculate_value(cmds.getAttr('%s.intensity' % light))
 
         if keyframe is True:
             # cutKey deletes animation found in a certain frame
-            pmc.cutKey(light, time=(currentFrame, currentFrame), attribute="intensity")
+            cmds.cutKey(light, time=(currentFrame, currentFrame), attribute="intensity")
 
             # Set a keyframe in the current light
-            pmc.setKeyframe(light, time=currentFrame, attribute="intensity", value=new_value)
+            cmds.setKeyframe(light, time=currentFrame, attribute="intensity", value=new_value)
 
         # Set Intensity value
-        pmc.setAttr('%s.intensity' % light, new_value)
+        cmds.setAttr('%s.intensity' % light, new_value)
 
 def change_color(color_value, lights, keyframe, color_or_shadow):
 
     """
     Changes the light color or shadow color of a passed array of lights; may set animation keyframe.
     :param color_value: Array of integers that defines the RGB values to assign to the selected lights' color
-    :param lights: Array of Light nodeTypes
+    :param lights: Array of Light nodeTypes, by name or by MObjectHandle
     :param keyframe: Boolean to define whether to set a keyframe or not
     :param color_or_shadow: Integer that tells whether to set a color or a shadow color (1 = color, 2 = shadow)
     :return: None
     """
 
+    lights = mayautils.light_names(lights)
+
     if not lights:
-        pmc.warning('Please select one or more lights in the Light Interface window\'s list')
+        cmds.warning('Please select one or more lights in the Light Interface window\'s list')
         return
 
     # Attribute name of light and its corresponding prefix for RGB attributes (used in keyframe animation)
@@ -80,7 +93,7 @@ def change_color(color_value, lights, keyframe, color_or_shadow):
     }[color_or_shadow]
 
     # Retrieves current frame the user is on
-    currentFrame = pmc.currentTime(query=True)
+    currentFrame = cmds.currentTime(query=True)
     rgb_array = ('R', 'G', 'B')
 
     # Closure that cuts and sets keyframes in their respective RGB attributes
@@ -94,10 +107,10 @@ def change_color(color_value, lights, keyframe, color_or_shadow):
 
         for color in rgb_array:
             # cutKey deletes animation found in a certain frame
-            pmc.cutKey(light, time=(currentFrame, currentFrame), attribute=prefix+color)
+            cmds.cutKey(light, time=(currentFrame, currentFrame), attribute=prefix+color)
 
             # Set a keyframe in the current light
-            pmc.setKeyframe(light, time=currentFrame, attribute=prefix+color, value=color_value[i])
+            cmds.setKeyframe(light, time=currentFrame, attribute=prefix+color, value=color_value[i])
 
             i += 1
 
@@ -107,4 +120,55 @@ def change_color(color_value, lights, keyframe, color_or_shadow):
             set_rgb_keyframes(attr[1])
 
         # Set color or shadow value
-        pmc.setAttr('%s.%s' % (light, attr[0]), color_value)
\ No newline at end of file
+        cmds.setAttr('%s.%s' % (light, attr[0]), *color_value)
+
+def change_visibility(lights, visible):
+
+    """
+    Shows or hides a passed array of lights, to enable or disable them.
+    :param lights: Array of Light nodeTypes, by name or by MObjectHandle
+    :param visible: Boolean visibility to set
+    :return: None
+    """
+
+    lights = mayautils.light_names(lights)
+
+    if not lights:
+        cmds.warning('Please select one or more lights in the Light Interface window\'s list')
+        return
+
+    for light in lights:
+        cmds.setAttr('%s.visibility' % light, visible)
+
+def set_intensities(lights, values, keyframe):
+
+    """
+    Sets a different intensity on each light of a passed array of lights; may set animation keyframe.
+    :param lights: Array of Light nodeTypes, by name or by MObjectHandle
+    :param values: Array of intensities, in the same order as lights
+    :param keyframe: Boolean to define whether to set a keyframe or not
+    :return: None
+    """
+
+    # Resolve the lights one by one, so deleted ones don't shift the values of the rest
+    pairs = [(name, value) for light, value in zip(lights, values)
+             for name in mayautils.light_names([light])]
+
+    if not pairs:
+        cmds.warning('Please select one or more lights in the Light Interface window\'s list')
+        return
+
+    # Retrieves current frame the user is on
+    currentFrame = cmds.currentTime(query=True)
+
+    for light, value in pairs:
+
+        if keyframe is True:
+            # cutKey deletes animation found in a certain frame
+            cmds.cutKey(light, time=(currentFrame, currentFrame), attribute="intensity")
+
+            # Set a keyframe in the current light
+            cmds.setKeyframe(light, time=currentFrame, attribute="intensity", value=value)
+
+        # Set Intensity value
+        cmds.setAttr('%s.intensity' % light, value)
\ No newline at end of file
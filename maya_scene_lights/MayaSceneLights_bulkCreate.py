@@ -0,0 +1,220 @@
+__author__ = 'Carlos Montes'
+
+''' Creates many lights from a template light with one MDagModifier, as a single undoable command. '''
+
+import maya.cmds as cmds
+import maya.OpenMaya as OpenMaya
+import maya.OpenMayaMPx as OpenMayaMPx
+
+import mayautils
+
+
+COMMAND_NAME = 'lightInterfaceBulkCreate'
+
+# Light types the command can create
+LIGHT_TYPES = ('spotLight', 'pointLight', 'areaLight', 'directionalLight', 'ambientLight', 'volumeLight')
+
+# Attributes copied from the template light, when the new light type has them
+TEMPLATE_ATTRIBUTES = ('intensity', 'colorR', 'colorG', 'colorB',
+                       'shadColorR', 'shadColorG', 'shadColorB',
+                       'emitDiffuse', 'emitSpecular', 'decayRate',
+                       'coneAngle', 'penumbraAngle', 'dropoff',
+                       'useDepthMapShadows', 'useRayTraceShadows')
+
+# Transform attributes set on every new light, from its translate and rotate values
+TRANSFORM_ATTRIBUTES = ('translateX', 'translateY', 'translateZ',
+                        'rotateX', 'rotateY', 'rotateZ')
+
+
+def create_lights(template, translations, rotations=None, light_type=None):
+    """
+    Creates lights copying the attributes of a template light, in a single undo step.
+    :param template: Name of the template light's Transform or shape node
+    :param translations: Array of (x, y, z) positions, one per new light
+    :param rotations: Optional array of (x, y, z) rotations in degrees, one per new light
+    :param light_type: Type of the new lights; the template's type if None
+    :return: List of the new lights' Transform names
+    """
+    mayautils.load_plugin(__file__)
+
+    flags = {'translate': [tuple(translation) for translation in translations]}
+
+    if rotations is not None:
+        flags['rotate'] = [tuple(rotation) for rotation in rotations]
+
+    if light_type is not None:
+        flags['lightType'] = light_type
+
+    return getattr(cmds, COMMAND_NAME)(template, **flags) or []
+
+
+def default_light_set():
+    """
+    :return: MObject of the defaultLightSet, the set lights have to be in to illuminate and be linked
+    """
+    selection = OpenMaya.MSelectionList()
+    selection.add('defaultLightSet')
+    light_set = OpenMaya.MObject()
+    selection.getDependNode(0, light_set)
+    return light_set
+
+
+def next_array_index(plug):
+    """
+    :param plug: Array MPlug
+    :return: First logical index after the plug's existing elements, like connectAttr -nextAvailable
+    """
+    indices = OpenMaya.MIntArray()
+    plug.getExistingArrayAttributeIndices(indices)
+    return max(indices[i] for i in range(indices.length())) + 1 if indices.length() else 0
+
+
+def template_values(template):
+    """
+    :param template: Name of the template light's Transform or shape node
+    :return: Tuple of (light type, dictionary of attribute -> value)
+    """
+    selection = OpenMaya.MSelectionList()
+    selection.add(template)
+    path = OpenMaya.MDagPath()
+    selection.getDagPath(0, path)
+
+    if path.node().hasFn(OpenMaya.MFn.kTransform):
+        path.extendToShape()
+
+    node = OpenMaya.MFnDependencyNode(path.node())
+
+    if node.typeName() not in LIGHT_TYPES:
+        raise RuntimeError('%s is not a light' % template)
+
+    values = dict((attribute, node.findPlug(attribute).asDouble())
+                  for attribute in TEMPLATE_ATTRIBUTES if node.hasAttribute(attribute))
+
+    return node.typeName(), values
+
+
+class BulkCreateCommand(OpenMayaMPx.MPxCommand):
+    """
+    lightInterfaceBulkCreate template -translate x y z [-translate ...] [-rotate x y z ...] [-lightType type]
+    Creates one light per -translate flag, with every creation and attribute value
+    in the same MDagModifier, so undo and redo are a single step.
+    """
+
+    def __init__(self):
+        OpenMayaMPx.MPxCommand.__init__(self)
+        self.modifier = OpenMaya.MDagModifier()
+        self.transforms = []
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, arguments):
+        database = OpenMaya.MArgDatabase(self.syntax(), arguments)
+
+        template = database.commandArgumentString(0)
+        template_type, values = template_values(template)
+
+        light_type = template_type
+        if database.isFlagSet('-lt'):
+            light_type = database.flagArgumentString('-lt', 0)
+
+        if light_type not in LIGHT_TYPES:
+            raise RuntimeError('Unsupported light type: %s' % light_type)
+
+        translations = self.flag_vectors(database, '-t')
+        rotations = self.flag_vectors(database, '-r')
+
+        for _ in translations:
+            transform = self.modifier.createNode(light_type)
+            self.transforms.append(OpenMaya.MObjectHandle(transform))
+
+        # The nodes have to exist before their plugs can be looked up
+        self.modifier.doIt()
+
+        # Like shadingNode -asLight, every light joins the defaultLightSet, so it
+        # illuminates the scene and shows up in light linking
+        set_members = OpenMaya.MFnDependencyNode(default_light_set()).findPlug('dagSetMembers')
+        member_index = next_array_index(set_members)
+
+        for index, translation in enumerate(translations):
+            transform = self.transforms[index].object()
+            transform_node = OpenMaya.MFnDependencyNode(transform)
+            self.modifier.renameNode(transform, light_type + '#')
+
+            rotation = rotations[index] if index < len(rotations) else (0.0, 0.0, 0.0)
+            for attribute, value in zip(TRANSFORM_ATTRIBUTES, tuple(translation) + tuple(rotation)):
+                self.modifier.newPlugValueDouble(transform_node.findPlug(attribute), value)
+
+            shape = OpenMaya.MFnDependencyNode(OpenMaya.MFnDagNode(transform).child(0))
+            self.modifier.connect(shape.findPlug('instObjGroups').elementByLogicalIndex(0),
+                                  set_members.elementByLogicalIndex(member_index + index))
+
+            for attribute, value in values.items():
+                if shape.hasAttribute(attribute):
+                    self.modifier.newPlugValueDouble(shape.findPlug(attribute), value)
+
+        self.redoIt()
+
+    def redoIt(self):
+        self.modifier.doIt()
+
+        self.clearResult()
+        for handle in self.transforms:
+            path = OpenMaya.MDagPath()
+            OpenMaya.MDagPath.getAPathTo(handle.object(), path)
+            self.appendToResult(path.partialPathName())
+
+    def undoIt(self):
+        self.modifier.undoIt()
+
+    @staticmethod
+    def flag_vectors(database, flag):
+        """
+        :param database: MArgDatabase of the command
+        :param flag: Short name of a multi-use flag with three double arguments
+        :return: List of (x, y, z) tuples, one per use of the flag
+        """
+        vectors = []
+
+        for use in range(database.numberOfFlagUses(flag)):
+            arguments = OpenMaya.MArgList()
+            database.getFlagArgumentList(flag, use, arguments)
+            vectors.append((arguments.asDouble(0), arguments.asDouble(1), arguments.asDouble(2)))
+
+        return vectors
+
+    @staticmethod
+    def creator():
+        return OpenMayaMPx.asMPxPtr(BulkCreateCommand())
+
+    @staticmethod
+    def syntax_creator():
+        syntax = OpenMaya.MSyntax()
+        syntax.addArg(OpenMaya.MSyntax.kString)
+
+        double = OpenMaya.MSyntax.kDouble
+        syntax.addFlag('-t', '-translate', double, double, double)
+        syntax.makeFlagMultiUse('-t')
+        syntax.addFlag('-r', '-rotate', double, double, double)
+        syntax.makeFlagMultiUse('-r')
+        syntax.addFlag('-lt', '-lightType', OpenMaya.MSyntax.kString)
+
+        return syntax
+
+
+def initializePlugin(plugin):
+    """
+    Registers the command when Maya loads this module as a plugin.
+    :param plugin: MObject of the plugin
+    :return: None
+    """
+    mayautils.register_command(plugin, COMMAND_NAME, BulkCreateCommand)
+
+
+def uninitializePlugin(plugin):
+    """
+    Deregisters the command when Maya unloads this module as a plugin.
+    :param plugin: MObject of the plugin
+    :return: None
+    """
+    mayautils.deregister_command(plugin, COMMAND_NAME)
@@ -0,0 +1,183 @@
+__author__ = 'Carlos Montes'
+
+''' Client of the light command server, and a stub server to measure its latency and throughput without Maya. '''
+
+import json
+import socket
+import sys
+import threading
+import time
+import Queue
+
+import MayaSceneLights_commandServer as commandServer
+
+
+class CommandClient(object):
+    """
+    Sends JSON-RPC requests to the light command server over a single connection.
+    """
+
+    def __init__(self, host=commandServer.HOST, port=commandServer.DEFAULT_PORT):
+        """
+        :param host: Address of the server
+        :param port: Port of the server
+        :return: None
+        """
+        self.connection = socket.create_connection((host, port))
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.rfile = self.connection.makefile('rb')
+        self.next_id = 0
+
+    def close(self):
+        """
+        :return: None
+        """
+        self.rfile.close()
+        self.connection.close()
+
+    def request(self, method, params):
+        """
+        :param method: Method name
+        :param params: List or dictionary of parameters
+        :return: JSON-RPC request dictionary with a new id
+        """
+        self.next_id += 1
+        return {'jsonrpc': '2.0', 'id': self.next_id, 'method': method, 'params': params}
+
+    def call(self, method, *params):
+        """
+        Run a method and wait for its result.
+        :param method: Method name
+        :param params: Positional parameters of the method
+        :return: Result of the method
+        """
+        return self.pipeline([(method, list(params))])[0]
+
+    def pipeline(self, calls):
+        """
+        Send several requests before reading any response, so the server can run them in one batch.
+        :param calls: Array of (method name, list of parameters) tuples
+        :return: List of results, in the order of calls
+        """
+        requests = [self.request(method, params) for method, params in calls]
+        self.connection.sendall(''.join(json.dumps(request) + '\n' for request in requests))
+
+        return [result(json.loads(self.rfile.readline())) for _ in requests]
+
+    def batch(self, calls):
+        """
+        Send several requests as a single JSON-RPC batch.
+        :param calls: Array of (method name, list of parameters) tuples
+        :return: List of results, in the order of calls
+        """
+        requests = [self.request(method, params) for method, params in calls]
+        self.connection.sendall(json.dumps(requests) + '\n')
+
+        return [result(response) for response in json.loads(self.rfile.readline())]
+
+
+def result(response):
+    """
+    :param response: JSON-RPC response dictionary
+    :return: The response's result; a RuntimeError is raised for error responses
+    """
+    if 'error' in response:
+        raise RuntimeError('%(message)s (%(code)d)' % response['error'])
+
+    return response['result']
+
+
+class MainThreadStub(object):
+    """
+    Stands in for Maya's main thread: callables passed to execute_deferred() run, in order,
+    on a single thread that is only idle once per frame, like Maya's idle queue.
+    """
+
+    def __init__(self, frame=0.0):
+        """
+        :param frame: Seconds the stub thread waits between two idle passes
+        :return: None
+        """
+        self.frame = frame
+        self.queue = Queue.Queue()
+
+        thread = threading.Thread(target=self.run)
+        thread.daemon = True
+        thread.start()
+
+    def execute_deferred(self, function):
+        """
+        :param function: Callable to run on the stub main thread
+        :return: None
+        """
+        self.queue.put(function)
+
+    def run(self):
+        while True:
+            self.queue.get()()
+
+            if self.frame:
+                time.sleep(self.frame)
+
+
+def stub_server(frame=0.0):
+    """
+    Start a command server on a free port, with a stub main thread and a 'ping' method.
+    :param frame: Seconds the stub main thread waits between two idle passes
+    :return: The running CommandServer; stop() it when done
+    """
+    main_thread = MainThreadStub(frame)
+    dispatcher = commandServer.CommandDispatcher({'ping': lambda: True}, main_thread.execute_deferred)
+
+    server = commandServer.CommandServer(dispatcher, 0)
+    server.start()
+    return server
+
+
+def benchmark(port=None, count=1000, frame=0.0):
+    """
+    Measures the round trip latency of single requests, and the throughput of pipelined ones.
+    :param port: Port of a running server; a stub server is started if None
+    :param count: Number of requests sent by each measurement
+    :param frame: Seconds between idle passes of the stub server's main thread
+    :return: Dictionary with the 'median' and 'worst' latency in milliseconds, the
+    pipelined 'throughput' in requests per second, and the 'batches' the stub server ran them in
+    """
+    server = stub_server(frame) if port is None else None
+    client = CommandClient(port=server.server_address[1] if server else port)
+
+    try:
+        latencies = []
+        for _ in range(count):
+            started = time.time()
+            client.call('ping')
+            latencies.append((time.time() - started) * 1000.0)
+
+        latencies.sort()
+
+        batches = server.dispatcher.batches if server else 0
+        started = time.time()
+        client.pipeline([('ping', [])] * count)
+        elapsed = time.time() - started
+
+        results = {
+            'median': latencies[len(latencies) // 2],
+            'worst': latencies[-1],
+            'throughput': count / elapsed if elapsed else float('inf'),
+            'batches': server.dispatcher.batches - batches if server else None
+        }
+    finally:
+        client.close()
+        if server:
+            server.stop()
+
+    print 'Latency: %.3f ms median, %.3f ms worst' % (results['median'], results['worst'])
+    print 'Pipelined: %.0f requests/s' % results['throughput']
+    if results['batches'] is not None:
+        print 'Pipelined %d requests in %d main thread batch(es)' % (count, results['batches'])
+
+    return results
+
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else None)
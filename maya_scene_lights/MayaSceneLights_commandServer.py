@@ -0,0 +1,374 @@
+__author__ = 'Carlos Montes'
+
+''' Opt-in local JSON-RPC server that runs light queries and changes sent by tools outside Maya. '''
+
+import inspect
+import json
+import SocketServer
+import threading
+import Queue
+
+
+# Only connections from this machine are accepted
+HOST = '127.0.0.1'
+DEFAULT_PORT = 7410
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+# Server started by start(), if any
+_server = None
+
+
+class CommandDispatcher(object):
+    """
+    Collects the requests of every connection and runs them on Maya's main thread in
+    batches: the first request queued schedules one deferred call, and that call runs
+    every request queued by then, so a burst of requests costs a single trip to the main thread.
+    """
+
+    def __init__(self, methods, scheduler):
+        """
+        :param methods: Dictionary of method name -> function, called with the request's params
+        :param scheduler: Function that runs a callable on the main thread later, like maya.utils.executeDeferred
+        :return: None
+        """
+        self.methods = methods
+        self.scheduler = scheduler
+
+        # Requests waiting for the main thread, as (request, PendingResponse) tuples
+        self.queue = []
+        self.scheduled = False
+        self.lock = threading.Lock()
+
+        # Number of deferred calls and of requests run, to measure how well requests are batched
+        self.batches = 0
+        self.requests = 0
+
+    def submit(self, request):
+        """
+        Queue a request from a connection thread.
+        :param request: Decoded JSON-RPC request dictionary
+        :return: PendingResponse, whose wait() returns the encoded response
+        """
+        pending = PendingResponse()
+
+        with self.lock:
+            self.queue.append((request, pending))
+            schedule = not self.scheduled
+            self.scheduled = True
+
+        if schedule:
+            self.scheduler(self.run_queued)
+
+        return pending
+
+    def run_queued(self):
+        """
+        Run every queued request, on the main thread.
+        :return: None
+        """
+        with self.lock:
+            batch = self.queue
+            self.queue = []
+            self.scheduled = False
+
+        self.batches += 1
+        self.requests += len(batch)
+
+        for request, pending in batch:
+            pending.set(self.execute(request))
+
+    def execute(self, request):
+        """
+        Run a request and encode its response. Results that can't be encoded as JSON are
+        answered with an error here, on the main thread, instead of in the connection's writer.
+        :param request: Decoded JSON-RPC request dictionary
+        :return: JSON-RPC response, encoded as JSON text
+        """
+        response = self.run_request(request)
+
+        try:
+            return json.dumps(response)
+        except (TypeError, ValueError) as error:
+            return json.dumps(error_response(response['id'], SERVER_ERROR,
+                                             'Result is not JSON serializable: %s' % error))
+
+    def run_request(self, request):
+        """
+        :param request: Decoded JSON-RPC request dictionary
+        :return: JSON-RPC response dictionary
+        """
+        request_id = request.get('id') if isinstance(request, dict) else None
+
+        if not isinstance(request, dict) or not isinstance(request.get('method'), basestring):
+            return error_response(request_id, INVALID_REQUEST, 'Invalid request')
+
+        function = self.methods.get(request['method'])
+        if function is None:
+            return error_response(request_id, METHOD_NOT_FOUND, 'Unknown method: %s' % request['method'])
+
+        params = request.get('params', [])
+
+        if isinstance(params, dict):
+            args, kwargs = [], dict((str(key), value) for key, value in params.items())
+        elif isinstance(params, list):
+            args, kwargs = params, {}
+        else:
+            return error_response(request_id, INVALID_PARAMS, 'params must be an array or an object')
+
+        # The parameters are checked against the method's signature before calling it,
+        # so errors raised inside the method are never reported as invalid parameters
+        try:
+            inspect.getcallargs(getattr(function, 'wrapped', function), *args, **kwargs)
+        except TypeError as error:
+            return error_response(request_id, INVALID_PARAMS, str(error))
+
+        try:
+            result = function(*args, **kwargs)
+        except Exception as error:
+            return error_response(request_id, SERVER_ERROR, str(error))
+
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+
+class PendingResponse(object):
+    """
+    Response to a queued request, filled in by the main thread and waited for by a connection thread.
+    """
+
+    def __init__(self):
+        """
+        :return: None
+        """
+        self.event = threading.Event()
+        self.response = None
+
+    def set(self, response):
+        """
+        :param response: JSON-RPC response, encoded as JSON text
+        :return: None
+        """
+        self.response = response
+        self.event.set()
+
+    def wait(self):
+        """
+        :return: JSON-RPC response, encoded as JSON text, once the request has run
+        """
+        self.event.wait()
+        return self.response
+
+
+def is_notification(request):
+    """
+    :param request: Decoded JSON-RPC request
+    :return: True for requests without an id, which are run without a response
+    """
+    return isinstance(request, dict) and 'id' not in request
+
+
+def error_response(request_id, code, message):
+    """
+    :param request_id: Id of the failed request, or None
+    :param code: JSON-RPC error code
+    :param message: Error description
+    :return: JSON-RPC error response dictionary
+    """
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+class CommandHandler(SocketServer.StreamRequestHandler):
+    """
+    Reads newline separated JSON-RPC requests, or batches of them as JSON arrays, from a
+    connection. Requests are queued as soon as they are read, without waiting for the previous
+    ones to run, so pipelining clients are answered in batches; responses are written in order.
+    Notifications, requests without an id, are run but never answered.
+    """
+
+    def handle(self):
+        responses = Queue.Queue()
+        writer = threading.Thread(target=self.write_responses, args=(responses,))
+        writer.daemon = True
+        writer.start()
+
+        for line in iter(self.rfile.readline, ''):
+            if not line.strip():
+                continue
+
+            try:
+                message = json.loads(line)
+            except ValueError:
+                responses.put(json.dumps(error_response(None, PARSE_ERROR, 'Parse error')))
+                continue
+
+            if isinstance(message, list):
+                if not message:
+                    responses.put(json.dumps(error_response(None, INVALID_REQUEST, 'Empty batch')))
+                    continue
+
+                pending = [self.server.dispatcher.submit(request) for request in message]
+                answered = [response for request, response in zip(message, pending)
+                            if not is_notification(request)]
+
+                # A batch of notifications only gets no response at all
+                if answered:
+                    responses.put(answered)
+
+            else:
+                pending = self.server.dispatcher.submit(message)
+
+                if not is_notification(message):
+                    responses.put(pending)
+
+        responses.put(None)
+        writer.join()
+
+    def write_responses(self, responses):
+        """
+        Write the responses of a connection in the order its requests arrived.
+        :param responses: Queue of PendingResponses, lists of them, or encoded error responses; None to stop
+        :return: None
+        """
+        while True:
+            item = responses.get()
+
+            if item is None:
+                return
+
+            # Responses are encoded by CommandDispatcher.execute(); batches are joined as they are
+            if isinstance(item, PendingResponse):
+                item = item.wait()
+            elif isinstance(item, list):
+                item = '[%s]' % ','.join(pending.wait() for pending in item)
+
+            try:
+                self.wfile.write(item + '\n')
+                self.wfile.flush()
+            except IOError:
+                return
+
+
+class CommandServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    """
+    TCP server with one thread per connection, which hands its requests to a CommandDispatcher.
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, dispatcher, port=DEFAULT_PORT):
+        """
+        :param dispatcher: CommandDispatcher that runs the requests
+        :param port: Local port to listen on; 0 picks a free one
+        :return: None
+        """
+        SocketServer.TCPServer.__init__(self, (HOST, port), CommandHandler)
+        self.dispatcher = dispatcher
+
+    def start(self):
+        """
+        Serve connections from a background thread.
+        :return: None
+        """
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        """
+        Stop serving and close the listening socket.
+        :return: None
+        """
+        self.shutdown()
+        self.server_close()
+
+
+def light_methods():
+    """
+    The light queries and applyChanges operations the server exposes. Maya is only imported
+    here, so the rest of the module can be used with a stub scheduler outside Maya.
+    :return: Dictionary of method name -> function
+    """
+    import maya.cmds as cmds
+
+    import MayaSceneLights_applyChanges as applyChanges
+    import MayaSceneLights_discovery as discovery
+    import MayaSceneLights_renderLayers as renderLayers
+    import mayautils
+
+    # Every change request is a single undo step in Maya
+    def undoable(function):
+        def run(*args, **kwargs):
+            with mayautils.undo_chunk():
+                return function(*args, **kwargs)
+
+        # The dispatcher checks the parameters against the wrapped function's signature
+        run.wrapped = function
+        return run
+
+    def list_lights():
+        return [{'name': name, 'type': light_type} for _, name, light_type in discovery.discover_lights()]
+
+    def get_lights(lights):
+        values = discovery.read_light_values(mayautils.node_handles(lights))
+        return [{'name': light, 'intensity': intensity, 'color': color}
+                for light, (intensity, color) in zip(lights, values)]
+
+    def edit_layer_members(layer, lights, state):
+        layer_index = renderLayers.RenderLayerMembership()
+        layer_index.edit_members(layer, lights, state)
+
+    return {
+        'ping': lambda: True,
+        'list_lights': list_lights,
+        'get_lights': get_lights,
+        'render_layers': lambda: cmds.ls(type='renderLayer'),
+        'change_intensity': undoable(applyChanges.change_intensity),
+        'change_color': undoable(applyChanges.change_color),
+        'change_visibility': undoable(applyChanges.change_visibility),
+        'set_intensities': undoable(applyChanges.set_intensities),
+        'edit_layer_members': undoable(edit_layer_members)
+    }
+
+
+def start(port=DEFAULT_PORT):
+    """
+    Start serving the light methods, unless the server is running already.
+    :param port: Local port to listen on
+    :return: The running CommandServer
+    """
+    global _server
+
+    if _server is None:
+        import maya.utils
+
+        _server = CommandServer(CommandDispatcher(light_methods(), maya.utils.executeDeferred), port)
+        _server.start()
+        print 'Light command server listening on %s:%d' % _server.server_address
+
+    return _server
+
+
+def stop():
+    """
+    Stop the server started by start(), if it's running.
+    :return: None
+    """
+    global _server
+
+    if _server is not None:
+        _server.stop()
+        _server = None
+        print 'Light command server stopped'
+
+
+def is_running():
+    """
+    :return: True if the server started by start() is running
+    """
+    return _server is not None
@@ -0,0 +1,211 @@
+__author__ = 'Carlos Montes'
+
+''' Estimates how much each light contributes to a cloud of sample points, to rank and cull lights. '''
+
+import maya.OpenMaya as OpenMaya
+
+import mayautils
+
+
+# Name of the feature in the error raised when NumPy is missing
+FEATURE = 'Light contribution analysis'
+
+
+# Integer codes of the light types understood by estimate_contribution()
+AMBIENT, DIRECTIONAL, POINT, SPOT, AREA, VOLUME = range(6)
+
+TYPE_CODES = {
+    'ambientLight': AMBIENT,
+    'directionalLight': DIRECTIONAL,
+    'pointLight': POINT,
+    'spotLight': SPOT,
+    'areaLight': AREA,
+    'volumeLight': VOLUME
+}
+
+# Upper bound of light x point elements held in memory by each chunk of the estimation
+CHUNK_ELEMENTS = 2000000
+
+
+def estimate_contribution(lights, points):
+    """
+    Approximates the irradiance each light casts over a point cloud, assuming every point
+    faces the light. Distance decay, spot cones with their penumbra and the emitting side
+    of area lights are taken into account; shadows and surface normals are not.
+    :param lights: Dictionary of NumPy arrays, as returned by gather_lights()
+    :param points: (M, 3) NumPy array of world-space sample positions
+    :return: (N,) NumPy array with the summed luminance each light casts over the points
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    types = lights['type']
+    count = len(types)
+    points = numpy.asarray(points, dtype=numpy.float64)
+
+    # Luminance of each light's color, scaled by its intensity
+    luminance = lights['intensity'] * lights['color'].dot([0.2126, 0.7152, 0.0722])
+
+    # Lights that don't depend on the position of the points
+    contribution = numpy.zeros(count)
+    flat = (types == AMBIENT) | (types == DIRECTIONAL)
+    contribution[flat] = luminance[flat] * len(points)
+
+    local = numpy.nonzero(~flat)[0]
+    if not len(local) or not len(points):
+        return contribution
+
+    position = lights['position'][local]
+    direction = lights['direction'][local]
+    decay = lights['decay'][local][:, None]
+    is_spot = (types[local] == SPOT)[:, None]
+    is_area = (types[local] == AREA)[:, None]
+
+    # Cosines of the inner and outer edges of each spot light's penumbra
+    half_cone = lights['cone'][local] / 2.0
+    penumbra = lights['penumbra'][local]
+    cos_inner = numpy.cos(numpy.clip(half_cone + numpy.minimum(penumbra, 0.0), 0.0, numpy.pi))[:, None]
+    cos_outer = numpy.cos(numpy.clip(half_cone + numpy.maximum(penumbra, 0.0), 0.0, numpy.pi))[:, None]
+    penumbra_width = numpy.maximum(cos_inner - cos_outer, 1e-6)
+
+    position_sq = (position ** 2).sum(axis=1)[:, None]
+    direction_dot_position = (direction * position).sum(axis=1)[:, None]
+
+    chunk_size = max(1, CHUNK_ELEMENTS // len(local))
+    totals = numpy.zeros(len(local))
+
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size]
+
+        # Squared distances and cosines to the light's axis, without (N, M, 3) temporaries
+        distance_sq = position_sq + (chunk ** 2).sum(axis=1)[None, :] - 2.0 * position.dot(chunk.T)
+        distance = numpy.sqrt(numpy.maximum(distance_sq, 1e-8))
+        cosine = (direction.dot(chunk.T) - direction_dot_position) / distance
+
+        # decayRate: 0 = none, 1 = linear, 2 = quadratic, 3 = cubic
+        falloff = 1.0 / distance ** decay
+
+        spot_factor = numpy.clip((cosine - cos_outer) / penumbra_width, 0.0, 1.0)
+        falloff *= numpy.where(is_spot, spot_factor, 1.0)
+        falloff *= numpy.where(is_area, numpy.maximum(cosine, 0.0), 1.0)
+
+        totals += falloff.sum(axis=1)
+
+    contribution[local] = luminance[local] * totals
+    return contribution
+
+
+def rank(names, contribution):
+    """
+    Sorts lights from the most to the least contributing one.
+    :param names: Array of light names, in the same order as contribution
+    :param contribution: (N,) NumPy array, as returned by estimate_contribution()
+    :return: List of (name, contribution, percentage of the total) tuples
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    total = contribution.sum()
+    shares = contribution * 100.0 / total if total > 0 else numpy.zeros(len(contribution))
+
+    return [(names[index], float(contribution[index]), float(shares[index]))
+            for index in numpy.argsort(-contribution)]
+
+
+def gather_lights(names):
+    """
+    Reads the attributes estimate_contribution() needs from Maya, through the API.
+    :param names: Array of light Transform node names
+    :return: Tuple of (names found, dictionary of NumPy arrays)
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    found = []
+    rows = []
+    selection = OpenMaya.MSelectionList()
+    path = OpenMaya.MDagPath()
+
+    def plug_value(node, attribute, default=0.0):
+        if not node.hasAttribute(attribute):
+            return default
+        return node.findPlug(attribute).asDouble()
+
+    for name in names:
+        try:
+            selection.clear()
+            selection.add(name)
+            selection.getDagPath(0, path)
+            matrix = path.inclusiveMatrix()
+            path.extendToShape()
+        except RuntimeError:
+            continue
+
+        node = OpenMaya.MFnDependencyNode(path.node())
+        light_type = TYPE_CODES.get(node.typeName(), POINT)
+
+        # Lights shine down their -Z axis
+        rows.append((light_type,
+                     plug_value(node, 'intensity'),
+                     plug_value(node, 'colorR'), plug_value(node, 'colorG'), plug_value(node, 'colorB'),
+                     matrix(3, 0), matrix(3, 1), matrix(3, 2),
+                     -matrix(2, 0), -matrix(2, 1), -matrix(2, 2),
+                     plug_value(node, 'decayRate'),
+                     plug_value(node, 'coneAngle'),
+                     plug_value(node, 'penumbraAngle')))
+        found.append(name)
+
+    table = numpy.array(rows, dtype=numpy.float64).reshape(-1, 14)
+
+    direction = table[:, 8:11]
+    lengths = numpy.sqrt((direction ** 2).sum(axis=1))[:, None]
+
+    return found, {
+        'type': table[:, 0].astype(numpy.int32),
+        'intensity': table[:, 1],
+        'color': table[:, 2:5],
+        'position': table[:, 5:8],
+        'direction': direction / numpy.maximum(lengths, 1e-12),
+        'decay': table[:, 11],
+        'cone': table[:, 12],
+        'penumbra': table[:, 13]
+    }
+
+
+def gather_sample_points(nodes):
+    """
+    Builds a point cloud from the vertices of meshes and the positions of other DAG nodes.
+    :param nodes: Array of DAG node names
+    :return: (M, 3) NumPy array of world-space positions
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    chunks = []
+    selection = OpenMaya.MSelectionList()
+    path = OpenMaya.MDagPath()
+
+    for name in nodes:
+        try:
+            selection.clear()
+            selection.add(name)
+            selection.getDagPath(0, path)
+        except RuntimeError:
+            continue
+
+        mesh_path = OpenMaya.MDagPath(path)
+        try:
+            mesh_path.extendToShape()
+            is_mesh = mesh_path.node().hasFn(OpenMaya.MFn.kMesh)
+        except RuntimeError:
+            is_mesh = False
+
+        if is_mesh:
+            vertices = OpenMaya.MPointArray()
+            OpenMaya.MFnMesh(mesh_path).getPoints(vertices, OpenMaya.MSpace.kWorld)
+            chunks.append(numpy.array([(vertices[index].x, vertices[index].y, vertices[index].z)
+                                       for index in range(vertices.length())]))
+        else:
+            matrix = path.inclusiveMatrix()
+            chunks.append(numpy.array([(matrix(3, 0), matrix(3, 1), matrix(3, 2))]))
+
+    if not chunks:
+        return numpy.zeros((0, 3))
+
+    return numpy.concatenate(chunks)
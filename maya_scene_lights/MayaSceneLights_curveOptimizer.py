@@ -0,0 +1,193 @@
+__author__ = 'Carlos Montes'
+
+''' Removes redundant keys from the intensity and color animation curves of lights. '''
+
+import bisect
+
+import maya.cmds as cmds
+
+
+# Light attributes whose animation curves are optimized; the ones keyed by applyChanges
+CURVE_ATTRIBUTES = ('intensity', 'colorR', 'colorG', 'colorB',
+                    'shadColorR', 'shadColorG', 'shadColorB')
+
+
+def redundant_keys(times, values, tolerance):
+    """
+    Finds the keys that lie within a tolerance of the straight line between the keys kept
+    around them. The first and last keys are always kept. The test only holds for linear
+    tangents, so optimize_curve() takes these keys as candidates and checks each removal
+    on the curve itself.
+    :param times: Array of key times, in increasing order
+    :param values: Array of key values
+    :param tolerance: Largest value difference allowed
+    :return: List of indices of the candidate keys
+    """
+    redundant = []
+    anchor = 0
+
+    # Keys skipped since the latest kept one
+    skipped = []
+
+    for index in range(1, len(times) - 1):
+        candidates = skipped + [index]
+
+        if all(abs(values[position] - interpolate(times, values, anchor, index + 1, position)) <= tolerance
+               for position in candidates):
+            skipped = candidates
+        else:
+            redundant.extend(skipped)
+            skipped = []
+            anchor = index
+
+    redundant.extend(skipped)
+    return redundant
+
+
+def interpolate(times, values, start, end, position):
+    """
+    Linearly interpolates the value of a key from two other keys.
+    :param times: Array of key times
+    :param values: Array of key values
+    :param start: Index of the key before
+    :param end: Index of the key after
+    :param position: Index of the key to interpolate
+    :return: Interpolated value
+    """
+    span = times[end] - times[start]
+
+    if span == 0:
+        return values[start]
+
+    weight = (times[position] - times[start]) / float(span)
+    return values[start] + (values[end] - values[start]) * weight
+
+
+def evaluate(curve, time):
+    """
+    :param curve: Name of the animCurve node
+    :param time: Time to evaluate the curve at
+    :return: Value of the curve at that time, with its tangents
+    """
+    return cmds.keyframe(curve, query=True, eval=True, time=(time, time))[0]
+
+
+def curve_tangents(curve):
+    """
+    :param curve: Name of the animCurve node
+    :return: Tuple of (True if the curve has weighted tangents, list with one (in tangent type,
+    out tangent type, in angle, out angle, in weight, out weight, tangents locked) tuple per key)
+    """
+    def query(**flags):
+        return cmds.keyTangent(curve, query=True, **flags) or []
+
+    weighted = (query(weightedTangents=True) or [False])[0]
+    no_weights = [None] * len(query(lock=True))
+
+    return weighted, zip(query(inTangentType=True), query(outTangentType=True),
+                         query(inAngle=True), query(outAngle=True),
+                         query(inWeight=True) if weighted else no_weights,
+                         query(outWeight=True) if weighted else no_weights,
+                         query(lock=True))
+
+
+def restore_key(curve, time, value, tangents, weighted):
+    """
+    Puts a removed key back, with its tangents.
+    :param curve: Name of the animCurve node
+    :param time: Time of the key
+    :param value: Value of the key
+    :param tangents: Tangents tuple of the key, as returned by curve_tangents()
+    :param weighted: True if the curve has weighted tangents
+    :return: None
+    """
+    in_type, out_type, in_angle, out_angle, in_weight, out_weight, lock = tangents
+
+    cmds.setKeyframe(curve, time=time, value=value)
+
+    flags = {'inAngle': in_angle, 'outAngle': out_angle}
+    if weighted:
+        flags.update(inWeight=in_weight, outWeight=out_weight)
+
+    # Angles first, then the types: non-fixed types recompute the angles they were read from
+    cmds.keyTangent(curve, time=(time, time), edit=True, lock=False, **flags)
+    cmds.keyTangent(curve, time=(time, time), edit=True, inTangentType=in_type, outTangentType=out_type)
+    cmds.keyTangent(curve, time=(time, time), edit=True, lock=lock)
+
+
+def optimize_curve(curve, tolerance):
+    """
+    Removes the redundant keys of an animation curve. Each candidate of redundant_keys() is
+    cut, and the curve is evaluated with its real tangents around it, at the original key
+    times and halfway between them; the key is put back if the curve moved further than
+    the tolerance from the original one.
+    :param curve: Name of the animCurve node
+    :param tolerance: Largest value difference allowed
+    :return: Tuple of (number of keys removed, largest error measured around the removed keys)
+    """
+    times = cmds.keyframe(curve, query=True, timeChange=True) or []
+    values = cmds.keyframe(curve, query=True, valueChange=True) or []
+
+    candidates = redundant_keys(times, values, tolerance)
+
+    if not candidates:
+        return 0, 0.0
+
+    weighted, tangents = curve_tangents(curve)
+
+    # The original curve at its key times and halfway between them
+    samples = sorted(set(times) | set((start + end) / 2.0 for start, end in zip(times, times[1:])))
+    reference = [evaluate(curve, time) for time in samples]
+
+    # Indices of the keys still on the curve
+    kept = range(len(times))
+    removed = 0
+    max_error = 0.0
+
+    for index in candidates:
+        position = kept.index(index)
+
+        # Removing a key changes the auto tangents of its neighbours, so the curve can move
+        # from the second kept key before it to the second one after it
+        first = bisect.bisect_left(samples, times[kept[max(position - 2, 0)]])
+        last = bisect.bisect_right(samples, times[kept[min(position + 2, len(kept) - 1)]])
+
+        cmds.cutKey(curve, time=(times[index], times[index]), clear=True)
+
+        error = max(abs(evaluate(curve, samples[sample]) - reference[sample])
+                    for sample in range(first, last))
+
+        if error > tolerance:
+            restore_key(curve, times[index], values[index], tangents[index], weighted)
+            continue
+
+        del kept[position]
+        removed += 1
+        max_error = max(max_error, error)
+
+    return removed, max_error
+
+
+def optimize_lights(lights, tolerance):
+    """
+    Removes the redundant keys of the intensity, color and shadow color curves of several lights.
+    :param lights: Array of light Transform node names
+    :param tolerance: Largest value difference allowed
+    :return: Dictionary with the number of 'curves' visited, keys 'removed' and the 'max_error'
+    """
+    report = {'curves': 0, 'removed': 0, 'max_error': 0.0}
+
+    for light in lights:
+        for attribute in CURVE_ATTRIBUTES:
+            plug = '%s.%s' % (light, attribute)
+
+            if not cmds.objExists(plug):
+                continue
+
+            for curve in cmds.keyframe(plug, query=True, name=True) or []:
+                removed, max_error = optimize_curve(curve, tolerance)
+                report['curves'] += 1
+                report['removed'] += removed
+                report['max_error'] = max(report['max_error'], max_error)
+
+    return report
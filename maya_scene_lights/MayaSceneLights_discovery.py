@@ -0,0 +1,203 @@
+__author__ = 'Carlos Montes'
+
+''' Finds the lights in the scene in a single pass over the DAG, and benchmarks the ways of doing it. '''
+
+import time
+
+import maya.cmds as cmds
+import maya.OpenMaya as OpenMaya
+
+import MayaSceneLights_lightStore as lightStore
+
+
+def discover_lights():
+    """
+    Walks the DAG once, visiting only light shapes.
+    :return: List of (MObjectHandle of the Transform, Transform name, light type) records,
+    sorted by the natural order of the names, then by type
+    """
+    records = []
+    seen = set()
+
+    dag_iterator = OpenMaya.MItDag(OpenMaya.MItDag.kDepthFirst, OpenMaya.MFn.kLight)
+    path = OpenMaya.MDagPath()
+
+    while not dag_iterator.isDone():
+        dag_iterator.getPath(path)
+        shape = path.node()
+
+        # Instanced lights are visited once per instance; keep the first Transform only
+        shape_key = OpenMaya.MObjectHandle(shape).hashCode()
+
+        if shape_key not in seen:
+            seen.add(shape_key)
+            light_type = OpenMaya.MFnDependencyNode(shape).typeName()
+
+            path.pop()
+            records.append((OpenMaya.MObjectHandle(path.node()), path.partialPathName(), light_type))
+
+        dag_iterator.next()
+
+    records.sort(key=lambda record: (lightStore.natural_sort_key(record[1]), record[2]))
+    return records
+
+
+def loaded_references():
+    """
+    :return: Set of the names of the reference nodes whose files are loaded
+    """
+    loaded = set()
+
+    for reference in cmds.ls(type='reference'):
+        try:
+            if cmds.referenceQuery(reference, isLoaded=True):
+                loaded.add(reference)
+
+        # Reference nodes without a file, like sharedReferenceNode, can't be queried
+        except RuntimeError:
+            pass
+
+    return loaded
+
+
+def reference_lights(reference):
+    """
+    Finds the lights of a single reference, from its own nodes instead of the whole DAG.
+    :param reference: Reference node name
+    :return: List of (MObjectHandle of the Transform, Transform name, light type) records,
+    sorted like discover_lights()
+    """
+    shapes = cmds.ls(cmds.referenceQuery(reference, nodes=True, dagPath=True) or [],
+                     type='light', long=True)
+
+    records = []
+    selection = OpenMaya.MSelectionList()
+    path = OpenMaya.MDagPath()
+
+    for shape in shapes:
+        selection.clear()
+        selection.add(shape)
+        selection.getDagPath(0, path)
+
+        light_type = OpenMaya.MFnDependencyNode(path.node()).typeName()
+        path.pop()
+        records.append((OpenMaya.MObjectHandle(path.node()), path.partialPathName(), light_type))
+
+    records.sort(key=lambda record: (lightStore.natural_sort_key(record[1]), record[2]))
+    return records
+
+
+def reference_node(light):
+    """
+    :param light: Light Transform node name
+    :return: Name of the reference node the light comes from, or None if it isn't referenced
+    """
+    if not cmds.referenceQuery(light, isNodeReferenced=True):
+        return None
+
+    return cmds.referenceQuery(light, referenceNode=True)
+
+
+def read_light_values(handles):
+    """
+    Reads the intensity and color of several lights through the API.
+    :param handles: Array of MObjectHandles of light Transform nodes
+    :return: List of (intensity, (r, g, b)) tuples; (None, None) for lights that can't be read
+    """
+    values = []
+    path = OpenMaya.MDagPath()
+
+    for handle in handles:
+        try:
+            OpenMaya.MDagPath.getAPathTo(handle.object(), path)
+            path.extendToShape()
+            node = OpenMaya.MFnDependencyNode(path.node())
+
+            values.append((node.findPlug('intensity').asDouble(),
+                           tuple(node.findPlug(attribute).asDouble()
+                                 for attribute in ('colorR', 'colorG', 'colorB'))))
+        except (AttributeError, RuntimeError):
+            values.append((None, None))
+
+    return values
+
+
+def cmds_lights():
+    """
+    The maya.cmds discovery path that fill_itemlist used before discover_lights().
+    :return: Sorted list of (Transform name, light type) tuples
+    """
+    shapes_and_types = cmds.ls(type='light', showType=True)
+
+    lights = [(cmds.listRelatives(shape, parent=True, path=True)[0], light_type)
+              for shape, light_type in zip(shapes_and_types[::2], shapes_and_types[1::2])]
+
+    lights.sort()
+    return lights
+
+
+def pymel_lights():
+    """
+    The original PyMEL discovery path. PyMEL is only imported when this is called,
+    since importing it takes seconds and nothing else in the tool needs it.
+    :return: Sorted list of (Transform PyNode, light type) tuples
+    """
+    import pymel.core as pmc
+
+    lights = [(light.getParent(), light.nodeType()) for light in pmc.ls(type='light')]
+    lights.sort()
+    return lights
+
+
+def create_benchmark_lights(count=10000):
+    """
+    Creates point lights to benchmark with, without recording undo entries.
+    :param count: Number of lights to create
+    :return: List of the new lights' Transform names
+    """
+    names = []
+    undo_state = cmds.undoInfo(query=True, stateWithoutFlush=True)
+    cmds.undoInfo(stateWithoutFlush=False)
+
+    try:
+        for index in range(count):
+            shape = cmds.pointLight(name='benchmarkLight%d' % index)
+            names.append(cmds.listRelatives(shape, parent=True, path=True)[0])
+    finally:
+        cmds.undoInfo(stateWithoutFlush=undo_state)
+
+    return names
+
+
+def benchmark(repeat=3):
+    """
+    Times every discovery path on the lights of the current scene, keeping the best of
+    several runs. Call create_benchmark_lights() first to benchmark on a large scene.
+    :param repeat: Number of runs of each path
+    :return: Dictionary of path name -> best time in seconds; the PyMEL path
+    is left out if PyMEL isn't available
+    """
+    paths = [('api', discover_lights), ('cmds', cmds_lights)]
+
+    try:
+        started = time.time()
+        import pymel.core
+        print 'Imported PyMEL in %.3f s' % (time.time() - started)
+        paths.append(('pymel', pymel_lights))
+    except ImportError:
+        print 'PyMEL is not available; skipping its discovery path'
+
+    results = {}
+
+    for name, function in paths:
+        timings = []
+
+        for _ in range(repeat):
+            started = time.time()
+            count = len(function())
+            timings.append(time.time() - started)
+
+        results[name] = min(timings)
+        print '%-6s %d light(s) in %.4f s' % (name, count, results[name])
+
+    return results
@@ -0,0 +1,127 @@
+__author__ = 'Carlos Montes'
+
+''' Intensity histogram and hue/value scatter of many lights, computed from cached attribute arrays. '''
+
+import mayautils
+
+
+# Name of the feature in the error raised when NumPy is missing
+FEATURE = 'The light distribution view'
+
+
+# Number of bars of the intensity histogram
+HISTOGRAM_BINS = 40
+
+
+def light_arrays(records):
+    """
+    Packs the cached intensity and color of light records into arrays. Records
+    whose values haven't been read yet are left out.
+    :param records: Array of LightRecords
+    :return: Tuple of (list of names, (N,) intensity array, (N, 3) color array)
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    records = [record for record in records
+               if record.intensity is not None and record.color is not None]
+
+    names = [record.name for record in records]
+    intensities = numpy.array([record.intensity for record in records], dtype=numpy.float64)
+    colors = numpy.array([record.color for record in records], dtype=numpy.float64).reshape(-1, 3)
+
+    return names, intensities, colors
+
+
+def intensity_values(intensities, stops=False):
+    """
+    :param intensities: (N,) intensity array
+    :param stops: True to express intensities in exposure stops; non positive ones become -inf
+    :return: (N,) array of the values the histogram is computed on
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    if not stops:
+        return intensities
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        return numpy.where(intensities > 0, numpy.log2(numpy.maximum(intensities, 1e-300)), -numpy.inf)
+
+
+def histogram(values, bins=HISTOGRAM_BINS):
+    """
+    :param values: (N,) array; infinite values are left out
+    :param bins: Number of bars
+    :return: Tuple of (list of counts, list of bins + 1 edges)
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    finite = values[numpy.isfinite(values)]
+
+    if not len(finite):
+        return [], []
+
+    low, high = finite.min(), finite.max()
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+
+    counts, edges = numpy.histogram(finite, bins=bins, range=(low, high))
+    return counts.tolist(), edges.tolist()
+
+
+def hue_value(colors):
+    """
+    Converts RGB colors to hue and value, all at once.
+    :param colors: (N, 3) array of RGB floats
+    :return: Tuple of (N,) hue array between 0 and 1, and (N,) value array
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    value = colors.max(axis=1)
+    chroma = value - colors.min(axis=1)
+
+    red, green, blue = colors[:, 0], colors[:, 1], colors[:, 2]
+    safe_chroma = numpy.where(chroma > 0, chroma, 1.0)
+
+    hue = numpy.where(value == red, ((green - blue) / safe_chroma) % 6.0,
+                      numpy.where(value == green, (blue - red) / safe_chroma + 2.0,
+                                  (red - green) / safe_chroma + 4.0))
+
+    hue = numpy.where(chroma > 0, hue / 6.0, 0.0)
+    return hue, value
+
+
+def in_range(values, low, high):
+    """
+    :param values: (N,) array
+    :param low: Lowest value of the range
+    :param high: Highest value of the range
+    :return: Array of the indices of the values inside the range
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    return numpy.nonzero((values >= min(low, high)) & (values <= max(low, high)))[0]
+
+
+def in_box(x_values, y_values, x_range, y_range):
+    """
+    :param x_values: (N,) array
+    :param y_values: (N,) array
+    :param x_range: (low, high) range of the x values
+    :param y_range: (low, high) range of the y values
+    :return: Array of the indices of the points inside the box
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    inside = ((x_values >= min(x_range)) & (x_values <= max(x_range)) &
+              (y_values >= min(y_range)) & (y_values <= max(y_range)))
+    return numpy.nonzero(inside)[0]
+
+
+def summary(intensities):
+    """
+    :param intensities: (N,) intensity array, not empty
+    :return: Tuple of (min, median, max) intensity
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    return intensities.min(), numpy.median(intensities), intensities.max()
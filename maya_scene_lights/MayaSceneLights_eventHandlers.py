@@ -0,0 +1,203 @@
+__author__ = 'Carlos Montes'
+
+''' Handlers of the Maya events the window listens to, shared by the window and the event replayer. '''
+
+
+# MEventMessage events the window subscribes to
+EVENTS = ('SelectionChanged', 'timeChanged', 'renderLayerManagerChange')
+
+
+# The handlers work on a window and a scene. The window is the LightInterfaceWindow, or
+# anything with the same attributes: lights (LightStore), widgetlist, latest_light_selected,
+# current_render_layer, render_layer_only, layer_records, search_matches, collapsed_namespaces,
+# visible_records, type_buttons and the Render Layer buttons, isVisible(), isActiveWindow(),
+# update_intensity_label(), receive_mayacolor() and receive_mayashadow(). The scene has
+# selection(), light_values(light) and current_render_layer(), read from Maya by
+# mayaWindow.MayaScene, or from a recording by eventReplay.SceneStandIn.
+
+
+def selection_changed(window, scene):
+    """
+    SelectionChanged handler: highlight the scene's selection in the list, unless the
+    selection comes from the window itself, and show the latest selected light's attributes.
+    :param window: LightInterfaceWindow
+    :param scene: MayaScene
+    :return: None
+    """
+    # Shouldn't update selection when selection comes from the GUI, or else
+    # the callback and update_maya_selection() method mess with the normal
+    # selection of the widgetList. A hidden persistent window catches up
+    # when it's reopened
+    if window.isActiveWindow() or not window.isVisible():
+        return
+
+    select_list_items(window, scene.selection())
+
+    # Update the window's elements with the latest selected light properties,
+    # or have N/A in the intensity label if no light is selected
+    update_latest_light_fields(window, scene)
+
+
+def time_changed(window, scene):
+    """
+    timeChanged handler: show the latest selected light's attributes at the new time.
+    :param window: LightInterfaceWindow
+    :param scene: MayaScene
+    :return: None
+    """
+    if window.latest_light_selected is not None and window.isVisible():
+        update_latest_light_fields(window, scene)
+
+
+def render_layer_changed(window, scene):
+    """
+    renderLayerManagerChange handler: follow the scene's current Render Layer.
+    :param window: LightInterfaceWindow
+    :param scene: MayaScene
+    :return: None
+    """
+    # A hidden persistent window catches up when it's reopened
+    if window.isVisible():
+        update_window_render_layer(window, scene)
+
+
+# Dictionary of MEventMessage event name -> handler
+EVENT_HANDLERS = {
+    'SelectionChanged': selection_changed,
+    'timeChanged': time_changed,
+    'renderLayerManagerChange': render_layer_changed
+}
+
+
+def select_list_items(window, selected_array):
+    """
+    Updates the current widgetlist selection
+    :param window: LightInterfaceWindow
+    :param selected_array: Array of selected lights in the scene
+    :return: None
+    """
+    window.latest_light_selected = None
+
+    selected_names = set(str(item) for item in selected_array)
+
+    # The selection comes from Maya, so it shouldn't be sent back to it item by item
+    window.widgetlist.blockSignals(True)
+
+    for record in window.lights:
+        listitem = window.widgetlist.item(record.row)
+
+        if record.name in selected_names:
+            listitem.setSelected(True)
+            window.latest_light_selected = record
+        else:
+            listitem.setSelected(False)
+
+    window.widgetlist.blockSignals(False)
+    window.widgetlist.viewport().update()
+
+
+def update_latest_light_fields(window, scene):
+    """
+    Reads the attributes of the latest selected light into its record and
+    updates the window's fields with them; N/A if no light is selected.
+    :param window: LightInterfaceWindow
+    :param scene: MayaScene
+    :return: None
+    """
+    record = window.latest_light_selected
+
+    if record is None:
+        window.update_intensity_label(None)
+        return
+
+    record.intensity, record.color, record.shadow_color = scene.light_values(record.name)
+
+    update_window_fields(window, record.intensity, record.color, record.shadow_color)
+
+
+def update_window_fields(window, intensity, light_color, shadow_color):
+    """
+    Updates the Current Intensity, Light Color and Shadow Color widgets
+    in the window at the same time.
+    :param window: LightInterfaceWindow
+    :param intensity: Intensity value
+    :param light_color: RGB value of Light Color
+    :param shadow_color: RGB value of Shadow Color
+    :return: None
+    """
+    window.update_intensity_label(intensity)
+    window.receive_mayacolor(light_color)
+    window.receive_mayashadow(shadow_color)
+
+
+def update_window_render_layer(window, scene):
+    """
+    Updates the window's current Render Layer attribute and
+    the Render Layer buttons availability.
+    :param window: LightInterfaceWindow
+    :param scene: MayaScene
+    :return: None
+    """
+    window.current_render_layer = scene.current_render_layer()
+
+    # Update the Render Layer buttons, to lock them in case this is the defaultRenderLayer
+    render_change_trigger(window)
+
+
+def render_change_trigger(window):
+    """
+    A new Render Layer has been selected; check if this is the
+    defaultRenderLayer and reset Render Layer Only mode.
+    :param window: LightInterfaceWindow
+    :return: None
+    """
+    enabled = window.current_render_layer != 'defaultRenderLayer'
+
+    window.renderlayer_button.setEnabled(enabled)
+    window.renderlayer_add.setEnabled(enabled)
+    window.renderlayer_remove.setEnabled(enabled)
+
+    render_layer_off(window)
+
+
+def render_layer_off(window):
+    """
+    Render Layer Mode has been deactivated.
+    :param window: LightInterfaceWindow
+    :return: None
+    """
+    window.render_layer_only = False
+    # Change the Render Layer button text
+    window.renderlayer_button.setText('Show Current Render Layer Only')
+
+    # Show the items that the other filters allow
+    apply_filters(window)
+
+
+def apply_filters(window):
+    """
+    Show the lights that pass the type filters, the current search and the
+    'Render Layer Only' mode, as an intersection of record sets. Only the
+    items whose visibility changes are touched.
+    :param window: LightInterfaceWindow
+    :return: None
+    """
+    visible = set(window.lights)
+
+    for light_type, button in window.type_buttons.items():
+        if not button.isChecked():
+            visible -= window.lights.by_type.get(light_type, set())
+
+    if window.search_matches is not None:
+        visible &= window.search_matches
+
+    if window.render_layer_only:
+        visible &= window.layer_records
+
+    for namespace in window.collapsed_namespaces:
+        visible -= window.lights.by_namespace.get(namespace, set())
+
+    for record in visible ^ window.visible_records:
+        window.widgetlist.item(record.row).setHidden(record not in visible)
+
+    window.visible_records = visible
@@ -0,0 +1,143 @@
+__author__ = 'Carlos Montes'
+
+''' Records the Maya events the window listens to, with timestamps and scene deltas, to replay them later. '''
+
+import json
+import time
+
+import maya.cmds as cmds
+import maya.OpenMaya as OpenMaya
+
+import MayaSceneLights_discovery as discovery
+import MayaSceneLights_eventHandlers as eventHandlers
+import MayaSceneLights_renderLayers as renderLayers
+import mayautils
+
+
+# MEventMessage events the window subscribes to
+EVENTS = eventHandlers.EVENTS
+
+# Version of the recording files written by EventRecorder.save()
+RECORDING_VERSION = 1
+
+
+def scene_state():
+    """
+    Reads what the replayer's scene stand-in needs to start from.
+    :return: Dictionary with the 'lights' (list of dictionaries with name, type, intensity, color
+    and shadowColor), the members of every Render Layer in 'layers', and the current
+    'selection', 'time' and 'layer'
+    """
+    lights = discovery.discover_lights()
+    values = discovery.read_light_values([handle for handle, _, _ in lights])
+
+    layer_index = renderLayers.RenderLayerMembership()
+    layer_index.refresh()
+
+    return {
+        'lights': [{'name': name,
+                    'type': light_type,
+                    'intensity': intensity,
+                    'color': color,
+                    'shadowColor': cmds.getAttr('%s.shadowColor' % name)[0]}
+                   for (_, name, light_type), (intensity, color) in zip(lights, values)],
+        'layers': dict((layer, sorted(members)) for layer, members in layer_index.members.items()),
+        'selection': cmds.ls(selection=True),
+        'time': cmds.currentTime(query=True),
+        'layer': cmds.editRenderLayerGlobals(query=True, currentRenderLayer=True)
+    }
+
+
+class EventRecorder(object):
+    """
+    Logs every MEventMessage event the window subscribes to, as (seconds since start,
+    event name, scene delta). Selection events store the names added to and removed from
+    the selection, time events the new time and Render Layer events the new current layer.
+    """
+
+    def __init__(self, registry=None):
+        """
+        :param registry: CallbackRegistry the recording callbacks are registered in, like the
+        window's, so they're removed with the window's own; a new one if None
+        :return: None
+        """
+        self.registry = registry if registry is not None else mayautils.CallbackRegistry()
+
+        # Scene state at the start of the recording, and the recorded events
+        self.scene = None
+        self.events = []
+
+        self.started = None
+        self.selection = set()
+
+    def __len__(self):
+        return len(self.events)
+
+    @staticmethod
+    def callback_name(event):
+        """
+        :param event: MEventMessage event name
+        :return: Name the event's recording callback is registered under
+        """
+        return 'record' + event[0].upper() + event[1:]
+
+    def start(self):
+        """
+        Read the scene state and start recording, forgetting any previous recording.
+        :return: None
+        """
+        self.scene = scene_state()
+        self.events = []
+        self.selection = set(self.scene['selection'])
+        self.started = time.time()
+
+        # Scene scoped, since the recorded scene state belongs to the open scene
+        for event in EVENTS:
+            self.registry.add(self.callback_name(event),
+                              OpenMaya.MEventMessage.addEventCallback(event, self.record, event),
+                              True)
+
+    def stop(self):
+        """
+        Stop recording, keeping the recorded events.
+        :return: None
+        """
+        for event in EVENTS:
+            self.registry.remove(self.callback_name(event))
+
+    def is_recording(self):
+        """
+        :return: True while the recording callbacks are registered
+        """
+        return any(self.callback_name(event) in self.registry for event in EVENTS)
+
+    def record(self, event):
+        """
+        Log an event with its scene delta; the callback of every recorded event.
+        :param event: MEventMessage event name, passed as the callback's clientData
+        :return: None
+        """
+        timestamp = time.time() - self.started
+
+        if event == 'SelectionChanged':
+            selection = set(cmds.ls(selection=True))
+            delta = {'added': sorted(selection - self.selection),
+                     'removed': sorted(self.selection - selection)}
+            self.selection = selection
+
+        elif event == 'timeChanged':
+            delta = {'time': cmds.currentTime(query=True)}
+
+        else:
+            delta = {'layer': cmds.editRenderLayerGlobals(query=True, currentRenderLayer=True)}
+
+        self.events.append((timestamp, event, delta))
+
+    def save(self, path):
+        """
+        :param path: Path of the JSON recording file to write
+        :return: None
+        """
+        with open(path, 'w') as recording_file:
+            json.dump({'version': RECORDING_VERSION, 'scene': self.scene, 'events': self.events},
+                      recording_file)
@@ -0,0 +1,331 @@
+__author__ = 'Carlos Montes'
+
+''' Replays recorded Maya event streams through the window's event handlers, against an in-memory scene. '''
+
+import json
+import random
+import sys
+import time
+
+import MayaSceneLights_eventHandlers as eventHandlers
+import MayaSceneLights_lightStore as lightStore
+
+
+# Default frame rate the dropped frames are counted at
+FRAME_RATE = 24.0
+
+
+class SceneStandIn(object):
+    """
+    In-memory stand-in of mayaWindow.MayaScene: light attributes, Render Layer members,
+    the selection, the current time and layer, changed by the recorded scene deltas.
+    """
+
+    def __init__(self, state):
+        """
+        :param state: Scene state dictionary, as recorded by eventRecorder.scene_state()
+        :return: None
+        """
+        # Dictionary of light name -> dictionary of attribute -> value
+        self.lights = dict((light['name'], light) for light in state['lights'])
+        self.light_order = [light['name'] for light in state['lights']]
+
+        # Dictionary of Render Layer name -> set of member names
+        self.layers = dict((layer, set(members)) for layer, members in state['layers'].items())
+
+        self.selected = set(state['selection'])
+        self.time = state['time']
+        self.layer = state['layer']
+
+    def apply(self, event, delta):
+        """
+        Change the scene the way a recorded event did.
+        :param event: MEventMessage event name
+        :param delta: Scene delta dictionary of the event
+        :return: None
+        """
+        if event == 'SelectionChanged':
+            self.selected.difference_update(delta['removed'])
+            self.selected.update(delta['added'])
+        elif event == 'timeChanged':
+            self.time = delta['time']
+        else:
+            self.layer = delta['layer']
+
+    def selection(self):
+        """
+        :return: List of the selected node names
+        """
+        return list(self.selected)
+
+    def light_values(self, light):
+        """
+        :param light: Light name
+        :return: Tuple of (intensity, (r, g, b) color, (r, g, b) shadow color)
+        """
+        values = self.lights[light]
+        return values['intensity'], tuple(values['color']), tuple(values['shadowColor'])
+
+    def current_render_layer(self):
+        """
+        :return: Name of the current Render Layer
+        """
+        return self.layer
+
+
+class FakeWidget(object):
+    """
+    Stands in for the window's buttons, list items and list widget: keeps the state the
+    event handlers set and read, without drawing anything.
+    """
+
+    def __init__(self, items=0):
+        """
+        :param items: Number of child items, for a list widget
+        :return: None
+        """
+        self.items = [FakeWidget() for _ in range(items)]
+        self.enabled = True
+        self.checked = True
+        self.selected = False
+        self.hidden = False
+        self.text = ''
+
+    def item(self, row):
+        return self.items[row]
+
+    def viewport(self):
+        return self
+
+    def update(self):
+        pass
+
+    def blockSignals(self, state):
+        pass
+
+    def setEnabled(self, state):
+        self.enabled = state
+
+    def isChecked(self):
+        return self.checked
+
+    def setSelected(self, state):
+        self.selected = state
+
+    def isSelected(self):
+        return self.selected
+
+    def setHidden(self, state):
+        self.hidden = state
+
+    def setText(self, text):
+        self.text = text
+
+
+class FakeWindow(object):
+    """
+    Stands in for the LightInterfaceWindow, with the attributes the event handlers use,
+    a real LightStore and FakeWidgets instead of Qt widgets.
+    """
+
+    def __init__(self, scene):
+        """
+        :param scene: SceneStandIn whose lights are listed
+        :return: None
+        """
+        self.lights = lightStore.LightStore()
+
+        for name in scene.light_order:
+            self.lights.add(name, scene.lights[name]['type'])
+
+        self.widgetlist = FakeWidget(len(self.lights))
+        self.type_buttons = dict((light_type, FakeWidget()) for light_type in self.lights.by_type)
+        self.renderlayer_button = FakeWidget()
+        self.renderlayer_add = FakeWidget()
+        self.renderlayer_remove = FakeWidget()
+
+        self.latest_light_selected = None
+        self.current_render_layer = scene.layer
+        self.render_layer_only = False
+        self.layer_records = set()
+        self.search_matches = None
+        self.collapsed_namespaces = set()
+        self.visible_records = set(self.lights)
+
+        # Latest values shown in the intensity label and color frames
+        self.fields = {}
+
+        # Start from the recorded selection, like populate_itemlist() does with the scene's
+        eventHandlers.select_list_items(self, scene.selection())
+
+    def isVisible(self):
+        return True
+
+    def isActiveWindow(self):
+        return False
+
+    def update_intensity_label(self, quantity=None):
+        self.fields['intensity'] = quantity
+
+    def receive_mayacolor(self, color):
+        self.fields['color'] = color
+
+    def receive_mayashadow(self, color):
+        self.fields['shadowColor'] = color
+
+
+def load(path):
+    """
+    :param path: Path of a JSON recording file, written by eventRecorder.EventRecorder.save()
+    :return: Recording dictionary with the 'scene' state and the 'events'
+    """
+    with open(path) as recording_file:
+        return json.load(recording_file)
+
+
+def storm_recording(light_count=10000, frames=240, selections=20, layers=4, seed=0):
+    """
+    Builds a synthetic recording of the event storms that slow the window down: timeline
+    playback, box selections of thousands of lights and Render Layer switches.
+    :param light_count: Number of lights in the scene
+    :param frames: Number of frames of playback at FRAME_RATE, each one a timeChanged event
+    :param selections: Number of box selections, each one of a random slice of the lights
+    :param layers: Number of Render Layers, switched through after the playback
+    :param seed: Seed of the random selections and values
+    :return: Recording dictionary, as load() returns
+    """
+    generator = random.Random(seed)
+    names = ['rig%d:light%d' % (index % 10, index) for index in range(light_count)]
+    layer_names = ['layer%d' % index for index in range(layers)]
+
+    scene = {
+        'lights': [{'name': name,
+                    'type': 'pointLight',
+                    'intensity': generator.uniform(0.0, 10.0),
+                    'color': [generator.random() for _ in range(3)],
+                    'shadowColor': [0.0, 0.0, 0.0]} for name in names],
+        'layers': dict((layer, generator.sample(names, light_count // 2)) for layer in layer_names),
+        'selection': [names[0]],
+        'time': 1.0,
+        'layer': 'defaultRenderLayer'
+    }
+
+    events = []
+    timestamp = 0.0
+
+    for frame in range(frames):
+        timestamp += 1.0 / FRAME_RATE
+        events.append((timestamp, 'timeChanged', {'time': 1.0 + frame}))
+
+    selection = set(scene['selection'])
+    for _ in range(selections):
+        timestamp += 0.25
+        start = generator.randrange(light_count)
+        new_selection = set(names[start:start + generator.randrange(1, 5000)])
+        events.append((timestamp, 'SelectionChanged', {'added': sorted(new_selection - selection),
+                                                       'removed': sorted(selection - new_selection)}))
+        selection = new_selection
+
+    for layer in layer_names + ['defaultRenderLayer']:
+        timestamp += 0.5
+        events.append((timestamp, 'renderLayerManagerChange', {'layer': layer}))
+
+    return {'version': 1, 'scene': scene, 'events': events}
+
+
+def replay(recording, handlers=None, frame_rate=FRAME_RATE):
+    """
+    Feeds a recorded event stream into the window's event handlers, with a FakeWindow
+    against a scene stand-in. Events are fed at their recorded times on a virtual clock:
+    an event that arrives while the previous one is still being handled waits for it,
+    like on Maya's main thread.
+    :param recording: Recording dictionary, as load() returns
+    :param handlers: Dictionary of event name -> handler function, called with the window
+    and the scene; eventHandlers.EVENT_HANDLERS if None
+    :param frame_rate: Frames per second the dropped frames are counted at
+    :return: Dictionary with the 'events' statistics of every event name (a dictionary with
+    the 'count', 'median', 'p95' and 'worst' latency in milliseconds), the number of
+    'dropped_frames' and the 'worst_delay' in milliseconds from an event to the end of its handler
+    """
+    scene = SceneStandIn(recording['scene'])
+    window = FakeWindow(scene)
+    event_handlers = handlers if handlers is not None else eventHandlers.EVENT_HANDLERS
+    frame = 1.0 / frame_rate
+
+    # Dictionary of event name -> list of handler latencies in seconds
+    latencies = {}
+
+    clock = 0.0
+    busy_start = busy_end = 0.0
+    dropped_frames = 0
+    worst_delay = 0.0
+
+    for timestamp, event, delta in recording['events']:
+        scene.apply(event, delta)
+        handler = event_handlers.get(event)
+
+        if handler is None:
+            continue
+
+        started = time.time()
+        handler(window, scene)
+        latency = time.time() - started
+
+        latencies.setdefault(event, []).append(latency)
+
+        # Handlers run back to back while events arrive faster than they're handled;
+        # each stretch of main thread work blocks one redraw per whole frame it lasts
+        start = max(timestamp, clock)
+        clock = start + latency
+        worst_delay = max(worst_delay, clock - timestamp)
+
+        if start > busy_end:
+            dropped_frames += int((busy_end - busy_start) // frame)
+            busy_start = start
+        busy_end = clock
+
+    dropped_frames += int((busy_end - busy_start) // frame)
+
+    statistics = {}
+    for event, values in latencies.items():
+        values.sort()
+        statistics[event] = {
+            'count': len(values),
+            'median': values[len(values) // 2] * 1000.0,
+            'p95': values[min(len(values) - 1, int(len(values) * 0.95))] * 1000.0,
+            'worst': values[-1] * 1000.0
+        }
+
+    return {'events': statistics, 'dropped_frames': dropped_frames, 'worst_delay': worst_delay * 1000.0}
+
+
+def print_report(report):
+    """
+    :param report: Dictionary returned by replay()
+    :return: None
+    """
+    for event, statistics in sorted(report['events'].items()):
+        print '%-26s %6d event(s)  median %8.3f ms  p95 %8.3f ms  worst %8.3f ms' % (
+            event, statistics['count'], statistics['median'], statistics['p95'], statistics['worst'])
+
+    print 'Dropped frames: %d, worst delay %.3f ms' % (report['dropped_frames'], report['worst_delay'])
+
+
+def main(arguments):
+    """
+    Replays a recording, or a synthetic storm if no path is given, with a regular Python 2 interpreter:
+    python MayaSceneLights_eventReplay.py [recording.json] [frame rate]
+    :param arguments: Array of command line arguments
+    :return: Exit status; 1 if any frame was dropped, 0 otherwise
+    """
+    recording = load(arguments[0]) if arguments else storm_recording()
+    frame_rate = float(arguments[1]) if len(arguments) > 1 else FRAME_RATE
+
+    report = replay(recording, frame_rate=frame_rate)
+    print_report(report)
+
+    return 1 if report['dropped_frames'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,105 @@
+__author__ = 'Carlos Montes'
+
+''' Balances light intensities in photographic stops (EV), where EV 0 is an intensity of 1. '''
+
+import maya.cmds as cmds
+
+import mayautils
+
+
+# Name of the feature in the error raised when NumPy is missing
+FEATURE = 'Exposure balancing'
+
+
+# Balancing modes understood by balance()
+NORMALIZE_TOTAL, NORMALIZE_MEAN, MATCH_REFERENCE = range(3)
+
+
+def to_stops(intensities):
+    """
+    :param intensities: Array of intensities
+    :return: NumPy array of exposure stops; NaN where the intensity isn't positive
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    intensities = numpy.asarray(intensities, dtype=numpy.float64)
+    stops = numpy.full(intensities.shape, numpy.nan)
+
+    positive = intensities > 0
+    stops[positive] = numpy.log2(intensities[positive])
+    return stops
+
+
+def balance(intensities, mode, target, reference=0):
+    """
+    Computes new intensities for a whole selection at once. Lights whose intensity
+    isn't positive have no exposure, so they are left as they are.
+    :param intensities: Array of current intensities
+    :param mode: NORMALIZE_TOTAL scales every light so their summed intensity is 2^target;
+    NORMALIZE_MEAN offsets every light so their mean exposure is target; MATCH_REFERENCE
+    sets every light target stops away from the reference light
+    :param target: Target exposure, or stops from the reference light, in EV
+    :param reference: Index of the reference light, used by MATCH_REFERENCE
+    :return: NumPy array of new intensities
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    intensities = numpy.asarray(intensities, dtype=numpy.float64)
+    stops = to_stops(intensities)
+    exposed = ~numpy.isnan(stops)
+    result = intensities.copy()
+
+    if not exposed.any():
+        return result
+
+    if mode == NORMALIZE_TOTAL:
+        # The same offset for every light keeps their exposure ratios
+        offset = target - numpy.log2(intensities[exposed].sum())
+        result[exposed] = intensities[exposed] * 2.0 ** offset
+
+    elif mode == NORMALIZE_MEAN:
+        offset = target - stops[exposed].mean()
+        result[exposed] = intensities[exposed] * 2.0 ** offset
+
+    elif mode == MATCH_REFERENCE:
+        if not exposed[reference]:
+            raise ValueError('The reference light has no exposure; its intensity must be positive')
+
+        result[exposed] = 2.0 ** (stops[reference] + target)
+        result[reference] = intensities[reference]
+
+    else:
+        raise ValueError('Unknown balancing mode: %s' % mode)
+
+    return result
+
+
+def preview(names, intensities, new_intensities):
+    """
+    Builds the rows of a dry-run table, without changing the scene.
+    :param names: Array of light names
+    :param intensities: Array of current intensities
+    :param new_intensities: Array of new intensities, as returned by balance()
+    :return: List of (name, intensity, EV, new intensity, new EV, stops changed) tuples;
+    EV values are None where the intensity isn't positive
+    """
+    numpy = mayautils.require_numpy(FEATURE)
+
+    stops = to_stops(intensities)
+    new_stops = to_stops(new_intensities)
+
+    def stop_value(value):
+        return None if numpy.isnan(value) else float(value)
+
+    return [(name, float(intensities[index]), stop_value(stops[index]),
+             float(new_intensities[index]), stop_value(new_stops[index]),
+             stop_value(new_stops[index] - stops[index]))
+            for index, name in enumerate(names)]
+
+
+def read_intensities(lights):
+    """
+    :param lights: Array of light Transform node names
+    :return: List of the lights' current intensities
+    """
+    return [cmds.getAttr('%s.intensity' % light) for light in lights]
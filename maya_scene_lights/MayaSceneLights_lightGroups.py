@@ -0,0 +1,142 @@
+__author__ = 'Carlos Montes'
+
+''' Named groups of lights, stored in the scene as tagged objectSets, with bulk operations. '''
+
+import maya.cmds as cmds
+
+import MayaSceneLights_applyChanges as applyChanges
+import MayaSceneLights_curveOptimizer as curveOptimizer
+import mayautils
+
+
+# Attribute that tells the objectSets used as light groups apart from any other set
+GROUP_ATTRIBUTE = 'lightInterfaceGroup'
+
+
+class LightGroups(object):
+    """
+    Index of the scene's light groups. Members are cached per group, so resolving
+    a group costs as much as its number of lights, whatever the size of the scene.
+    """
+
+    def __init__(self):
+        """
+        :return: None
+        """
+        # Dictionary of group name -> list of light Transform node names
+        self.groups = {}
+
+    def __contains__(self, group):
+        return group in self.groups
+
+    def __len__(self):
+        return len(self.groups)
+
+    def refresh(self):
+        """
+        Rebuild the index from the tagged objectSets in the scene.
+        :return: None
+        """
+        self.groups = {}
+
+        for object_set in cmds.ls(type='objectSet') or []:
+            if cmds.attributeQuery(GROUP_ATTRIBUTE, node=object_set, exists=True):
+                self.groups[object_set] = cmds.sets(object_set, query=True) or []
+
+    def names(self):
+        """
+        :return: Sorted list of group names
+        """
+        return sorted(self.groups)
+
+    def members(self, group):
+        """
+        :param group: Group name
+        :return: List of light Transform node names in the group
+        """
+        return list(self.groups.get(group, ()))
+
+    def create(self, name, lights):
+        """
+        Create a new group in the scene.
+        :param name: Desired group name; Maya may change it to keep it unique
+        :param lights: Array of light Transform node names
+        :return: Actual name of the new group
+        """
+        group = cmds.sets(name=name, empty=True)
+        cmds.addAttr(group, longName=GROUP_ATTRIBUTE, attributeType='bool', defaultValue=True)
+
+        self.groups[group] = []
+        self.add(group, lights)
+        return group
+
+    def delete(self, group):
+        """
+        Delete a group from the scene. Its lights are not deleted.
+        :param group: Group name
+        :return: None
+        """
+        if self.groups.pop(group, None) is not None and cmds.objExists(group):
+            cmds.delete(group)
+
+    def add(self, group, lights):
+        """
+        Add lights to a group, with a single sets call.
+        :param group: Group name
+        :param lights: Array of light Transform node names
+        :return: None
+        """
+        lights = [light for light in lights if light not in self.groups[group]]
+
+        if lights:
+            cmds.sets(lights, add=group)
+            self.groups[group].extend(lights)
+
+    def remove(self, group, lights):
+        """
+        Remove lights from a group, with a single sets call.
+        :param group: Group name
+        :param lights: Array of light Transform node names
+        :return: None
+        """
+        removed = set(lights) & set(self.groups[group])
+
+        if removed:
+            cmds.sets(list(removed), remove=group)
+            self.groups[group] = [light for light in self.groups[group] if light not in removed]
+
+    def change_intensity(self, group, quantity, operator, keyframe):
+        """
+        Changes the intensity of every light in a group; see applyChanges.change_intensity.
+        :param group: Group name
+        :param quantity: Amount of intensity to change
+        :param operator: Modifying operator value
+        :param keyframe: Boolean to define whether to set a keyframe or not
+        :return: None
+        """
+        with mayautils.undo_chunk():
+            applyChanges.change_intensity(quantity, operator, self.members(group), keyframe)
+
+    def change_color(self, group, color_value, keyframe, color_or_shadow):
+        """
+        Changes the light color or shadow color of every light in a group; see applyChanges.change_color.
+        :param group: Group name
+        :param color_value: Array of floats that defines the RGB values to assign
+        :param keyframe: Boolean to define whether to set a keyframe or not
+        :param color_or_shadow: 1 = color, 2 = shadow
+        :return: None
+        """
+        with mayautils.undo_chunk():
+            applyChanges.change_color(color_value, self.members(group), keyframe, color_or_shadow)
+
+    def set_keyframes(self, group, attributes=curveOptimizer.CURVE_ATTRIBUTES):
+        """
+        Keys the current values of every light in a group at the current frame, with a single setKeyframe call.
+        :param group: Group name
+        :param attributes: Array of light attribute names to key
+        :return: None
+        """
+        lights = self.members(group)
+
+        if lights:
+            cmds.setKeyframe(lights, attribute=list(attributes))
@@ -0,0 +1,394 @@
+__author__ = 'Carlos Montes'
+
+''' Compact records of the lights shown in the window, and the store that indexes them. '''
+
+import bisect
+import colorsys
+import re
+
+
+def natural_sort_key(name):
+    """
+    Sort key that orders the numbers inside names by value, so 'light2' goes before 'light10'.
+    :param name: Light name
+    :return: Tuple that alternates lowercase text and integers, starting with text
+    """
+    parts = re.split(r'(\d+)', name)
+    parts[1::2] = [int(part) for part in parts[1::2]]
+    parts[::2] = [part.lower() for part in parts[::2]]
+    return tuple(parts)
+
+
+def split_namespace(name):
+    """
+    :param name: Light name, maybe with a DAG path
+    :return: Tuple of (namespace, short name) of the name's last DAG path part; the
+    namespace is '' for the root namespace
+    """
+    namespace, _, short_name = name.rsplit('|', 1)[-1].rpartition(':')
+    return namespace, short_name
+
+
+def hue(color):
+    """
+    :param color: (r, g, b) floats, or None
+    :return: Hue between 0 and 1, or None
+    """
+    if color is None:
+        return None
+
+    return colorsys.rgb_to_hsv(*color)[0]
+
+
+# Functions that turn a LightRecord into the value it's sorted by, per sort field.
+# Lights whose values haven't been read from Maya yet go after the rest
+SORT_VALUES = {
+    'name': lambda record: record.sort_key,
+    'namespace': lambda record: natural_sort_key(record.namespace),
+    'type': lambda record: record.type,
+    'intensity': lambda record: (record.intensity is None, record.intensity),
+    'layers': lambda record: (record.layers == 0, record.layers),
+    'hue': lambda record: (record.color is None, hue(record.color))
+}
+
+
+class LightRecord(object):
+    """
+    Everything the window knows about a single light. Uses __slots__ to keep
+    the memory footprint small in scenes with tens of thousands of lights.
+    """
+
+    __slots__ = ('handle', 'name', 'sort_key', 'namespace', 'short_name', 'type',
+                 'intensity', 'color', 'shadow_color', 'layers', 'row')
+
+    def __init__(self, name, light_type, handle=None, row=-1):
+        """
+        :param name: Transform node name of the light
+        :param light_type: nodeType of the light's shape
+        :param handle: Optional MObjectHandle of the light's Transform node
+        :param row: Position of the light in the window's widgetlist
+        :return: None
+        """
+        self.handle = handle
+        self.name = name
+        self.sort_key = natural_sort_key(name)
+        self.namespace, self.short_name = split_namespace(name)
+        self.type = light_type
+
+        # Cached attribute values, None until they are read from Maya
+        self.intensity = None
+        self.color = None
+        self.shadow_color = None
+
+        # Bitmask of the Render Layers this light is a member of
+        self.layers = 0
+
+        self.row = row
+
+    def __repr__(self):
+        return 'LightRecord(%r, %r)' % (self.name, self.type)
+
+
+class LightStore(object):
+    """
+    Ordered collection of LightRecords, indexed by name, type and namespace, with one bit
+    assigned to each Render Layer.
+    """
+
+    def __init__(self):
+        """
+        :return: None
+        """
+        # Records in widgetlist order; record.row is the index in this list
+        self.records = []
+
+        # Dictionary of light name -> LightRecord
+        self.by_name = {}
+
+        # Dictionary of light type -> set of LightRecords of that type
+        self.by_type = {}
+
+        # Dictionary of handle hash code -> LightRecord, for the records that have a handle
+        self.by_handle = {}
+
+        # Dictionary of namespace -> set of LightRecords in that namespace; '' is the root namespace
+        self.by_namespace = {}
+
+        # Dictionary of Render Layer name -> bit of LightRecord.layers
+        self.layer_bits = {}
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def add(self, name, light_type, handle=None):
+        """
+        Append a new record at the end of the store.
+        :param name: Transform node name of the light
+        :param light_type: nodeType of the light's shape
+        :param handle: Optional MObjectHandle of the light's Transform node
+        :return: The new LightRecord
+        """
+        record = LightRecord(name, light_type, handle, len(self.records))
+        self.records.append(record)
+        self._index(record)
+        return record
+
+    def insert(self, name, light_type, handle=None):
+        """
+        Insert a new record at its natural sort position, shifting the rows of the records after it.
+        :param name: Transform node name of the light
+        :param light_type: nodeType of the light's shape
+        :param handle: Optional MObjectHandle of the light's Transform node
+        :return: The new LightRecord
+        """
+        record = LightRecord(name, light_type, handle)
+        row = bisect.bisect([other.sort_key for other in self.records], record.sort_key)
+
+        record.row = row
+        self.records.insert(row, record)
+        self._index(record)
+        self.reindex(row + 1)
+        return record
+
+    def insert_many(self, lights):
+        """
+        Insert several new records at their natural sort positions, reindexing the rows once.
+        :param lights: Array of (name, light type, MObjectHandle or None) tuples
+        :return: List of the new LightRecords, in row order
+        """
+        keys = [other.sort_key for other in self.records]
+        new_records = sorted((LightRecord(name, light_type, handle) for name, light_type, handle in lights),
+                             key=lambda record: record.sort_key)
+
+        records = []
+        start = 0
+
+        for record in new_records:
+            row = bisect.bisect(keys, record.sort_key, start)
+            records.extend(self.records[start:row])
+            records.append(record)
+            self._index(record)
+            start = row
+
+        records.extend(self.records[start:])
+
+        self.records = records
+        self.reindex()
+        return new_records
+
+    def reorder(self, records):
+        """
+        Replace the order of the records, after the widgetlist has been sorted.
+        :param records: Array with every LightRecord of the store, in the new order
+        :return: None
+        """
+        self.records = list(records)
+        self.reindex()
+
+    def sort_key_function(self, fields):
+        """
+        :param fields: Array of SORT_VALUES field names, from the most to the least significant
+        :return: Function that returns a LightRecord's sort key; ties are broken by name
+        """
+        getters = [SORT_VALUES[field] for field in fields]
+        return lambda record: tuple(getter(record) for getter in getters) + (record.sort_key,)
+
+    def remove(self, name):
+        """
+        Remove a record, shifting the rows of the records after it.
+        :param name: Transform node name of the light
+        :return: The removed LightRecord, or None if there wasn't any with that name
+        """
+        record = self.by_name.pop(name, None)
+
+        if record is not None:
+            del self.records[record.row]
+            self._unindex(record)
+            self.reindex(record.row)
+
+        return record
+
+    def remove_many(self, names):
+        """
+        Remove several records, reindexing the rows once.
+        :param names: Array of Transform node names; the ones without a record are skipped
+        :return: List of the removed LightRecords
+        """
+        removed = [self.by_name.pop(name) for name in set(names) if name in self.by_name]
+
+        if removed:
+            removed_set = set(removed)
+            self.records = [record for record in self.records if record not in removed_set]
+
+            for record in removed:
+                self._unindex(record)
+
+            self.reindex(min(record.row for record in removed))
+
+        return removed
+
+    def rename(self, old_name, new_name):
+        """
+        Change the name a record is indexed by. Its row doesn't change.
+        :param old_name: Previous Transform node name of the light
+        :param new_name: Current Transform node name of the light
+        :return: The renamed LightRecord, or None if there wasn't any with the previous name
+        """
+        record = self.by_name.pop(old_name, None)
+
+        if record is not None:
+            self.by_namespace[record.namespace].discard(record)
+            if not self.by_namespace[record.namespace]:
+                del self.by_namespace[record.namespace]
+
+            record.name = new_name
+            record.sort_key = natural_sort_key(new_name)
+            record.namespace, record.short_name = split_namespace(new_name)
+            self.by_name[new_name] = record
+            self.by_namespace.setdefault(record.namespace, set()).add(record)
+
+        return record
+
+    def reindex(self, start=0):
+        """
+        Update the row of every record from a position onwards.
+        :param start: First position to update
+        :return: None
+        """
+        for row in range(start, len(self.records)):
+            self.records[row].row = row
+
+    def clear(self):
+        """
+        Remove every record. Render Layer bits are kept, since layers outlive lights.
+        :return: None
+        """
+        self.records = []
+        self.by_name = {}
+        self.by_type = {}
+        self.by_handle = {}
+        self.by_namespace = {}
+
+    def get(self, name):
+        """
+        :param name: Transform node name of a light
+        :return: LightRecord with that name, or None
+        """
+        return self.by_name.get(name)
+
+    def find_handle(self, handle):
+        """
+        :param handle: MObjectHandle of a light's Transform node
+        :return: LightRecord of that node, or None
+        """
+        record = self.by_handle.get(handle.hashCode())
+
+        if record is not None and record.handle == handle:
+            return record
+
+        return None
+
+    def namespaces(self):
+        """
+        :return: List of (namespace, number of lights) tuples, in natural order; '' is the root namespace
+        """
+        return [(namespace, len(self.by_namespace[namespace]))
+                for namespace in sorted(self.by_namespace, key=natural_sort_key)]
+
+    def names(self):
+        """
+        :return: List of light names, in widgetlist order
+        """
+        return [record.name for record in self.records]
+
+    def layer_bit(self, layer):
+        """
+        Return the bit that stands for a Render Layer, assigning a new one if needed.
+        :param layer: Render Layer name
+        :return: Integer with a single bit set
+        """
+        bit = self.layer_bits.get(layer)
+
+        if bit is None:
+            bit = 1 << len(self.layer_bits)
+            self.layer_bits[layer] = bit
+
+        return bit
+
+    def set_layer_members(self, layer, members):
+        """
+        Update every record's Render Layer bit according to the layer's members.
+        :param layer: Render Layer name
+        :param members: Iterable with the names of the layer's members
+        :return: None
+        """
+        bit = self.layer_bit(layer)
+        members = set(members)
+
+        for record in self.records:
+            if record.name in members:
+                record.layers |= bit
+            else:
+                record.layers &= ~bit
+
+    def count(self, light_type):
+        """
+        :param light_type: nodeType of a light's shape
+        :return: Number of lights of that type
+        """
+        return len(self.by_type.get(light_type, ()))
+
+    def layer_records(self, layer):
+        """
+        :param layer: Render Layer name
+        :return: Set of the LightRecords that are members of the layer
+        """
+        bit = self.layer_bits.get(layer)
+
+        if bit is None:
+            return set()
+
+        return set(record for record in self.records if record.layers & bit)
+
+    def _index(self, record):
+        """
+        Add a new record to the name, type, namespace and handle indices.
+        :param record: LightRecord
+        :return: None
+        """
+        self.by_name[record.name] = record
+        self.by_type.setdefault(record.type, set()).add(record)
+        self.by_namespace.setdefault(record.namespace, set()).add(record)
+
+        if record.handle is not None:
+            self.by_handle[record.handle.hashCode()] = record
+
+    def _unindex(self, record):
+        """
+        Remove a record from the type, namespace and handle indices; the name index is left to the caller.
+        :param record: LightRecord
+        :return: None
+        """
+        self.by_type[record.type].discard(record)
+
+        self.by_namespace[record.namespace].discard(record)
+        if not self.by_namespace[record.namespace]:
+            del self.by_namespace[record.namespace]
+
+        if record.handle is not None:
+            self.by_handle.pop(record.handle.hashCode(), None)
+
+    def in_layer(self, record, layer):
+        """
+        :param record: LightRecord
+        :param layer: Render Layer name
+        :return: Boolean that tells whether the light is a member of the layer
+        """
+        bit = self.layer_bits.get(layer)
+        return bit is not None and bool(record.layers & bit)
@@ -0,0 +1,256 @@
+__author__ = 'Carlos Montes'
+
+''' Pre-flight checks of a light rig, run in one pass over cached light values, with batched fixes. '''
+
+import sys
+
+import maya.cmds as cmds
+import maya.OpenMaya as OpenMaya
+import maya.OpenMayaAnim as OpenMayaAnim
+
+import MayaSceneLights_applyChanges as applyChanges
+import MayaSceneLights_curveOptimizer as curveOptimizer
+import MayaSceneLights_discovery as discovery
+import MayaSceneLights_lightStore as lightStore
+import MayaSceneLights_renderLayers as renderLayers
+
+
+# Checks run on every light, in report order, with their labels
+CHECKS = (
+    ('intensity', 'Zero or negative intensity'),
+    ('black', 'Black color'),
+    ('layers', 'In no Render Layer'),
+    ('flat_keys', 'Keys at identical values'),
+    ('duplicate_names', 'Duplicate short name')
+)
+
+# Checks that fix() can correct; duplicate names are left to the artist
+FIXABLE_CHECKS = ('intensity', 'black', 'layers', 'flat_keys')
+
+# Largest difference between the key values of a curve that is still considered flat
+FLAT_TOLERANCE = 1e-6
+
+
+def short_name(name):
+    """
+    :param name: Light Transform node name, maybe with a DAG path and namespaces
+    :return: The name without its DAG path and namespaces
+    """
+    return lightStore.split_namespace(name)[1]
+
+
+def lint(names, intensities, colors, layers, flat_keys, check_layers=True):
+    """
+    Runs every check in a single pass over the lights' cached values. Values that
+    haven't been read, None, are not checked.
+    :param names: Array of light Transform node names
+    :param intensities: Array of intensities, in the same order as names
+    :param colors: Array of (r, g, b) colors, in the same order as names
+    :param layers: Array of integers, non zero for the lights in a non-default Render Layer
+    :param flat_keys: Array of lists of the attributes whose keys are all at the same value
+    :param check_layers: False to skip the Render Layer check, e.g. in scenes without Render Layers
+    :return: Dictionary of check -> list of (light name, detail) tuples, for every check in CHECKS
+    """
+    issues = dict((check, []) for check, _ in CHECKS)
+
+    # Dictionary of short name -> list of light names
+    short_names = {}
+
+    for name, intensity, color, light_layers, flat in zip(names, intensities, colors, layers, flat_keys):
+        if intensity is not None and intensity <= 0:
+            issues['intensity'].append((name, intensity))
+
+        if color is not None and max(color) <= 0:
+            issues['black'].append((name, tuple(color)))
+
+        if check_layers and not light_layers:
+            issues['layers'].append((name, None))
+
+        if flat:
+            issues['flat_keys'].append((name, tuple(flat)))
+
+        short_names.setdefault(short_name(name), []).append(name)
+
+    for short, group in sorted(short_names.items()):
+        if len(group) > 1:
+            issues['duplicate_names'].extend((name, short) for name in group)
+
+    return issues
+
+
+def describe(check, detail):
+    """
+    :param check: Key of CHECKS
+    :param detail: Detail of an issue, as returned by lint()
+    :return: Text that explains the issue
+    """
+    if check == 'intensity':
+        return 'Intensity %g' % detail
+    if check == 'black':
+        return 'Color (%g, %g, %g)' % detail
+    if check == 'layers':
+        return 'Only in defaultRenderLayer'
+    if check == 'flat_keys':
+        return ', '.join(detail)
+
+    return 'Shares the name %s' % detail
+
+
+def count(issues):
+    """
+    :param issues: Dictionary of check -> list of issues, as returned by lint()
+    :return: Total number of issues
+    """
+    return sum(len(check_issues) for check_issues in issues.values())
+
+
+def flat_key_attributes(handles, tolerance=FLAT_TOLERANCE):
+    """
+    Finds the animation curves of several lights whose keys are all at the same value, through the API.
+    :param handles: Array of MObjectHandles of light Transform nodes
+    :param tolerance: Largest difference between key values of a flat curve
+    :return: List with one list of attributes per light, empty for the lights that can't be read
+    """
+    flat_keys = []
+    path = OpenMaya.MDagPath()
+    sources = OpenMaya.MPlugArray()
+
+    for handle in handles:
+        flat = []
+        flat_keys.append(flat)
+
+        try:
+            OpenMaya.MDagPath.getAPathTo(handle.object(), path)
+            path.extendToShape()
+        except (AttributeError, RuntimeError):
+            continue
+
+        node = OpenMaya.MFnDependencyNode(path.node())
+
+        for attribute in curveOptimizer.CURVE_ATTRIBUTES:
+            if not node.hasAttribute(attribute):
+                continue
+
+            node.findPlug(attribute).connectedTo(sources, True, False)
+
+            if not sources.length() or not sources[0].node().hasFn(OpenMaya.MFn.kAnimCurve):
+                continue
+
+            curve = OpenMayaAnim.MFnAnimCurve(sources[0].node())
+            values = [curve.value(index) for index in range(curve.numKeys())]
+
+            if len(values) > 1 and max(values) - min(values) <= tolerance:
+                flat.append(attribute)
+
+    return flat_keys
+
+
+def fix(issues, layer=None, layer_index=None):
+    """
+    Corrects the issues of the fixable checks, with one applyChanges call per check:
+    intensities are set to 1, black colors to white, lights in no Render Layer are added
+    to a layer, and flat curves are removed, leaving their constant value.
+    :param issues: Dictionary of check -> list of (light name, detail) tuples, as returned by lint()
+    :param layer: Render Layer the 'layers' issues are fixed with; they are skipped if None
+    :param layer_index: Optional RenderLayerMembership whose cached members are kept up to date
+    :return: Number of issues fixed
+    """
+    fixed = 0
+
+    def existing(check):
+        return [name for name, _ in issues.get(check, []) if cmds.objExists(name)]
+
+    lights = existing('intensity')
+    if lights:
+        applyChanges.change_intensity(1.0, 0, lights, False)
+        fixed += len(lights)
+
+    lights = existing('black')
+    if lights:
+        applyChanges.change_color([1.0, 1.0, 1.0], lights, False, 1)
+        fixed += len(lights)
+
+    lights = existing('layers')
+    if lights and layer is not None:
+        if layer_index is not None:
+            layer_index.edit_members(layer, lights, True)
+        else:
+            cmds.editRenderLayerMembers(layer, lights)
+        fixed += len(lights)
+
+    for name, attributes in issues.get('flat_keys', []):
+        if cmds.objExists(name):
+            for attribute in attributes:
+                cmds.cutKey(name, attribute=attribute, clear=True)
+            fixed += 1
+
+    return fixed
+
+
+def scene_issues():
+    """
+    Runs every check on the lights of the open scene, without the window.
+    :return: Dictionary of check -> list of (light name, detail) tuples
+    """
+    lights = discovery.discover_lights()
+    handles = [handle for handle, _, _ in lights]
+    names = [name for _, name, _ in lights]
+
+    values = discovery.read_light_values(handles)
+
+    layer_index = renderLayers.RenderLayerMembership()
+    layer_index.refresh()
+    layer_members = set()
+    for members in layer_index.members.values():
+        layer_members.update(members)
+
+    return lint(names,
+                [intensity for intensity, _ in values],
+                [color for _, color in values],
+                [int(name in layer_members) for name in names],
+                flat_key_attributes(handles),
+                bool(layer_index.layers))
+
+
+def report(issues):
+    """
+    Prints the issues, grouped by check.
+    :param issues: Dictionary of check -> list of (light name, detail) tuples
+    :return: None
+    """
+    for check, label in CHECKS:
+        if issues[check]:
+            print '%s: %d light(s)' % (label, len(issues[check]))
+            for name, detail in issues[check]:
+                print '    %s  %s' % (name, describe(check, detail))
+
+    print '%d issue(s) found' % count(issues)
+
+
+def main(arguments):
+    """
+    Farm pre-flight entry point, for mayapy:
+    mayapy MayaSceneLights_lint.py scene.ma [scene.mb ...]
+    :param arguments: Array of scene paths
+    :return: Exit status; 0 if no scene has issues, 1 otherwise
+    """
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+
+    status = 0
+
+    for scene in arguments:
+        print 'Checking %s' % scene
+        cmds.file(scene, open=True, force=True)
+
+        issues = scene_issues()
+        report(issues)
+
+        if count(issues):
+            status = 1
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,79 @@
+__author__ = 'Carlos Montes'
+
+''' Interactive previews of light attribute changes, written straight to the plugs and committed once. '''
+
+import maya.OpenMaya as OpenMaya
+
+
+# Milliseconds between two preview writes, about the rate at which the viewport refreshes
+PREVIEW_INTERVAL = 16
+
+
+class LivePlugEdit(object):
+    """
+    Looks up the plugs of several lights once, then writes preview values to them
+    through the API, which doesn't record undo entries. The original values are kept,
+    so they can be restored before committing the final values as a single undo step.
+    """
+
+    def __init__(self, lights, attributes):
+        """
+        :param lights: Array of light Transform node names; the ones that don't exist are skipped
+        :param attributes: Array of numeric attribute names to edit on every light
+        :return: None
+        """
+        # Lights whose plugs were found
+        self.lights = []
+
+        # One list of MPlugs per light, in the order of attributes
+        self.plugs = []
+
+        # One list of floats per light, in the order of attributes
+        self.originals = []
+
+        selection = OpenMaya.MSelectionList()
+
+        for light in lights:
+            plugs = []
+            try:
+                for attribute in attributes:
+                    selection.clear()
+                    selection.add('%s.%s' % (light, attribute))
+                    plug = OpenMaya.MPlug()
+                    selection.getPlug(0, plug)
+                    plugs.append(plug)
+            except RuntimeError:
+                continue
+
+            self.lights.append(light)
+            self.plugs.append(plugs)
+            self.originals.append([plug.asDouble() for plug in plugs])
+
+    def __len__(self):
+        return len(self.lights)
+
+    def write(self, values):
+        """
+        :param values: One list of floats per light, in the order of attributes
+        :return: None
+        """
+        for plugs, light_values in zip(self.plugs, values):
+            for plug, value in zip(plugs, light_values):
+                plug.setDouble(value)
+
+    def write_all(self, light_values):
+        """
+        Write the same values to every light.
+        :param light_values: Array of floats, in the order of attributes
+        :return: None
+        """
+        for plugs in self.plugs:
+            for plug, value in zip(plugs, light_values):
+                plug.setDouble(value)
+
+    def restore(self):
+        """
+        Write the original values back.
+        :return: None
+        """
+        self.write(self.originals)
@@ -4,38 +4,227 @@ __author__ = 'Carlos Montes'
 Connects the QtGui window in windowTemplate.py to the Maya Environment.
 """
 
+import socket
+import sys
+import time
+
+# Time at which this module started importing, to measure the window's startup time
+_import_started = time.time()
+
 import MayaSceneLights_pysideWindow as pysideWindow
 import MayaSceneLights_applyChanges as applyChanges
+import MayaSceneLights_discovery as discovery
+import MayaSceneLights_eventHandlers as eventHandlers
+import MayaSceneLights_liveEdit as liveEdit
+import MayaSceneLights_renderLayers as renderLayers
 import mayautils
 
 from PySide import QtCore, QtGui
-import pymel.core as pmc
+import maya.cmds as cmds
 import maya.OpenMaya as OpenMaya
 
-def show():
+# Seconds that importing this module and its dependencies took
+import_time = time.time() - _import_started
+
+# Seconds that opening the window should stay under
+STARTUP_TARGET = 1.0
+
+# Seconds that the latest call to show() took, imports included on the first call
+last_startup_time = None
+
+
+def report_startup_time(started):
+    """
+    Stores and prints the time it took to open the window, and
+    warns if it's over the startup target.
+    :param started: time.time() value from when the window started opening
+    :return: None
+    """
+    global last_startup_time
+
+    last_startup_time = time.time() - started
+    print 'Light Interface opened in %.3f seconds' % last_startup_time
+
+    if last_startup_time > STARTUP_TARGET:
+        cmds.warning('Light Interface took %.3f seconds to open; target is %.3f seconds'
+                     % (last_startup_time, STARTUP_TARGET))
+
+
+class MayaScene(object):
+    """
+    The scene the window's event handlers read from, through maya.cmds; see eventHandlers.
+    """
+
+    @staticmethod
+    def selection():
+        """
+        :return: List of the selected node names
+        """
+        return cmds.ls(selection=True)
+
+    @staticmethod
+    def light_values(light):
+        """
+        :param light: Light Transform node name
+        :return: Tuple of (intensity, (r, g, b) color, (r, g, b) shadow color)
+        """
+        return (cmds.getAttr('%s.intensity' % light),
+                cmds.getAttr('%s.color' % light)[0],
+                cmds.getAttr('%s.shadowColor' % light)[0])
+
+    @staticmethod
+    def current_render_layer():
+        """
+        :return: Name of the current Render Layer
+        """
+        return cmds.editRenderLayerGlobals(query=True, currentRenderLayer=True)
+
+
+def show(persistent=False):
     """
     Shows the interface window inside Maya, connects callback functions
     to some of its elements
+    :param persistent: If True, closing the window only hides it, and the next
+    persistent show() reopens the same instance, applying only the scene
+    changes made while it was hidden
     :return: None
     """
+    global import_time
 
-    if pmc.window('lightInterfaceUI', exists=True):
-        pmc.deleteUI('lightInterfaceUI', wnd=True)
-        
-    # === WINDOW INSTANCE, BACKGROUND ===
-    # ====== AND UTILITY FUNCTIONS ======
+    # The first window opened also pays for the module imports
+    startup_started = time.time() - import_time
+    import_time = 0.0
 
     # Get the main Maya window as a parent of the interface
     parentwindow = pysideWindow.get_maya_window()
 
+    previous_window = parentwindow.findChild(QtGui.QMainWindow, 'lightInterfaceUI')
+
+    # Reopen a warm persistent window instead of building a new one
+    if persistent and getattr(previous_window, 'persistent', False):
+        previous_window.reopen()
+        report_startup_time(startup_started)
+        return
+
+    # deleteUI doesn't always trigger closeEvent, so remove the callbacks
+    # of a previous window first, even if it comes from a reloaded module
+    if previous_window is not None and hasattr(previous_window, 'callbacks'):
+        previous_window.callbacks.remove_all()
+
+    if cmds.window('lightInterfaceUI', exists=True):
+        cmds.deleteUI('lightInterfaceUI', wnd=True)
+        
+    # === WINDOW INSTANCE, BACKGROUND ===
+    # ====== AND UTILITY FUNCTIONS ======
+
     _window = pysideWindow.LightInterfaceWindow(parent=parentwindow)
 
+    # Scene the event handlers read from
+    maya_scene = MayaScene()
+
     # Change the window's background color to a very dark gray
     background_palette = _window.palette()
     background_palette.setColor(_window.backgroundRole(),
                                 QtGui.QColor(46, 46, 46))
     _window.setPalette(background_palette)
 
+    # Scene changes made while a persistent window is hidden, applied when it's reopened
+    hidden_changes = {
+        'added': [],
+        'removed': set(),
+        'renamed': {}
+    }
+
+    # Intensity scrub in progress, and the timer that throttles its preview writes
+    intensity_scrub = {'edit': None, 'written': 0.0}
+    scrub_timer = QtCore.QTimer(_window)
+    scrub_timer.setInterval(liveEdit.PREVIEW_INTERVAL)
+
+    # Live color preview in progress, and the timer that throttles its writes
+    live_color = {'edit': None, 'kind': None, 'pending': None}
+    color_timer = QtCore.QTimer(_window)
+    color_timer.setInterval(liveEdit.PREVIEW_INTERVAL)
+
+    # Loaded reference nodes as of the latest refill or reference change, and
+    # whether a scene is being opened, which loads its references on its own
+    reference_state = {'loaded': set(), 'opening': False}
+
+    # Whether the Render Layer bits the list is sorted by are older than the latest Render Layer event
+    layer_sort_state = {'stale': True}
+
+    # Original states of the lights switched by solo and mute, once they're first used
+    solo_mute = {'states': None}
+
+    # Dialog that creates copies of a template light
+    bulk_create_dialog = pysideWindow.BulkCreateDialog(parent=_window)
+
+    # Cached Render Layer membership, and the matrix dialog that edits it
+    layer_index = renderLayers.RenderLayerMembership()
+    layer_matrix = pysideWindow.LayerMatrixDialog(parent=_window)
+
+    # Lights being balanced in exposure stops, their previewed intensities, and the dialog
+    exposure_state = {'lights': [], 'intensities': None}
+    exposure_dialog = pysideWindow.ExposureDialog(parent=_window)
+
+    # Light names and arrays shown by the distribution charts, and their dialog
+    distribution_state = {'names': [], 'intensity': None, 'hue': None, 'value': None}
+    distribution_dialog = pysideWindow.DistributionDialog(parent=_window)
+
+    # Light rig snapshot compared with the scene, and the dialog that shows the differences
+    rig_snapshot = {'snapshot': None}
+    rig_layers = renderLayers.RenderLayerMembership()
+    rig_diff_dialog = pysideWindow.RigDiffDialog(parent=_window)
+
+    # Issues found by the latest light rig checks, and the dialog that lists them
+    lint_state = {'issues': None}
+    lint_dialog = pysideWindow.LintDialog(parent=_window)
+
+    # Index of the scene's light groups, once they're first used, and the dialog that edits them
+    light_groups = {'index': None}
+    groups_dialog = pysideWindow.LightGroupsDialog(parent=_window)
+
+    # KD-tree of light positions, once it's first queried, and the dialog that queries it
+    spatial_state = {'index': None}
+    spatial_select = pysideWindow.SpatialSelectDialog(parent=_window)
+
+    # Sample points of the light contribution analysis, and its dialog
+    sample_points = {'points': None}
+    contribution_dialog = pysideWindow.ContributionDialog(parent=_window)
+
+    # Records the events the window listens to, for eventReplay, once recording is first started
+    event_recording = {'recorder': None}
+
+    def add_event_callback(event, function, scene_scoped=False):
+        """
+        Creates an OpenMaya MEventMessage callback and registers it in the
+        window's callback registry under the event's name.
+        :param event: Name of the Maya event
+        :param function: Function to call when the event happens
+        :param scene_scoped: True if the callback must be removed when another scene is opened
+        :return: True if the callback could be created
+        """
+        try:
+            _window.callbacks.add(event,
+                                  OpenMaya.MEventMessage.addEventCallback(event, function),
+                                  scene_scoped)
+            return True
+
+        except RuntimeError:
+            print 'Could not initiate %s Maya API Callback' % event
+            return False
+
+    def light_exists(record):
+        """
+        Tells whether a listed light is still in the scene; an O(1) handle validity
+        test, or a name lookup for the records that have no handle.
+        :param record: LightRecord
+        :return: Boolean
+        """
+        if record.handle is None:
+            return cmds.objExists(record.name)
+
+        return record.handle.isValid()
+
     def get_selected_widgetitems():
         """
         Retrieves selected items in the window's widget list into an array,
@@ -43,9 +232,9 @@ def show():
         :return: List with light Transform nodes
         """
 
-        selectedlights = [item.text() for item
-                          in _window.widgetlist.selectedItems()
-                          if pmc.objExists(item.text())]
+        selectedlights = [record.name for record
+                          in _window.selected_records()
+                          if light_exists(record)]
         return selectedlights
 
     def fill_itemlist():
@@ -54,35 +243,103 @@ def show():
         fills the widget list, updates the window's fields.
         :return: None
         """
-        # Get the Transform node and type of light for each existing one
-        current_lights = [(light.getParent(), light.nodeType())
-                          for light in pmc.ls(type='light')]
-
-        current_lights.sort()
+        # Get the Transform node, type of light and a handle to follow it
+        # through renames for each existing one, in a single pass over the DAG
+        current_lights = [(name, light_type, handle)
+                          for handle, name, light_type in discovery.discover_lights()]
 
-        current_selection = pmc.ls(selection=True)
+        current_selection = cmds.ls(selection=True)
 
         _window.populate_itemlist(current_lights, current_selection)
+        reference_state['loaded'] = discovery.loaded_references()
+        layer_sort_state['stale'] = True
+
+        # Keep the chosen sort order across refreshes; lights are listed by name already
+        if not _window.sorted_by_name():
+            sort_light_list()
 
         # If there are any selected lights, update the intensity
         # and color frames with the light in the last place
-        if current_selection:
-            update_window_fields(current_selection[-1].getIntensity(),
-                                 current_selection[-1].getColor(),
-                                 current_selection[-1].getShadowColor())
+        if _window.latest_light_selected is not None:
+            update_latest_light_fields()
+
+    def cache_light_values(records, refresh=False):
+        """
+        Read the intensity and color of several lights through the API into their records.
+        :param records: Array of LightRecords
+        :param refresh: True to read every record again, False to read only the ones not cached yet
+        :return: None
+        """
+        records = [record for record in records
+                   if record.handle is not None and (refresh or record.intensity is None)]
+
+        for record, (intensity, color) in zip(records, discovery.read_light_values(
+                [record.handle for record in records])):
+            record.intensity = intensity
+            record.color = color
+
+    def refresh_light_values(lights):
+        """
+        Read again the cached intensity and color of lights that were just changed,
+        so sorting by intensity or hue doesn't use the values from before the change.
+        :param lights: Array of light Transform node names
+        :return: None
+        """
+        records = [_window.lights.get(light) for light in lights]
+        cache_light_values([record for record in records
+                            if record is not None and record.intensity is not None], True)
+
+    def sort_light_list():
+        """
+        Sort the window's light list by its chosen fields. Intensities and colors
+        are read from Maya only for the records that don't have them cached yet,
+        and Render Layer bits only after a Render Layer event made them stale.
+        :return: None
+        """
+        if set(_window.sort_fields()) & {'intensity', 'hue'}:
+            cache_light_values(_window.lights)
+
+        # Refresh the Render Layer bits, unless the layer matrix has edits to keep
+        if ('layers' in _window.sort_fields() and layer_sort_state['stale']
+                and not layer_index.pending_count()):
+            layer_index.refresh()
+            for layer in layer_index.layers:
+                _window.lights.set_layer_members(layer, layer_index.members[layer])
+            layer_sort_state['stale'] = False
 
-    def update_window_fields(intensity, light_color, shadow_color):
+        _window.sort_lights()
+
+    def layer_members_changed(_):
+        """
+        Render Layers or their members changed; the Render Layer bits are read again on the next sort by layers.
+        :param _: OpenMaya's callback clientData parameter; not used
+        :return: None
+        """
+        layer_sort_state['stale'] = True
+
+    def select_lights(names):
+        """
+        Replaces the Maya selection with a group of lights in a single call,
+        and mirrors it in the window's widgetlist.
+        :param names: Array of light Transform node names
+        :return: None
         """
-        Updates the Current Intensity, Light Color and Shadow Color widgets
-        in the window at the same time.
-        :param intensity: Intensity value
-        :param light_color: RGB value of Light Color
-        :param shadow_color: RGB value of Shadow Color
+        with mayautils.undo_chunk():
+            if names:
+                cmds.select(names, replace=True)
+            else:
+                cmds.select(clear=True)
+
+        _window.update_list_selection(names)
+        update_latest_light_fields()
+
+    def update_latest_light_fields():
+        """
+        Reads the attributes of the latest selected light into its record and
+        updates the window's fields with them; N/A if no light is selected.
         :return: None
         """
-        _window.update_intensity_label(intensity)
-        _window.receive_mayacolor(light_color)
-        _window.receive_mayashadow(shadow_color)
+        eventHandlers.update_latest_light_fields(_window, maya_scene)
 
     # ===== WINDOW CONNECTIONS ======
     # === AND CALLBACK FUNCTIONS ====
@@ -93,11 +350,66 @@ def show():
         :return: None
         """
         try:
-            pmc.editRenderLayerMembers(_window.current_render_layer,
-                                       get_selected_widgetitems())
+            layer_index.edit_members(_window.current_render_layer,
+                                     get_selected_widgetitems(), True)
         except:
             raise RuntimeError("Cannot change current Render Layer's members")
 
+    def commit_layer_matrix():
+        """
+        Send the membership changes made in the Render Layer matrix to Maya,
+        grouped per Render Layer, as a single undo chunk.
+        :return: None
+        """
+        try:
+            with mayautils.undo_chunk():
+                layer_index.commit()
+
+        except RuntimeError:
+            cmds.warning('Cannot change Render Layer members. Please check Script Editor')
+
+        layer_matrix.update_pending_label(layer_index.pending_count())
+
+        # The current Render Layer may have changed its members
+        if _window.render_layer_only:
+            _window.render_layer_on(list(layer_index.members.get(_window.current_render_layer, ())))
+
+    def layer_matrix_cell_changed(cell):
+        """
+        A checkbox of the Render Layer matrix has been toggled; store the edit.
+        :param cell: QTableWidgetItem that changed
+        :return: None
+        """
+        light, layer, state = layer_matrix.cell_info(cell)
+        layer_index.set_member(light, layer, state)
+        layer_matrix.update_pending_label(layer_index.pending_count())
+
+    def open_layer_matrix():
+        """
+        Refresh the cached Render Layer membership and show it in the matrix dialog.
+        :return: None
+        """
+        layer_index.refresh()
+
+        # Keep the Render Layer bits of the light records in sync with the new cache
+        for layer in layer_index.layers:
+            _window.lights.set_layer_members(layer, layer_index.members[layer])
+
+        layer_matrix.populate(_window.lights.names(), layer_index.layers,
+                              layer_index.is_member)
+        layer_matrix.update_pending_label(0)
+        layer_matrix.show()
+
+    def revert_layer_matrix():
+        """
+        Discard the uncommitted changes of the Render Layer matrix.
+        :return: None
+        """
+        layer_index.discard()
+        layer_matrix.populate(_window.lights.names(), layer_index.layers,
+                              layer_index.is_member)
+        layer_matrix.update_pending_label(0)
+
     def apply_color_change():
         """
         Retrieve current RGB value in the window's light_color attribute
@@ -108,13 +420,15 @@ def show():
         rgb_array = _window.giveme_light_color()
 
         try:
+            lights = get_selected_widgetitems()
             applyChanges.change_color([value/255.00 for value in rgb_array],
-                                      get_selected_widgetitems(),
+                                      lights,
                                       _window.keyframecolor_checkbox.isChecked(),
                                       1)
+            refresh_light_values(lights)
 
         except RuntimeError:
-            pmc.warning('Not able to set color. Please check Script Editor')
+            cmds.warning('Not able to set color. Please check Script Editor')
 
     def apply_intensity():
         """
@@ -123,19 +437,170 @@ def show():
         :return: None
         """
         try:
+            lights = get_selected_widgetitems()
+
             with mayautils.undo_chunk():
                 applyChanges.change_intensity(float(_window.intensityquantity_textbox.text()),
                                               _window.intensityoperator_combo.currentIndex(),
-                                              get_selected_widgetitems(),
+                                              lights,
                                               _window.keyframeintensity_checkbox.isChecked())
 
             # Update the current intensity label inside the window
-            _window.update_intensity_label(pmc.getAttr('%s.intensity' % _window.latest_light_selected))
+            refresh_light_values(lights)
+            update_latest_light_fields()
 
         except:
-            pmc.warning('Not able to set intensity')
+            cmds.warning('Not able to set intensity')
             raise ValueError('Insert a numerical value in Intensity textbox')
 
+    def begin_intensity_scrub():
+        """
+        Look up the intensity plugs of the selected lights and start previewing.
+        :return: None
+        """
+        intensity_scrub['edit'] = liveEdit.LivePlugEdit(get_selected_widgetitems(), ['intensity'])
+        intensity_scrub['written'] = 0.0
+
+        if not len(intensity_scrub['edit']):
+            cmds.warning('Please select one or more lights in the Light Interface window\'s list')
+            return
+
+        scrub_timer.start()
+
+    def preview_intensity_scrub():
+        """
+        Write the scrub slider's intensities to the plugs, at most once per timer tick
+        and only if the slider moved since the last write.
+        :return: None
+        """
+        edit = intensity_scrub['edit']
+        stops = _window.scrub_stops()
+
+        if edit is None or stops == intensity_scrub['written']:
+            return
+
+        factor = 2.0 ** stops
+        edit.write([[original * factor for original in originals] for originals in edit.originals])
+        intensity_scrub['written'] = stops
+
+        # Show the previewed intensity of the latest selected light
+        record = _window.latest_light_selected
+        if record is not None and record.name in edit.lights:
+            _window.update_intensity_label(edit.originals[edit.lights.index(record.name)][0] * factor)
+
+    def end_intensity_scrub():
+        """
+        Restore the original intensities and commit the final ones through
+        applyChanges, so the whole scrub is a single undo step.
+        :return: None
+        """
+        scrub_timer.stop()
+
+        edit = intensity_scrub['edit']
+        intensity_scrub['edit'] = None
+        stops = _window.scrub_stops()
+
+        _window.intensityscrub_slider.setValue(0)
+
+        if edit is None or not len(edit):
+            return
+
+        edit.restore()
+
+        if stops:
+            with mayautils.undo_chunk():
+                applyChanges.change_intensity(stops, 5, edit.lights,
+                                              _window.keyframeintensity_checkbox.isChecked())
+            refresh_light_values(edit.lights)
+
+        update_latest_light_fields()
+
+    def intensity_scrub_moved(value):
+        """
+        The scrub slider only previews while it's being dragged; put it
+        back if anything else, like the mouse wheel, moved it.
+        :param value: Slider value
+        :return: None
+        """
+        if intensity_scrub['edit'] is None and value:
+            _window.intensityscrub_slider.setValue(0)
+
+    def begin_live_color(color_or_shadow):
+        """
+        A color dialog was opened; if its Live checkbox is on, look up the color
+        or shadow color plugs of the selected lights to preview on them.
+        :param color_or_shadow: 1 = color, 2 = shadow
+        :return: None
+        """
+        live_checkbox = _window.livecolor_checkbox if color_or_shadow == 1 else _window.liveshadow_checkbox
+
+        if not live_checkbox.isChecked():
+            return
+
+        prefix = 'color' if color_or_shadow == 1 else 'shadColor'
+
+        live_color['edit'] = liveEdit.LivePlugEdit(get_selected_widgetitems(),
+                                                   [prefix + 'R', prefix + 'G', prefix + 'B'])
+        live_color['kind'] = color_or_shadow
+        live_color['pending'] = None
+        color_timer.start()
+
+    def queue_live_color(color):
+        """
+        Keep the latest color of the dialog; only that one is written on the next timer tick.
+        :param color: QColor
+        :return: None
+        """
+        if live_color['edit'] is not None:
+            live_color['pending'] = color
+
+    def write_live_color():
+        """
+        Write the latest color of the dialog to the selected lights' plugs.
+        :return: None
+        """
+        color = live_color['pending']
+
+        if live_color['edit'] is None or color is None:
+            return
+
+        live_color['edit'].write_all([color.redF(), color.greenF(), color.blueF()])
+        live_color['pending'] = None
+
+    def end_live_color(accepted):
+        """
+        The color dialog was closed; restore the original colors, and commit the
+        accepted one through applyChanges, so the preview is a single undo step.
+        :param accepted: True if the dialog's color was accepted
+        :return: None
+        """
+        color_timer.stop()
+
+        edit = live_color['edit']
+        live_color['edit'] = None
+
+        if edit is None or not len(edit):
+            return
+
+        edit.restore()
+
+        if not accepted:
+            return
+
+        if live_color['kind'] == 1:
+            rgb_array = _window.giveme_light_color()
+            keyframe = _window.keyframecolor_checkbox.isChecked()
+        else:
+            rgb_array = _window.giveme_shadow_color()
+            keyframe = _window.keyframeshadow_checkbox.isChecked()
+
+        with mayautils.undo_chunk():
+            applyChanges.change_color([value/255.00 for value in rgb_array], edit.lights,
+                                      keyframe, live_color['kind'])
+
+        refresh_light_values(edit.lights)
+        update_latest_light_fields()
+
     def apply_shadow_change():
         """
         Retrieve Shadow Color value in the window's shadow_color attribute,
@@ -151,7 +616,7 @@ def show():
                                       2)
 
         except RuntimeError:
-            pmc.warning('Not able to set light color.')
+            cmds.warning('Not able to set light color.')
 
     def remove_from_render_layer():
         """
@@ -159,11 +624,11 @@ def show():
         :return: None
         """
         try:
-            pmc.editRenderLayerMembers(_window.current_render_layer,
-                                       get_selected_widgetitems(), remove=True)
+            layer_index.edit_members(_window.current_render_layer,
+                                     get_selected_widgetitems(), False)
 
         except RuntimeError:
-            pmc.warning('Cannot change members of the current Render Layer')
+            cmds.warning('Cannot change members of the current Render Layer')
 
     def render_layer_changed(_):
         """
@@ -171,9 +636,9 @@ def show():
         :param _: OpenMaya's callback clientData parameter; not used
         :return: None
         """
+        layer_sort_state['stale'] = True
 
-        # Update the window's current Render Layer and disable or enable the Render Layer buttons
-        update_window_render_layer()
+        eventHandlers.render_layer_changed(_window, maya_scene)
 
     def render_layer_only():
         """
@@ -189,8 +654,8 @@ def show():
         else:
             # Render Layer Only mode activated; show only items
             # with the same name as the current Layer's members
-            _window.render_layer_on(pmc.editRenderLayerMembers(
-                                    _window.current_render_layer, query=True))
+            _window.render_layer_on(cmds.editRenderLayerMembers(
+                                    _window.current_render_layer, query=True) or [])
 
     def time_changed(_):
         """
@@ -199,10 +664,7 @@ def show():
         :param _: OpenMaya's callback clientData parameter; not used
         :return: None
         """
-        if _window.latest_light_selected is not None:
-            _window.update_intensity_label(pmc.getAttr('%s.intensity' % _window.latest_light_selected))
-            _window.receive_mayacolor(pmc.getAttr('%s.color' % _window.latest_light_selected))
-            _window.receive_mayashadow(pmc.getAttr('%s.shadowColor' % _window.latest_light_selected))
+        eventHandlers.time_changed(_window, maya_scene)
 
     def timelistener_trigger():
         """
@@ -210,157 +672,1498 @@ def show():
         :return: None
         """
         if _window.timeline_listener.isChecked():
-            try:
-                _window.idCallback.append(OpenMaya.MEventMessage.addEventCallback("timeChanged",
-                                                                                  time_changed))
+            if add_event_callback('timeChanged', time_changed, scene_scoped=True):
                 print 'Maya API timeChanged Callback added'
-            except:
-                print 'Could not initiate Maya API timeChanged Callback'
 
-        # Remove the Callback ID that is stored in the window's idCallback list
+        # Remove the Callback that is registered in the window under the event's name
         else:
-            try:
-                OpenMaya.MEventMessage.removeCallback(_window.idCallback[2])
+            if _window.callbacks.remove('timeChanged'):
                 print 'Stopped Maya API timeChanged Callback'
-
-            except RuntimeError:
+            else:
                 print "Couldn't find Maya API timeChanged Callback to stop"
 
-    def update_list_selection(_):
+    def light_added(node, _):
         """
-        Update the current highlighted items in the list with the current selection
+        A light has been created; remember it if the window is hidden.
+        :param node: MObject of the new light shape
         :param _: OpenMaya's callback clientData parameter; not used
         :return: None
         """
-        # Check if the click was made inside the window, or in Maya
-        inside_click = _window.isActiveWindow()
+        if not _window.isVisible():
+            hidden_changes['added'].append(OpenMaya.MObjectHandle(node))
 
-        # Shouldn't update selection when selection comes from the GUI, or else
-        # the callback and update_maya_selection() method mess with the normal
-        # selection of the widgetList
-        if not inside_click:
+    def light_removed(node, _):
+        """
+        A light is being deleted; remember it if the window is hidden.
+        :param node: MObject of the light shape
+        :param _: OpenMaya's callback clientData parameter; not used
+        :return: None
+        """
+        if not _window.isVisible():
+            try:
+                hidden_changes['removed'].add(mayautils.transform_name(node))
+            except RuntimeError:
+                pass
 
-            _window.update_list_selection(pmc.selected())
+    def name_changed(node, previous_name, _):
+        """
+        A node has been renamed; if it's a listed light, show its new name,
+        or remember the rename until a hidden window is reopened.
+        :param node: MObject of the renamed node
+        :param previous_name: Name of the node before the change
+        :param _: OpenMaya's callback clientData parameter; not used
+        :return: None
+        """
+        handle = OpenMaya.MObjectHandle(node)
+        record = _window.lights.find_handle(handle)
 
-            # Update the window's elements with the latest selected light properties
-            if _window.latest_light_selected is not None:
-                _window.update_intensity_label(pmc.getAttr('%s.intensity' % _window.latest_light_selected))
-                _window.receive_mayacolor(pmc.getAttr('%s.color' % _window.latest_light_selected))
-                _window.receive_mayashadow(pmc.getAttr('%s.shadowColor' % _window.latest_light_selected))
+        if record is None:
+            return
 
-            # Update intensity label to have N/A if no light is selected
-            else:
-                _window.update_intensity_label(None)
+        if _window.isVisible():
+            _window.rename_light(record.name, mayautils.transform_name(node))
+        else:
+            hidden_changes['renamed'][record.name] = handle
 
-    def update_maya_selection():
+    def reopen():
         """
-        Updates the current Maya selection with the window's widgetlist selection
+        Shows the hidden persistent window again, applying only the
+        lights that were renamed, deleted or created while it was hidden.
         :return: None
         """
-        _window.latest_light_selected = None
+        for previous_name, handle in hidden_changes['renamed'].items():
+            if handle.isValid():
+                _window.rename_light(previous_name, mayautils.transform_name(handle.object()))
+            else:
+                _window.remove_light(previous_name)
 
-        with mayautils.undo_chunk():
+        for name in hidden_changes['removed']:
+            _window.remove_light(name)
 
-            # For each light name in the window's list of names...
-            for item in _window.lightsArray:
+        for handle in hidden_changes['added']:
+            if handle.isValid():
+                node = handle.object()
+                name = mayautils.transform_name(node)
 
-                #If the light still exists...
-                if pmc.objExists(item):
+                if name not in _window.lights:
+                    _window.insert_light(name, OpenMaya.MFnDependencyNode(node).typeName(),
+                                         mayautils.node_handles([name])[0])
 
-                    listitem = _window.widgetlist.findItems(item, QtCore.Qt.MatchExactly)
+        clear_hidden_changes()
 
-                    # If the item is currently selected and the light exists,
-                    # add it to current selection
-                    if listitem[0].isSelected():
-                        # Update the window's last selected light
-                        _window.latest_light_selected = listitem[0].text()
-                        try:
-                            pmc.select(item, add=True)
-                        except:
-                            raise TypeError('Could not find light: ' + item)
+        update_window_render_layer()
+        _window.update_list_selection(cmds.ls(selection=True))
+        update_latest_light_fields()
 
-                    else:
-                        try:
-                            pmc.select(item, deselect=True)
-                        except:
-                            raise TypeError('Could not find light: ' + item)
+        _window.show()
+        _window.raise_()
 
-        if _window.latest_light_selected is not None:
-            _window.update_intensity_label(pmc.getAttr('%s.intensity' % _window.latest_light_selected))
-            _window.receive_mayacolor(pmc.getAttr('%s.color' % _window.latest_light_selected))
-            _window.receive_mayashadow(pmc.getAttr('%s.shadowColor' % _window.latest_light_selected))
+    def clear_hidden_changes():
+        """
+        Forget the scene changes recorded while the window was hidden.
+        :return: None
+        """
+        hidden_changes['added'] = []
+        hidden_changes['removed'] = set()
+        hidden_changes['renamed'] = {}
 
-        # Update intensity label to have N/A if no light is selected
-        else:
-            _window.update_intensity_label(None)
+    def open_bulk_create():
+        """
+        Show the bulk creation dialog, with the latest selected light as template.
+        :return: None
+        """
+        template = _window.latest_light_selected
+        bulk_create_dialog.set_template(template.name if template is not None else None)
+        bulk_create_dialog.show()
+        bulk_create_dialog.raise_()
 
-    def update_window_render_layer():
+    def bulk_create(translations, rotations=None):
         """
-        Updates the window's current Render Layer attribute and
-        the Render Layer buttons availability.
+        Create copies of the template light in a single undo step, and add them
+        to the list by their handles, without refilling it.
+        :param translations: Array of (x, y, z) positions, one per new light
+        :param rotations: Optional array of (x, y, z) rotations, one per new light
         :return: None
         """
-        # Get the Render Layer's name and assign it to
-        # the window's current_render_layer
-        _window.current_render_layer = pmc.editRenderLayerGlobals(query=True,
-                                                                  currentRenderLayer=True)
+        import MayaSceneLights_bulkCreate as bulkCreate
 
-        # Update the Render Layer buttons, to lock them in case this is the defaultRenderLayer
-        _window.render_change_trigger()
+        template = _window.latest_light_selected
 
-    # Create an OpenMaya API callback for selection changes in the scene
-    try:
-        _window.idCallback.append(OpenMaya.MEventMessage.addEventCallback("SelectionChanged",
-                                                                          update_list_selection))
+        if template is None or not light_exists(template):
+            cmds.warning('Please select a template light in the Light Interface window\'s list')
+            return
 
-    except RuntimeError:
-        print 'Could not initiate SelectionChanged Maya API Callback'
+        light_type = bulk_create_dialog.light_type() or template.type
 
-    # Create an OpenMaya API callback for render layer selection in the scene
-    try:
-        _window.idCallback.append(OpenMaya.MEventMessage.addEventCallback("renderLayerManagerChange",
-                                                                          render_layer_changed))
+        try:
+            names = bulkCreate.create_lights(template.name, translations, rotations, light_type)
+        except RuntimeError as error:
+            cmds.warning(str(error))
+            return
 
-    except RuntimeError:
-        print 'Could not initiate renderLayerManagerChange Maya API Callback'
+        _window.insert_lights(zip(names, [light_type] * len(names), mayautils.node_handles(names)))
+        bulk_create_dialog.set_status(len(names))
 
-    # Connect the window's widgets to different signals
-    _window.connect(_window.widgetlist,
-                    QtCore.SIGNAL('itemSelectionChanged()'),
-                    update_maya_selection)
+    def bulk_create_at_selection():
+        """
+        Create a copy of the template light at the world position and rotation of every selected object.
+        :return: None
+        """
+        objects = cmds.ls(selection=True, transforms=True)
 
-    _window.connect(_window.renderlayer_button,
-                    QtCore.SIGNAL('clicked()'),
-                    render_layer_only)
+        if not objects:
+            cmds.warning('Please select the objects to place the lights at')
+            return
 
-    _window.connect(_window.updatebutton,
-                    QtCore.SIGNAL('clicked()'),
-                    fill_itemlist)
+        bulk_create([cmds.xform(node, query=True, worldSpace=True, translation=True) for node in objects],
+                    [cmds.xform(node, query=True, worldSpace=True, rotation=True) for node in objects])
 
-    _window.connect(_window.timeline_listener,
-                    QtCore.SIGNAL('clicked()'),
-                    timelistener_trigger)
+    def open_exposure_balance():
+        """
+        Show the exposure balance dialog for the window's selected lights.
+        :return: None
+        """
+        lights = get_selected_widgetitems()
 
-    _window.connect(_window.applyintensity_button,
-                    QtCore.SIGNAL('clicked()'),
-                    apply_intensity)
+        if not lights:
+            cmds.warning('Please select one or more lights in the Light Interface window\'s list')
+            return
 
-    _window.connect(_window.applycolor_button,
-                    QtCore.SIGNAL('clicked()'),
-                    apply_color_change)
+        exposure_state['lights'] = lights
+        exposure_state['intensities'] = None
+        exposure_dialog.set_lights(lights)
 
-    _window.connect(_window.applyshadow_button,
-                    QtCore.SIGNAL('clicked()'),
-                    apply_shadow_change)
+        # Default to the latest selected light as reference
+        if _window.latest_light_selected is not None and _window.latest_light_selected.name in lights:
+            exposure_dialog.reference_combo.setCurrentIndex(lights.index(_window.latest_light_selected.name))
 
-    _window.connect(_window.renderlayer_add,
-                    QtCore.SIGNAL('clicked()'),
-                    add_to_render_layer)
+        exposure_dialog.show()
+        exposure_dialog.raise_()
+
+    def preview_exposure_balance():
+        """
+        Compute the balanced intensities and show them, without changing the scene.
+        :return: None
+        """
+        import MayaSceneLights_exposure as exposure
+
+        lights = [light for light in exposure_state['lights'] if cmds.objExists(light)]
+        exposure_state['lights'] = lights
+
+        try:
+            current = exposure.read_intensities(lights)
+            balanced = exposure.balance(current,
+                                        exposure_dialog.mode_combo.currentIndex(),
+                                        exposure_dialog.target_spinbox.value(),
+                                        max(exposure_dialog.reference_combo.currentIndex(), 0))
+        except (RuntimeError, ValueError) as error:
+            cmds.warning(str(error))
+            return
+
+        exposure_state['intensities'] = balanced
+        exposure_dialog.populate(exposure.preview(lights, current, balanced))
+
+    def commit_exposure_balance():
+        """
+        Set the previewed intensities, as a single undo chunk.
+        :return: None
+        """
+        if exposure_state['intensities'] is None:
+            return
+
+        with mayautils.undo_chunk():
+            applyChanges.set_intensities(exposure_state['lights'],
+                                         [float(value) for value in exposure_state['intensities']],
+                                         _window.keyframeintensity_checkbox.isChecked())
+
+        refresh_light_values(exposure_state['lights'])
+
+        # Show the committed values as the new current ones
+        preview_exposure_balance()
+        update_latest_light_fields()
+
+    def refresh_distribution():
+        """
+        Read the intensity and color of the listed or selected lights, and
+        compute the distribution charts from them in one NumPy pass.
+        :return: None
+        """
+        import MayaSceneLights_distribution as distribution
+
+        if distribution_dialog.scope_combo.currentIndex() == 1:
+            records = _window.selected_records()
+        else:
+            records = list(_window.lights)
+
+        cache_light_values(records, refresh=True)
+        stops = distribution_dialog.stops_checkbox.isChecked()
+
+        try:
+            names, intensities, colors = distribution.light_arrays(records)
+            values = distribution.intensity_values(intensities, stops)
+            counts, edges = distribution.histogram(values)
+            hue, value = distribution.hue_value(colors)
+
+        except RuntimeError as error:
+            cmds.warning(str(error))
+            return
+
+        distribution_state['names'] = names
+        distribution_state['intensity'] = values
+        distribution_state['hue'] = hue
+        distribution_state['value'] = value
+
+        distribution_dialog.histogram.set_data(counts, edges, 'Intensity (EV)' if stops else 'Intensity')
+        distribution_dialog.scatter.set_data(zip(hue.tolist(), value.tolist()), colors.tolist())
+
+        if names:
+            distribution_dialog.set_summary('%d light(s). Intensity min %.4g, median %.4g, max %.4g' % (
+                (len(names),) + distribution.summary(intensities)))
+        else:
+            distribution_dialog.set_summary('No lights to show')
+
+    def open_distribution():
+        """
+        Show the distribution dialog with up to date charts.
+        :return: None
+        """
+        distribution_dialog.show()
+        distribution_dialog.raise_()
+        refresh_distribution()
+
+    def distribution_histogram_brushed(low, high, *_):
+        """
+        Select the lights whose intensity is inside the range dragged over the histogram.
+        :param low: Lowest intensity of the range
+        :param high: Highest intensity of the range
+        :param _: Vertical range of the drag; not used
+        :return: None
+        """
+        import MayaSceneLights_distribution as distribution
+
+        if distribution_state['intensity'] is not None:
+            select_lights([distribution_state['names'][index] for index
+                           in distribution.in_range(distribution_state['intensity'], low, high)])
+
+    def distribution_scatter_brushed(hue_low, hue_high, value_low, value_high):
+        """
+        Select the lights whose hue and value are inside the box dragged over the scatter.
+        :param hue_low: Lowest hue of the box
+        :param hue_high: Highest hue of the box
+        :param value_low: Lowest color value of the box
+        :param value_high: Highest color value of the box
+        :return: None
+        """
+        import MayaSceneLights_distribution as distribution
+
+        if distribution_state['hue'] is not None:
+            select_lights([distribution_state['names'][index] for index
+                           in distribution.in_box(distribution_state['hue'], distribution_state['value'],
+                                                  (hue_low, hue_high), (value_low, value_high))])
+
+    def scene_rig_snapshot():
+        """
+        :return: RigSnapshot of every listed light, with an up to date Render Layer membership
+        """
+        import MayaSceneLights_rigDiff as rigDiff
+
+        # A separate membership cache, so pending edits of the layer matrix aren't discarded
+        rig_layers.refresh()
+        return rigDiff.RigSnapshot.from_scene(_window.lights.names(), rig_layers.members)
+
+    def save_rig_snapshot():
+        """
+        Save a snapshot of every listed light to a JSON file, to compare other scenes with it.
+        :return: None
+        """
+        path, _ = QtGui.QFileDialog.getSaveFileName(_window, 'Save Light Rig Snapshot', '',
+                                                    'Light rig snapshots (*.json)')
+        if not path:
+            return
+
+        try:
+            snapshot = scene_rig_snapshot()
+            snapshot.save(path)
+            print 'Saved a snapshot of %d light(s) to %s' % (len(snapshot), path)
+
+        except (IOError, RuntimeError) as error:
+            cmds.warning('Could not save light rig snapshot: %s' % error)
+
+    def show_rig_differences():
+        """
+        Compare the loaded snapshot with the scene and fill the differences dialog.
+        :return: None
+        """
+        import MayaSceneLights_rigDiff as rigDiff
+
+        snapshot = rig_snapshot['snapshot']
+        scene = scene_rig_snapshot()
+        differences = rigDiff.diff(snapshot, scene)
+
+        rows = [(name, 'added', '', '', '', False) for name in differences['added']]
+        rows += [(name, 'removed', '', '', '', False) for name in differences['removed']]
+
+        for name in sorted(differences['changed']):
+            for field in differences['changed'][name]:
+                rows.append((name, 'changed', field,
+                             str(snapshot.records[name][field]), str(scene.records[name][field]),
+                             field in rigDiff.APPLICABLE_FIELDS))
+
+        rig_diff_dialog.populate(rows, '%d added, %d removed, %d changed light(s)' % (
+            len(differences['added']), len(differences['removed']), len(differences['changed'])))
+
+    def compare_rig_snapshot():
+        """
+        Load a light rig snapshot and show how the scene differs from it.
+        :return: None
+        """
+        import MayaSceneLights_rigDiff as rigDiff
+
+        path, _ = QtGui.QFileDialog.getOpenFileName(_window, 'Compare with Light Rig Snapshot', '',
+                                                    'Light rig snapshots (*.json)')
+        if not path:
+            return
+
+        try:
+            rig_snapshot['snapshot'] = rigDiff.RigSnapshot.load(path)
+
+        except (IOError, ValueError, KeyError) as error:
+            cmds.warning('Could not load light rig snapshot: %s' % error)
+            return
+
+        show_rig_differences()
+        rig_diff_dialog.setWindowTitle('Light Rig Differences - %s' % path)
+        rig_diff_dialog.show()
+        rig_diff_dialog.raise_()
+
+    def apply_rig_differences():
+        """
+        Set the snapshot's values back on the checked rows, as a single undo chunk.
+        :return: None
+        """
+        import MayaSceneLights_rigDiff as rigDiff
+
+        if rig_snapshot['snapshot'] is None:
+            return
+
+        with mayautils.undo_chunk():
+            rigDiff.apply_differences(rig_snapshot['snapshot'], rig_diff_dialog.checked_changes(),
+                                      rig_layers)
+
+        show_rig_differences()
+        update_latest_light_fields()
+
+    def run_light_checks():
+        """
+        Run the light rig checks on every listed light, over their freshly cached values,
+        and fill the checks dialog.
+        :return: None
+        """
+        import MayaSceneLights_lint as lint
+
+        records = list(_window.lights)
+        cache_light_values(records, True)
+
+        # A separate membership cache, so pending edits of the layer matrix aren't discarded
+        layers = renderLayers.RenderLayerMembership()
+        layers.refresh()
+        layer_members = set()
+        for members in layers.members.values():
+            layer_members.update(members)
+
+        issues = lint.lint([record.name for record in records],
+                           [record.intensity for record in records],
+                           [record.color for record in records],
+                           [int(record.name in layer_members) for record in records],
+                           lint.flat_key_attributes([record.handle for record in records]),
+                           bool(layers.layers))
+        lint_state['issues'] = issues
+
+        rows = []
+        for check, label in lint.CHECKS:
+            for name, detail in issues[check]:
+                rows.append((name, check, label, lint.describe(check, detail), check in lint.FIXABLE_CHECKS))
+
+        lint_dialog.populate(rows, '%d issue(s) in %d light(s)' % (lint.count(issues), len(records)))
+
+    def open_light_checks():
+        """
+        Run the light rig checks and show their dialog.
+        :return: None
+        """
+        run_light_checks()
+        lint_dialog.show()
+        lint_dialog.raise_()
+
+    def fix_light_checks():
+        """
+        Fix the issues of the checked rows, one batch per check, as a single undo chunk.
+        Lights in no Render Layer are added to the current one, unless it's the default.
+        :return: None
+        """
+        import MayaSceneLights_lint as lint
+
+        if lint_state['issues'] is None:
+            return
+
+        checked = lint_dialog.checked_issues()
+        issues = dict((check, [(name, detail) for name, detail in lint_state['issues'][check]
+                               if (check, name) in checked])
+                      for check in lint.FIXABLE_CHECKS)
+
+        layer = _window.current_render_layer
+        if layer is None or layer.endswith('defaultRenderLayer'):
+            layer = None
+            if issues['layers']:
+                cmds.warning('Switch to a non-default Render Layer to add the lights in no Render Layer to it')
+
+        with mayautils.undo_chunk():
+            lint.fix(issues, layer, layer_index)
+
+        run_light_checks()
+        update_latest_light_fields()
+
+    def select_lint_lights():
+        """
+        Select the lights of the rows selected in the checks dialog.
+        :return: None
+        """
+        select_lights([name for name in lint_dialog.selected_lights() if cmds.objExists(name)])
+
+    def get_light_groups():
+        """
+        :return: LightGroups index of the scene's light groups, created on first use
+        """
+        import MayaSceneLights_lightGroups as lightGroups
+
+        if light_groups['index'] is None:
+            light_groups['index'] = lightGroups.LightGroups()
+
+        return light_groups['index']
+
+    def refresh_light_groups(rescan=False):
+        """
+        Refill the light groups dialog from the group index.
+        :param rescan: True to rebuild the index from the scene first
+        :return: None
+        """
+        groups = get_light_groups()
+
+        if rescan:
+            groups.refresh()
+
+        groups_dialog.populate([(name, len(groups.members(name)))
+                                for name in groups.names()])
+
+    def open_light_groups():
+        """
+        Rebuild the group index and show the light groups dialog.
+        :return: None
+        """
+        refresh_light_groups(True)
+        groups_dialog.show()
+        groups_dialog.raise_()
+
+    def current_light_group():
+        """
+        :return: Name of the group selected in the dialog, or None after a warning
+        """
+        group = groups_dialog.current_group()
+
+        if group is None or group not in light_groups:
+            cmds.warning('Please select a light group')
+            return None
+
+        return group
+
+    def create_light_group():
+        """
+        Create a group with the window's selected lights, named after the dialog's textbox.
+        :return: None
+        """
+        name = groups_dialog.name_textbox.text().strip() or 'lightGroup1'
+
+        with mayautils.undo_chunk():
+            get_light_groups().create(name, get_selected_widgetitems())
+
+        refresh_light_groups()
+
+    def add_to_light_group():
+        """
+        Add the window's selected lights to the selected group.
+        :return: None
+        """
+        group = current_light_group()
+
+        if group is not None:
+            with mayautils.undo_chunk():
+                get_light_groups().add(group, get_selected_widgetitems())
+            refresh_light_groups()
+
+    def remove_from_light_group():
+        """
+        Remove the window's selected lights from the selected group.
+        :return: None
+        """
+        group = current_light_group()
+
+        if group is not None:
+            with mayautils.undo_chunk():
+                get_light_groups().remove(group, get_selected_widgetitems())
+            refresh_light_groups()
+
+    def delete_light_group():
+        """
+        Delete the selected group; its lights are kept.
+        :return: None
+        """
+        group = current_light_group()
+
+        if group is not None:
+            with mayautils.undo_chunk():
+                get_light_groups().delete(group)
+            refresh_light_groups()
+
+    def light_group_select():
+        """
+        Select the lights of the selected group.
+        :return: None
+        """
+        group = current_light_group()
+
+        if group is not None:
+            select_lights(get_light_groups().members(group))
+
+    def light_group_intensity():
+        """
+        Apply the window's intensity quantity and operator on the selected group.
+        :return: None
+        """
+        group = current_light_group()
+
+        if group is None:
+            return
+
+        try:
+            get_light_groups().change_intensity(group,
+                                                float(_window.intensityquantity_textbox.text()),
+                                                _window.intensityoperator_combo.currentIndex(),
+                                                _window.keyframeintensity_checkbox.isChecked())
+        except ValueError:
+            cmds.warning('Insert a numerical value in Intensity textbox')
+
+        refresh_light_values(get_light_groups().members(group))
+        update_latest_light_fields()
+
+    def light_group_color(color_or_shadow):
+        """
+        Apply the window's light color or shadow color on the selected group.
+        :param color_or_shadow: 1 = color, 2 = shadow
+        :return: None
+        """
+        group = current_light_group()
+
+        if group is None:
+            return
+
+        if color_or_shadow == 1:
+            rgb_array = _window.giveme_light_color()
+            keyframe = _window.keyframecolor_checkbox.isChecked()
+        else:
+            rgb_array = _window.giveme_shadow_color()
+            keyframe = _window.keyframeshadow_checkbox.isChecked()
+
+        try:
+            get_light_groups().change_color(group, [value/255.00 for value in rgb_array],
+                                            keyframe, color_or_shadow)
+        except RuntimeError:
+            cmds.warning('Not able to set color. Please check Script Editor')
+
+        refresh_light_values(get_light_groups().members(group))
+        update_latest_light_fields()
+
+    def light_group_keyframe():
+        """
+        Key the intensity, color and shadow color of the selected group at the current frame.
+        :return: None
+        """
+        group = current_light_group()
+
+        if group is not None:
+            get_light_groups().set_keyframes(group)
+
+    def open_spatial_select():
+        """
+        Show the Spatial Selection dialog with the scene's perspective cameras.
+        :return: None
+        """
+        cameras = [cmds.listRelatives(camera, parent=True, path=True)[0]
+                   for camera in cmds.ls(type='camera')
+                   if not cmds.getAttr('%s.orthographic' % camera)]
+
+        spatial_select.set_cameras(cameras)
+        spatial_select.show()
+
+    def selection_bounds():
+        """
+        Retrieves the world-space bounding box of the current Maya selection.
+        :return: Tuple of (min corner, max corner), or None if nothing is selected
+        """
+        selection = cmds.ls(selection=True)
+
+        if not selection:
+            cmds.warning('Please select the objects to look for lights around')
+            return None
+
+        bounds = cmds.exactWorldBoundingBox(selection)
+        return tuple(bounds[:3]), tuple(bounds[3:])
+
+    def get_spatial_index():
+        """
+        :return: SpatialIndex of the listed lights' positions, created on first use
+        """
+        import MayaSceneLights_spatialIndex as spatialIndex
+
+        if spatial_state['index'] is None:
+            spatial_state['index'] = spatialIndex.SpatialIndex()
+
+        return spatial_state['index']
+
+    def reset_spatial_index():
+        """
+        Forget the indexed lights, e.g. when another scene is opened.
+        :return: None
+        """
+        if spatial_state['index'] is not None:
+            spatial_state['index'].build({})
+
+    def spatial_query(query, *args):
+        """
+        Brings the spatial index up to date and runs a query on it, selecting the resulting lights.
+        :param query: Name of the SpatialIndex query method
+        :param args: Arguments of the query
+        :return: None
+        """
+        spatial_index = get_spatial_index()
+
+        # Every listed light's position is read again in one pass, without a callback per
+        # light; only the ones that moved, were renamed, added or removed touch the tree
+        positions = mayautils.world_positions(_window.lights.names())
+
+        if len(spatial_index):
+            spatial_index.sync(positions)
+        else:
+            spatial_index.build(positions)
+
+        names = getattr(spatial_index, query)(*args)
+        select_lights(names)
+        spatial_select.set_status(len(names))
+
+    def select_near_selection():
+        """
+        Select the lights within the dialog's radius of the current selection's center.
+        :return: None
+        """
+        bounds = selection_bounds()
+
+        if bounds is not None:
+            center = tuple((low + high) / 2.0 for low, high in zip(*bounds))
+            spatial_query('radius', center, spatial_select.radius_spinbox.value())
+
+    def select_in_selection_bounds():
+        """
+        Select the lights inside the current selection's bounding box, padded by the dialog's radius.
+        :return: None
+        """
+        bounds = selection_bounds()
+
+        if bounds is not None:
+            padding = spatial_select.radius_spinbox.value()
+            spatial_query('box',
+                          tuple(value - padding for value in bounds[0]),
+                          tuple(value + padding for value in bounds[1]))
+
+    def select_in_camera():
+        """
+        Select the lights inside the view frustum of the dialog's camera.
+        :return: None
+        """
+        import MayaSceneLights_spatialIndex as spatialIndex
+
+        camera = spatial_select.camera_combo.currentText()
+
+        if not camera:
+            cmds.warning('There is no perspective camera to select lights from')
+            return
+
+        spatial_query('frustum', spatialIndex.frustum_planes(*mayautils.camera_frustum(camera)))
+
+    def pick_sample_points():
+        """
+        Use the vertices of the selected meshes and the positions of the other
+        selected objects as the sample points of the contribution analysis.
+        :return: None
+        """
+        import MayaSceneLights_contribution as contribution
+
+        try:
+            sample_points['points'] = contribution.gather_sample_points(cmds.ls(selection=True, long=True))
+            contribution_dialog.set_point_count(len(sample_points['points']))
+
+        except RuntimeError as error:
+            cmds.warning(str(error))
+
+    def rank_light_contribution():
+        """
+        Estimate the contribution of every listed light over the sample points
+        and show the ranking in the contribution dialog.
+        :return: None
+        """
+        import MayaSceneLights_contribution as contribution
+
+        if sample_points['points'] is None or not len(sample_points['points']):
+            cmds.warning('Please pick the sample points first')
+            return
+
+        try:
+            names, lights = contribution.gather_lights(_window.lights.names())
+            ranking = contribution.rank(names, contribution.estimate_contribution(lights,
+                                                                                  sample_points['points']))
+        except RuntimeError as error:
+            cmds.warning(str(error))
+            return
+
+        contribution_dialog.populate([(name, _window.lights.get(name).type, value, share)
+                                      for name, value, share in ranking])
+
+    def contribution_select():
+        """
+        Select the lights of the contribution dialog's selected rows.
+        :return: None
+        """
+        select_lights(contribution_dialog.selected_names())
+
+    def contribution_intensity():
+        """
+        Apply the window's intensity quantity and operator on the lights of
+        the contribution dialog's selected rows.
+        :return: None
+        """
+        try:
+            with mayautils.undo_chunk():
+                applyChanges.change_intensity(float(_window.intensityquantity_textbox.text()),
+                                              _window.intensityoperator_combo.currentIndex(),
+                                              contribution_dialog.selected_names(),
+                                              _window.keyframeintensity_checkbox.isChecked())
+        except ValueError:
+            cmds.warning('Insert a numerical value in Intensity textbox')
+
+        refresh_light_values(contribution_dialog.selected_names())
+        update_latest_light_fields()
+
+    def contribution_disable():
+        """
+        Hide the lights of the contribution dialog's selected rows.
+        :return: None
+        """
+        with mayautils.undo_chunk():
+            applyChanges.change_visibility(contribution_dialog.selected_names(), False)
+
+    def export_sampled_attributes():
+        """
+        Sample the intensity, color and shadow color of the selected lights, or of every
+        listed light if none is selected, over the playback range, into a CSV or .npy file.
+        :return: None
+        """
+        import MayaSceneLights_sampleExport as sampleExport
+
+        lights = get_selected_widgetitems() or _window.lights.names()
+
+        path, file_filter = QtGui.QFileDialog.getSaveFileName(_window, 'Export Sampled Attributes', '',
+                                                              'CSV files (*.csv);;NumPy arrays (*.npy)')
+        if not path:
+            return
+
+        if '*.npy' in file_filter and not path.lower().endswith('.npy'):
+            path += '.npy'
+
+        start = cmds.playbackOptions(query=True, minTime=True)
+        end = cmds.playbackOptions(query=True, maxTime=True)
+
+        try:
+            rows = sampleExport.export_samples(lights, start, end, path)
+            print 'Exported %d frame(s) of %d light(s) to %s' % (rows, len(lights), path)
+
+        except (IOError, RuntimeError) as error:
+            cmds.warning('Could not export sampled attributes: %s' % error)
+
+    def optimize_light_curves():
+        """
+        Ask for a tolerance and remove the redundant intensity, color and
+        shadow color keys of the selected lights, as a single undo chunk.
+        :return: None
+        """
+        import MayaSceneLights_curveOptimizer as curveOptimizer
+
+        lights = get_selected_widgetitems()
+
+        if not lights:
+            cmds.warning('Please select one or more lights in the Light Interface window\'s list')
+            return
+
+        tolerance, accepted = QtGui.QInputDialog.getDouble(_window, 'Optimize Light Curves',
+                                                           'Tolerance:', 0.001, 0.0, 1000.0, 4)
+        if not accepted:
+            return
+
+        with mayautils.undo_chunk():
+            report = curveOptimizer.optimize_lights(lights, tolerance)
+
+        message = 'Removed %d key(s) from %d curve(s). Maximum error introduced: %.6g' % (
+            report['removed'], report['curves'], report['max_error'])
+
+        print message
+        QtGui.QMessageBox.information(_window, 'Optimize Light Curves', message)
+
+    def get_solo_mute():
+        """
+        :return: SoloMute holding the original states of the switched lights, created on first use
+        """
+        import MayaSceneLights_soloMute as soloMute
+
+        if solo_mute['states'] is None:
+            solo_mute['states'] = soloMute.SoloMute()
+
+        return solo_mute['states']
+
+    def solo_mute_mode():
+        """
+        :return: soloMute mode chosen in the widgetlist's right click menu
+        """
+        return 'emit' if _window.emitmode_action.isChecked() else 'visibility'
+
+    def solo_lights():
+        """
+        Keep only the selected lights on, switching every other listed light off.
+        :return: None
+        """
+        lights = get_selected_widgetitems()
+
+        if not lights:
+            cmds.warning('Please select one or more lights in the Light Interface window\'s list')
+            return
+
+        get_solo_mute().solo(lights, [record.name for record in _window.lights if light_exists(record)],
+                             solo_mute_mode())
+
+    def mute_lights(state):
+        """
+        Switch the selected lights off, or back on.
+        :param state: False to mute, True to unmute
+        :return: None
+        """
+        lights = get_selected_widgetitems()
+
+        if not lights:
+            cmds.warning('Please select one or more lights in the Light Interface window\'s list')
+            return
+
+        get_solo_mute().mute(lights, solo_mute_mode(), state)
+
+    def restore_solo_mute():
+        """
+        Bring every soloed or muted light back to the state it had before.
+        :return: None
+        """
+        print 'Restored %d solo/mute plug(s)' % get_solo_mute().restore()
+
+    def print_active_callbacks():
+        """
+        Print the Maya API callbacks that are still registered by the window
+        :return: None
+        """
+        print _window.callbacks.report()
+
+    def toggle_command_server(state):
+        """
+        Start or stop the local command server, which keeps running when the window is closed.
+        :param state: True to start the server, False to stop it
+        :return: None
+        """
+        import MayaSceneLights_commandServer as commandServer
+
+        if not state:
+            commandServer.stop()
+            return
+
+        try:
+            commandServer.start()
+        except socket.error as error:
+            cmds.warning('Could not start the light command server: %s' % error)
+            _window.commandserver_action.setChecked(False)
+
+    def get_event_recorder():
+        """
+        :return: EventRecorder registering its callbacks with the window's, created on first use
+        """
+        import MayaSceneLights_eventRecorder as eventRecorder
+
+        if event_recording['recorder'] is None:
+            event_recording['recorder'] = eventRecorder.EventRecorder(_window.callbacks)
+
+        return event_recording['recorder']
+
+    def toggle_event_recording(state):
+        """
+        Start recording the events the window listens to, or stop and save the recording.
+        :param state: True to start recording, False to stop
+        :return: None
+        """
+        event_recorder = get_event_recorder()
+
+        if state:
+            event_recorder.start()
+            print 'Recording callback events'
+            return
+
+        event_recorder.stop()
+
+        path, _ = QtGui.QFileDialog.getSaveFileName(_window, 'Save Callback Event Recording', '',
+                                                    'Event recordings (*.json)')
+        if not path:
+            return
+
+        try:
+            event_recorder.save(path)
+            print 'Saved %d event(s) to %s' % (len(event_recorder), path)
+
+        except IOError as error:
+            cmds.warning('Could not save the event recording: %s' % error)
+
+    def scene_changing(_):
+        """
+        Another scene is about to be opened; remove the callbacks that only
+        make sense for the current one and forget its latest selected light.
+        :param _: OpenMaya's callback clientData parameter; not used
+        :return: None
+        """
+        # The recording belongs to the scene being closed; save it where it can be found
+        event_recorder = event_recording['recorder']
+
+        if event_recorder is not None and event_recorder.is_recording():
+            path = cmds.internalVar(userTmpDir=True) + 'lightInterfaceEvents.json'
+            event_recorder.save(path)
+            print 'Scene closed; saved %d recorded event(s) to %s' % (len(event_recorder), path)
+
+            _window.recordevents_action.blockSignals(True)
+            _window.recordevents_action.setChecked(False)
+            _window.recordevents_action.blockSignals(False)
+
+        _window.callbacks.remove_scene_scoped()
+        _window.timeline_listener.setChecked(False)
+        reset_spatial_index()
+        _window.latest_light_selected = None
+        reference_state['opening'] = True
+
+        # The saved solo/mute states belong to the scene being closed
+        if solo_mute['states'] is not None:
+            solo_mute['states'].clear()
+
+    def scene_opened(_):
+        """
+        A new scene has been opened; refill the window with its lights.
+        :param _: OpenMaya's callback clientData parameter; not used
+        :return: None
+        """
+        reference_state['opening'] = False
+
+        clear_hidden_changes()
+        update_window_render_layer()
+        fill_itemlist()
+
+        if groups_dialog.isVisible():
+            refresh_light_groups(True)
+
+    def reference_loaded(_):
+        """
+        A reference has been loaded or created; list the lights of the newly loaded
+        references only, without rescanning the scene.
+        :param _: OpenMaya's callback clientData parameter; not used
+        :return: None
+        """
+        loaded = discovery.loaded_references()
+        new_references = loaded - reference_state['loaded']
+        reference_state['loaded'] = loaded
+
+        # Opened scenes are listed once they're open, and hidden windows follow new lights by themselves
+        if reference_state['opening'] or not _window.isVisible():
+            return
+
+        lights = [(name, light_type, handle)
+                  for reference in sorted(new_references)
+                  for handle, name, light_type in discovery.reference_lights(reference)
+                  if name not in _window.lights]
+
+        if lights:
+            _window.insert_lights(lights)
+            layer_sort_state['stale'] = True
+
+    def reference_unloaded(_):
+        """
+        A reference has been unloaded or removed; drop the lights that went with it,
+        found by their handles, without rescanning the scene.
+        :param _: OpenMaya's callback clientData parameter; not used
+        :return: None
+        """
+        reference_state['loaded'] = discovery.loaded_references()
+
+        if reference_state['opening'] or not _window.isVisible():
+            return
+
+        _window.remove_lights([record.name for record in _window.lights if not light_exists(record)])
+
+    def namespace_records():
+        """
+        :return: List of the LightRecords of the namespaces selected in the namespace list, in widgetlist order
+        """
+        records = []
+        for namespace in _window.selected_namespaces():
+            records.extend(_window.lights.by_namespace.get(namespace, ()))
+
+        return sorted(records, key=lambda record: record.row)
+
+    def select_namespace_lights():
+        """
+        Select every light of the selected namespaces, so the window's changes apply to all of them.
+        :return: None
+        """
+        select_lights([record.name for record in namespace_records() if light_exists(record)])
+
+    def unload_namespace_references():
+        """
+        Unload the references the selected namespaces come from; reference_unloaded()
+        takes their lights out of the list.
+        :return: None
+        """
+        references = set()
+
+        # A namespace may hold nodes that aren't referenced, so its records are checked
+        # until one of them comes from a reference
+        for namespace in _window.selected_namespaces():
+            for record in _window.lights.by_namespace.get(namespace, ()):
+                reference = discovery.reference_node(record.name)
+                if reference is not None:
+                    references.add(reference)
+                    break
+
+        if not references:
+            cmds.warning('The selected namespaces don\'t come from loaded references')
+            return
+
+        for reference in sorted(references):
+            cmds.file(unloadReference=reference)
+
+    def update_list_selection(_):
+        """
+        Update the current highlighted items in the list with the current selection
+        :param _: OpenMaya's callback clientData parameter; not used
+        :return: None
+        """
+        eventHandlers.selection_changed(_window, maya_scene)
+
+    def update_maya_selection():
+        """
+        Updates the current Maya selection with the window's widgetlist selection
+        :return: None
+        """
+        _window.latest_light_selected = None
+
+        selected = []
+        deselected = []
+
+        # For each light record in the window, if the light still exists...
+        for record in _window.lights:
+            if light_exists(record):
+
+                # If the item is currently selected, add it to current selection
+                if _window.widgetlist.item(record.row).isSelected():
+                    # Update the window's last selected light
+                    _window.latest_light_selected = record
+                    selected.append(record.name)
+                else:
+                    deselected.append(record.name)
+
+        # Change the whole Maya selection at once
+        with mayautils.undo_chunk():
+            try:
+                if selected:
+                    cmds.select(selected, add=True)
+                if deselected:
+                    cmds.select(deselected, deselect=True)
+            except:
+                raise TypeError('Could not find lights: ' + ', '.join(selected + deselected))
+
+        # Update the window's elements with the latest selected light properties,
+        # or have N/A in the intensity label if no light is selected
+        update_latest_light_fields()
+
+    def update_window_render_layer():
+        """
+        Updates the window's current Render Layer attribute and
+        the Render Layer buttons availability.
+        :return: None
+        """
+        eventHandlers.update_window_render_layer(_window, maya_scene)
+
+    # Create an OpenMaya API callback for selection changes in the scene
+    add_event_callback('SelectionChanged', update_list_selection)
+
+    # Create an OpenMaya API callback for render layer selection in the scene
+    add_event_callback('renderLayerManagerChange', render_layer_changed)
+
+    # Create an OpenMaya API callback for Render Layers and their members being edited
+    add_event_callback('renderLayerChange', layer_members_changed)
+
+    # Create OpenMaya API callbacks for scenes being created or opened,
+    # and for references being loaded or unloaded
+    scene_messages = {
+        'beforeNewScene': (OpenMaya.MSceneMessage.kBeforeNew, scene_changing),
+        'beforeOpenScene': (OpenMaya.MSceneMessage.kBeforeOpen, scene_changing),
+        'afterNewScene': (OpenMaya.MSceneMessage.kAfterNew, scene_opened),
+        'afterOpenScene': (OpenMaya.MSceneMessage.kAfterOpen, scene_opened),
+        'afterLoadReference': (OpenMaya.MSceneMessage.kAfterLoadReference, reference_loaded),
+        'afterCreateReference': (OpenMaya.MSceneMessage.kAfterCreateReference, reference_loaded),
+        'afterUnloadReference': (OpenMaya.MSceneMessage.kAfterUnloadReference, reference_unloaded),
+        'afterRemoveReference': (OpenMaya.MSceneMessage.kAfterRemoveReference, reference_unloaded)
+    }
+
+    for name, (message, function) in scene_messages.items():
+        try:
+            _window.callbacks.add(name, OpenMaya.MSceneMessage.addCallback(message, function))
+
+        except RuntimeError:
+            print 'Could not initiate %s Maya API Callback' % name
+
+    # A persistent window keeps track of the lights created and deleted
+    # while it's hidden, so it can be reopened without a full refill
+    if persistent:
+        _window.persistent = True
+        _window.reopen = reopen
+
+        try:
+            _window.callbacks.add('lightAdded',
+                                  OpenMaya.MDGMessage.addNodeAddedCallback(light_added, 'light'))
+            _window.callbacks.add('lightRemoved',
+                                  OpenMaya.MDGMessage.addNodeRemovedCallback(light_removed, 'light'))
+        except RuntimeError:
+            print 'Could not initiate the persistent window Maya API Callbacks'
+
+    # Follow the renames of listed lights by their handles, instead of waiting for an Update
+    try:
+        _window.callbacks.add('nameChanged',
+                              OpenMaya.MNodeMessage.addNameChangedCallback(OpenMaya.MObject(), name_changed))
+    except RuntimeError:
+        print 'Could not initiate nameChanged Maya API Callback'
+
+    # Connect the window's widgets to different signals
+    _window.connect(_window.widgetlist,
+                    QtCore.SIGNAL('itemSelectionChanged()'),
+                    update_maya_selection)
+
+    _window.connect(_window.renderlayer_button,
+                    QtCore.SIGNAL('clicked()'),
+                    render_layer_only)
+
+    _window.connect(_window.selectnamespace_action,
+                    QtCore.SIGNAL('triggered()'),
+                    select_namespace_lights)
+
+    _window.connect(_window.unloadreference_action,
+                    QtCore.SIGNAL('triggered()'),
+                    unload_namespace_references)
+
+    _window.connect(_window.sort_combo,
+                    QtCore.SIGNAL('currentIndexChanged(int)'),
+                    lambda _: sort_light_list())
+
+    _window.connect(_window.thenby_combo,
+                    QtCore.SIGNAL('currentIndexChanged(int)'),
+                    lambda _: sort_light_list())
+
+    _window.connect(_window.sortdescending_checkbox,
+                    QtCore.SIGNAL('toggled(bool)'),
+                    lambda _: sort_light_list())
+
+    _window.connect(_window.updatebutton,
+                    QtCore.SIGNAL('clicked()'),
+                    fill_itemlist)
+
+    _window.connect(_window.timeline_listener,
+                    QtCore.SIGNAL('clicked()'),
+                    timelistener_trigger)
+
+    _window.connect(_window.applyintensity_button,
+                    QtCore.SIGNAL('clicked()'),
+                    apply_intensity)
+
+    _window.connect(_window.intensityscrub_slider,
+                    QtCore.SIGNAL('sliderPressed()'),
+                    begin_intensity_scrub)
+
+    _window.connect(_window.intensityscrub_slider,
+                    QtCore.SIGNAL('sliderReleased()'),
+                    end_intensity_scrub)
+
+    _window.connect(_window.intensityscrub_slider,
+                    QtCore.SIGNAL('valueChanged(int)'),
+                    intensity_scrub_moved)
+
+    _window.connect(scrub_timer,
+                    QtCore.SIGNAL('timeout()'),
+                    preview_intensity_scrub)
+
+    for frame, color_or_shadow in ((_window.color_frame, 1), (_window.colorshadow_frame, 2)):
+        _window.connect(frame,
+                        QtCore.SIGNAL('colorPreviewStarted()'),
+                        lambda kind=color_or_shadow: begin_live_color(kind))
+
+        _window.connect(frame,
+                        QtCore.SIGNAL('colorPreviewed(QColor)'),
+                        queue_live_color)
+
+        _window.connect(frame,
+                        QtCore.SIGNAL('colorPreviewFinished(bool)'),
+                        end_live_color)
+
+    _window.connect(color_timer,
+                    QtCore.SIGNAL('timeout()'),
+                    write_live_color)
+
+    _window.connect(_window.applycolor_button,
+                    QtCore.SIGNAL('clicked()'),
+                    apply_color_change)
+
+    _window.connect(_window.applyshadow_button,
+                    QtCore.SIGNAL('clicked()'),
+                    apply_shadow_change)
+
+    _window.connect(_window.renderlayer_add,
+                    QtCore.SIGNAL('clicked()'),
+                    add_to_render_layer)
 
     _window.connect(_window.renderlayer_remove,
                     QtCore.SIGNAL('clicked()'),
                     remove_from_render_layer)
 
+    _window.connect(_window.solo_action,
+                    QtCore.SIGNAL('triggered()'),
+                    solo_lights)
+
+    _window.connect(_window.mute_action,
+                    QtCore.SIGNAL('triggered()'),
+                    lambda: mute_lights(False))
+
+    _window.connect(_window.unmute_action,
+                    QtCore.SIGNAL('triggered()'),
+                    lambda: mute_lights(True))
+
+    _window.connect(_window.restorestates_action,
+                    QtCore.SIGNAL('triggered()'),
+                    restore_solo_mute)
+
+    _window.connect(_window.callbacks_action,
+                    QtCore.SIGNAL('triggered()'),
+                    print_active_callbacks)
+
+    # The command server can only be running if a script or an earlier window imported its
+    # module, under the same package as this one
+    command_server = sys.modules.get(__name__.replace('MayaSceneLights_mayaWindow',
+                                                      'MayaSceneLights_commandServer'))
+    _window.commandserver_action.setChecked(command_server is not None and command_server.is_running())
+    _window.connect(_window.commandserver_action,
+                    QtCore.SIGNAL('toggled(bool)'),
+                    toggle_command_server)
+
+    _window.connect(_window.recordevents_action,
+                    QtCore.SIGNAL('toggled(bool)'),
+                    toggle_event_recording)
+
+    _window.connect(_window.bulkcreate_action,
+                    QtCore.SIGNAL('triggered()'),
+                    open_bulk_create)
+
+    _window.connect(bulk_create_dialog.grid_button,
+                    QtCore.SIGNAL('clicked()'),
+                    lambda: bulk_create(bulk_create_dialog.grid_translations()))
+
+    _window.connect(bulk_create_dialog.selection_button,
+                    QtCore.SIGNAL('clicked()'),
+                    bulk_create_at_selection)
+
+    _window.connect(_window.exposure_action,
+                    QtCore.SIGNAL('triggered()'),
+                    open_exposure_balance)
+
+    _window.connect(exposure_dialog.preview_button,
+                    QtCore.SIGNAL('clicked()'),
+                    preview_exposure_balance)
+
+    _window.connect(exposure_dialog.commit_button,
+                    QtCore.SIGNAL('clicked()'),
+                    commit_exposure_balance)
+
+    _window.connect(_window.lightgroups_action,
+                    QtCore.SIGNAL('triggered()'),
+                    open_light_groups)
+
+    _window.connect(groups_dialog.create_button,
+                    QtCore.SIGNAL('clicked()'),
+                    create_light_group)
+
+    _window.connect(groups_dialog.add_button,
+                    QtCore.SIGNAL('clicked()'),
+                    add_to_light_group)
+
+    _window.connect(groups_dialog.remove_button,
+                    QtCore.SIGNAL('clicked()'),
+                    remove_from_light_group)
+
+    _window.connect(groups_dialog.delete_button,
+                    QtCore.SIGNAL('clicked()'),
+                    delete_light_group)
+
+    _window.connect(groups_dialog.select_button,
+                    QtCore.SIGNAL('clicked()'),
+                    light_group_select)
+
+    _window.connect(groups_dialog.intensity_button,
+                    QtCore.SIGNAL('clicked()'),
+                    light_group_intensity)
+
+    _window.connect(groups_dialog.color_button,
+                    QtCore.SIGNAL('clicked()'),
+                    lambda: light_group_color(1))
+
+    _window.connect(groups_dialog.shadow_button,
+                    QtCore.SIGNAL('clicked()'),
+                    lambda: light_group_color(2))
+
+    _window.connect(groups_dialog.keyframe_button,
+                    QtCore.SIGNAL('clicked()'),
+                    light_group_keyframe)
+
+    _window.connect(_window.spatialselect_action,
+                    QtCore.SIGNAL('triggered()'),
+                    open_spatial_select)
+
+    _window.connect(spatial_select.near_button,
+                    QtCore.SIGNAL('clicked()'),
+                    select_near_selection)
+
+    _window.connect(spatial_select.bounds_button,
+                    QtCore.SIGNAL('clicked()'),
+                    select_in_selection_bounds)
+
+    _window.connect(spatial_select.camera_button,
+                    QtCore.SIGNAL('clicked()'),
+                    select_in_camera)
+
+    _window.connect(_window.contribution_action,
+                    QtCore.SIGNAL('triggered()'),
+                    contribution_dialog.show)
+
+    _window.connect(contribution_dialog.points_button,
+                    QtCore.SIGNAL('clicked()'),
+                    pick_sample_points)
+
+    _window.connect(contribution_dialog.analyze_button,
+                    QtCore.SIGNAL('clicked()'),
+                    rank_light_contribution)
+
+    _window.connect(contribution_dialog.select_button,
+                    QtCore.SIGNAL('clicked()'),
+                    contribution_select)
+
+    _window.connect(contribution_dialog.intensity_button,
+                    QtCore.SIGNAL('clicked()'),
+                    contribution_intensity)
+
+    _window.connect(contribution_dialog.disable_button,
+                    QtCore.SIGNAL('clicked()'),
+                    contribution_disable)
+
+    _window.connect(_window.exportsamples_action,
+                    QtCore.SIGNAL('triggered()'),
+                    export_sampled_attributes)
+
+    _window.connect(_window.distribution_action,
+                    QtCore.SIGNAL('triggered()'),
+                    open_distribution)
+
+    _window.connect(distribution_dialog.refresh_button,
+                    QtCore.SIGNAL('clicked()'),
+                    refresh_distribution)
+
+    _window.connect(distribution_dialog.stops_checkbox,
+                    QtCore.SIGNAL('toggled(bool)'),
+                    lambda _: refresh_distribution())
+
+    _window.connect(distribution_dialog.histogram,
+                    QtCore.SIGNAL('brushed(double,double,double,double)'),
+                    distribution_histogram_brushed)
+
+    _window.connect(distribution_dialog.scatter,
+                    QtCore.SIGNAL('brushed(double,double,double,double)'),
+                    distribution_scatter_brushed)
+
+    _window.connect(_window.savesnapshot_action,
+                    QtCore.SIGNAL('triggered()'),
+                    save_rig_snapshot)
+
+    _window.connect(_window.comparesnapshot_action,
+                    QtCore.SIGNAL('triggered()'),
+                    compare_rig_snapshot)
+
+    _window.connect(rig_diff_dialog.apply_button,
+                    QtCore.SIGNAL('clicked()'),
+                    apply_rig_differences)
+
+    _window.connect(_window.lint_action,
+                    QtCore.SIGNAL('triggered()'),
+                    open_light_checks)
+
+    _window.connect(lint_dialog.run_button,
+                    QtCore.SIGNAL('clicked()'),
+                    run_light_checks)
+
+    _window.connect(lint_dialog.select_button,
+                    QtCore.SIGNAL('clicked()'),
+                    select_lint_lights)
+
+    _window.connect(lint_dialog.fix_button,
+                    QtCore.SIGNAL('clicked()'),
+                    fix_light_checks)
+
+    _window.connect(_window.optimizecurves_action,
+                    QtCore.SIGNAL('triggered()'),
+                    optimize_light_curves)
+
+    _window.connect(_window.layermatrix_action,
+                    QtCore.SIGNAL('triggered()'),
+                    open_layer_matrix)
+
+    _window.connect(layer_matrix.table,
+                    QtCore.SIGNAL('itemChanged(QTableWidgetItem*)'),
+                    layer_matrix_cell_changed)
+
+    _window.connect(layer_matrix.commit_button,
+                    QtCore.SIGNAL('clicked()'),
+                    commit_layer_matrix)
+
+    _window.connect(layer_matrix.revert_button,
+                    QtCore.SIGNAL('clicked()'),
+                    revert_layer_matrix)
+
     # Get the current Render Layer
     update_window_render_layer()
 
@@ -368,3 +2171,5 @@ def show():
     fill_itemlist()
 
     _window.show()
+
+    report_startup_time(startup_started)
@@ -5,10 +5,39 @@ __author__ = 'Carlos Montes'
 from PySide.QtGui import *
 from PySide import QtCore
 import os
-import maya.OpenMaya as OpenMaya
 import maya.OpenMayaUI as OpenMayaUI
 import shiboken
 
+import MayaSceneLights_eventHandlers as eventHandlers
+import MayaSceneLights_lightStore as lightStore
+import mayautils
+
+
+# Light types that can be filtered in the window, with their button labels
+FILTER_TYPES = (
+    ('spotLight', 'Spot'),
+    ('pointLight', 'Point'),
+    ('areaLight', 'Area'),
+    ('directionalLight', 'Directional'),
+    ('ambientLight', 'Ambient'),
+    ('volumeLight', 'Volume')
+)
+
+# Fields the light list can be sorted by, as in lightStore.SORT_VALUES, with their labels
+SORT_FIELDS = (
+    ('name', 'Name'),
+    ('namespace', 'Namespace'),
+    ('type', 'Type'),
+    ('intensity', 'Intensity'),
+    ('layers', 'Render Layers'),
+    ('hue', 'Hue')
+)
+
+# Style sheets of the buttons and combo boxes, labels and input fields of the window and its dialogs
+BUTTON_STYLE = 'background-color:#555555; color:#CCCCCC;'
+LABEL_STYLE = 'color:#EEEEEE;'
+INPUT_STYLE = 'background-color:#6E6E6E; color:#FFFFFF;'
+
 
 def get_maya_window():
     """
@@ -30,16 +59,13 @@ class LightInterfaceWindow(QMainWindow):
 
         super(LightInterfaceWindow, self).__init__(parent)
 
-        # Array that holds the names of lights in the scene
-        self.lightsArray = []
-
-        # List that holds the names of elements in the current render layer
-        self.render_layer_array = []
+        # Records of the lights in the scene, in widgetlist order
+        self.lights = lightStore.LightStore()
 
-        # Array that holds the ids of future Maya's MEventMessage callbacks
-        self.idCallback = []
+        # Registry of the Maya API callbacks that belong to this window
+        self.callbacks = mayautils.CallbackRegistry()
 
-        # Keeps name of the latest selected light. Useful for Timeline Listener
+        # Keeps the record of the latest selected light. Useful for Timeline Listener
         self.latest_light_selected = None
 
         # Keeps the name of the current render layer
@@ -48,9 +74,29 @@ class LightInterfaceWindow(QMainWindow):
         # For file location of icons
         self.filepath = os.path.dirname(__file__)
 
+        # Dictionary of light type -> QPixmap, so each icon file is loaded only once
+        self.icon_cache = {}
+
+        # When True, closing the window only hides it, so it can be reopened
+        # instantly with its light records, caches and callbacks
+        self.persistent = False
+
         # Determines whether 'Render Layer Only' Mode is on or not
         self.render_layer_only = False
 
+        # Records of the current Render Layer's members, used by 'Render Layer Only' Mode
+        self.layer_records = set()
+
+        # Latest 'Search Light' text and the records that match it; None matches every light
+        self.search_text = ''
+        self.search_matches = None
+
+        # Records whose widgetlist items are currently shown
+        self.visible_records = set()
+
+        # Namespaces whose lights are collapsed, hidden from the widgetlist
+        self.collapsed_namespaces = set()
+
         # Create and set the container's central widget on the window
         main_container = QWidget(self)
         self.setCentralWidget(main_container)
@@ -88,7 +134,7 @@ class LightInterfaceWindow(QMainWindow):
             :return: QPushButton
             """
             button = QPushButton('  ' + text + '  ')
-            button.setStyleSheet("background-color:#555555; color:#CCCCCC;")
+            button.setStyleSheet(BUTTON_STYLE)
             button.setFixedHeight(25)
             if font_size is not None:
                 font = QFont()
@@ -103,7 +149,7 @@ class LightInterfaceWindow(QMainWindow):
             :return: QCheckbox
             """
             checkbox = QCheckBox(text)
-            checkbox.setStyleSheet('color:#EEEEEE;')
+            checkbox.setStyleSheet(LABEL_STYLE)
     
             cb_palette = checkbox.palette()
             cb_palette.setColor(QPalette.Base, QtCore.Qt.gray)
@@ -120,7 +166,7 @@ class LightInterfaceWindow(QMainWindow):
             :return: QLabel
             """
             label = QLabel(text)
-            label.setStyleSheet('color:#EEEEEE;')
+            label.setStyleSheet(LABEL_STYLE)
             label.setAlignment(QtCore.Qt.AlignCenter)
     
             font = QFont()
@@ -152,11 +198,79 @@ class LightInterfaceWindow(QMainWindow):
         self.searchlight_tbox = new_line_edit(110)
         self.searchlight_tbox.setFocusPolicy(QtCore.Qt.StrongFocus)
 
+        # Sort fields of the light list, the second one breaking ties of the first one
+        sort_layout = QHBoxLayout()
+        sort_label = new_label('Sort by:', 8)
+        thenby_label = new_label('then:', 8)
+
+        self.sort_combo = QComboBox()
+        self.thenby_combo = QComboBox()
+        for field, label in SORT_FIELDS:
+            self.sort_combo.addItem(label, field)
+            self.thenby_combo.addItem(label, field)
+        self.sort_combo.setStyleSheet(BUTTON_STYLE)
+        self.thenby_combo.setStyleSheet(BUTTON_STYLE)
+
+        self.sortdescending_checkbox = new_checkbox('Descending')
+
+        # Light type filter buttons, checked while their type is shown
+        filters_layout = QHBoxLayout()
+        self.type_buttons = {}
+
+        for light_type, label in FILTER_TYPES:
+            button = new_button(label, 7)
+            button.setCheckable(True)
+            button.setChecked(True)
+            button.setIcon(self.light_icon(light_type))
+            button.setStyleSheet("""
+                                 QPushButton { background-color:#3A3A3A; color:#888888; }
+                                 QPushButton:checked { background-color:#555555; color:#CCCCCC; }
+                                 """)
+            self.type_buttons[light_type] = button
+            filters_layout.addWidget(button)
+
         # Widget List that will hold the light names, and its layout
         widgetlist_layout = QHBoxLayout()
         self.widgetlist = QListWidget()
         self.widgetlist.setMinimumHeight(400)
         self.widgetlist.setSelectionMode(QAbstractItemView.ExtendedSelection)
+
+        # Solo and mute actions, in the widgetlist's right click menu
+        self.widgetlist.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
+
+        self.solo_action = QAction('Solo Selected Lights', self.widgetlist)
+        self.mute_action = QAction('Mute Selected Lights', self.widgetlist)
+        self.unmute_action = QAction('Unmute Selected Lights', self.widgetlist)
+        self.restorestates_action = QAction('Restore Solo/Mute States', self.widgetlist)
+        self.emitmode_action = QAction('Solo/Mute with Emit Diffuse/Specular', self.widgetlist)
+        self.emitmode_action.setCheckable(True)
+
+        separator = QAction(self.widgetlist)
+        separator.setSeparator(True)
+
+        for action in (self.solo_action, self.mute_action, self.unmute_action,
+                       self.restorestates_action, separator, self.emitmode_action):
+            self.widgetlist.addAction(action)
+
+        # Namespace list next to the widgetlist, with the number of lights in each namespace.
+        # Unchecking a namespace collapses its lights; its right click menu acts on whole namespaces
+        self.namespace_list = QListWidget()
+        self.namespace_list.setFixedWidth(150)
+        self.namespace_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.namespace_list.setStyleSheet(INPUT_STYLE)
+        self.namespace_list.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
+
+        self.selectnamespace_action = QAction('Select Lights in Namespace', self.namespace_list)
+        self.expandnamespaces_action = QAction('Expand All', self.namespace_list)
+        self.collapsenamespaces_action = QAction('Collapse All', self.namespace_list)
+        self.unloadreference_action = QAction('Unload Reference', self.namespace_list)
+
+        namespace_separator = QAction(self.namespace_list)
+        namespace_separator.setSeparator(True)
+
+        for action in (self.selectnamespace_action, self.expandnamespaces_action,
+                       self.collapsenamespaces_action, namespace_separator, self.unloadreference_action):
+            self.namespace_list.addAction(action)
         self.widgetlist.setStyleSheet("""
                                     QListWidget {
                                         background-color:#6E6E6E;
@@ -215,9 +329,23 @@ class LightInterfaceWindow(QMainWindow):
         self.intensityoperator_combo.addItem("+/- increase")
         self.intensityoperator_combo.addItem("* multiply")
         self.intensityoperator_combo.addItem("+/- percentage")
-        self.intensityoperator_combo.setStyleSheet("background-color:#555555; color:#CCCCCC;")
+        self.intensityoperator_combo.addItem("set stops (EV)")
+        self.intensityoperator_combo.addItem("+/- stops (EV)")
+        self.intensityoperator_combo.setStyleSheet(BUTTON_STYLE)
         self.intensityoperator_combo.setFixedHeight(25)
 
+        # Intensity scrub slider, in hundredths of an exposure stop around the current intensities
+        scrubintensity_layout = QHBoxLayout()
+        intensityscrub_label = new_label('Scrub:', 8)
+
+        self.intensityscrub_slider = QSlider(QtCore.Qt.Horizontal)
+        self.intensityscrub_slider.setRange(-400, 400)
+        self.intensityscrub_slider.setValue(0)
+        self.intensityscrub_slider.setFixedWidth(130)
+        self.intensityscrub_slider.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        self.intensityscrub_value = new_label('+0.00 EV', 8)
+
         # Intensity Bottom Widgets
         intensity_bottomlayout = QHBoxLayout()
 
@@ -256,6 +384,7 @@ class LightInterfaceWindow(QMainWindow):
         lightcolor_bottomlayout = QHBoxLayout()
 
         self.keyframecolor_checkbox = new_checkbox('Set Keyframe')
+        self.livecolor_checkbox = new_checkbox('Live')
         self.applycolor_button = new_button('Apply Color')
 
         # Shadow Color Top Label
@@ -290,6 +419,7 @@ class LightInterfaceWindow(QMainWindow):
         shadowcolor_bottomlayout = QHBoxLayout()
 
         self.keyframeshadow_checkbox = new_checkbox('Set Keyframe')
+        self.liveshadow_checkbox = new_checkbox('Live')
         self.applyshadow_button = new_button('Apply Shadow')
 
         # Render Layer Buttons
@@ -298,12 +428,67 @@ class LightInterfaceWindow(QMainWindow):
         self.renderlayer_add = new_button('Add to Render Layer', 7)
         self.renderlayer_remove = new_button('Remove from Render Layer', 7)
 
+        # ================ MENU BAR =================
+
+        self.menuBar().setStyleSheet(BUTTON_STYLE)
+
+        create_menu = self.menuBar().addMenu('Create')
+        self.bulkcreate_action = create_menu.addAction('Bulk Create from Template...')
+
+        renderlayer_menu = self.menuBar().addMenu('Render Layers')
+        self.layermatrix_action = renderlayer_menu.addAction('Membership Matrix...')
+
+        intensity_menu = self.menuBar().addMenu('Intensity')
+        self.exposure_action = intensity_menu.addAction('Exposure Balance...')
+
+        groups_menu = self.menuBar().addMenu('Groups')
+        self.lightgroups_action = groups_menu.addAction('Light Groups...')
+
+        select_menu = self.menuBar().addMenu('Select')
+        self.spatialselect_action = select_menu.addAction('Spatial Selection...')
+
+        analysis_menu = self.menuBar().addMenu('Analysis')
+        self.contribution_action = analysis_menu.addAction('Light Contribution...')
+        self.exportsamples_action = analysis_menu.addAction('Export Sampled Attributes...')
+        self.distribution_action = analysis_menu.addAction('Intensity and Color Distribution...')
+        analysis_menu.addSeparator()
+        self.savesnapshot_action = analysis_menu.addAction('Save Light Rig Snapshot...')
+        self.comparesnapshot_action = analysis_menu.addAction('Compare with Light Rig Snapshot...')
+        self.lint_action = analysis_menu.addAction('Light Rig Checks...')
+
+        keys_menu = self.menuBar().addMenu('Keys')
+        self.optimizecurves_action = keys_menu.addAction('Optimize Selected Light Curves...')
+
+        debug_menu = self.menuBar().addMenu('Debug')
+        self.callbacks_action = debug_menu.addAction('Print Active Callbacks')
+        self.commandserver_action = debug_menu.addAction('Local Command Server')
+        self.commandserver_action.setCheckable(True)
+        self.recordevents_action = debug_menu.addAction('Record Callback Events')
+        self.recordevents_action.setCheckable(True)
+
         # ============ CONNECTIONS, SIGNALS AND CALLBACKS ============
 
         # Connect the 'Search Light' textbox to the search_light() method
         self.connect(self.searchlight_tbox,
                      QtCore.SIGNAL('keyReleaseEvent()'), self.search_light)
 
+        # Show the stops of the intensity scrub slider next to it
+        self.connect(self.intensityscrub_slider,
+                     QtCore.SIGNAL('valueChanged(int)'), self.update_scrub_label)
+
+        # Collapse or expand the lights of a namespace when it's unchecked or checked
+        self.connect(self.namespace_list,
+                     QtCore.SIGNAL('itemChanged(QListWidgetItem*)'), self.namespace_toggled)
+        self.connect(self.expandnamespaces_action,
+                     QtCore.SIGNAL('triggered()'), lambda: self.set_namespaces_collapsed(False))
+        self.connect(self.collapsenamespaces_action,
+                     QtCore.SIGNAL('triggered()'), lambda: self.set_namespaces_collapsed(True))
+
+        # Connect the type filter buttons to the apply_filters() method
+        for button in self.type_buttons.values():
+            self.connect(button, QtCore.SIGNAL('toggled(bool)'),
+                         lambda _: self.apply_filters())
+
         # ============ LAYOUTS ============
 
         # ------ Vertical box layout for the left side ------
@@ -325,7 +510,26 @@ class LightInterfaceWindow(QMainWindow):
         vertical_layout_left.addLayout(search_layout)
         add_space(vertical_layout_left, 0, 5)
 
+        # Type filter buttons Layout
+        vertical_layout_left.addLayout(filters_layout)
+        add_space(vertical_layout_left, 0, 5)
+
+        # Sort fields Layout
+        sort_layout.addWidget(sort_label)
+        add_space(sort_layout, 5, 0)
+        sort_layout.addWidget(self.sort_combo)
+        add_space(sort_layout, 5, 0)
+        sort_layout.addWidget(thenby_label)
+        add_space(sort_layout, 5, 0)
+        sort_layout.addWidget(self.thenby_combo)
+        sort_layout.addStretch(1)
+        sort_layout.addWidget(self.sortdescending_checkbox)
+
+        vertical_layout_left.addLayout(sort_layout)
+        add_space(vertical_layout_left, 0, 5)
+
         # Widget list Layout
+        widgetlist_layout.addWidget(self.namespace_list)
         widgetlist_layout.addWidget(self.widgetlist)
         vertical_layout_left.addLayout(widgetlist_layout)
         add_space(vertical_layout_left, 0, 5)
@@ -377,6 +581,18 @@ class LightInterfaceWindow(QMainWindow):
         intensity_layout.addLayout(setintensity_layout)
         add_space(intensity_layout, 0, 10)
 
+        add_space(scrubintensity_layout, 20, 0)
+        scrubintensity_layout.addWidget(intensityscrub_label)
+        add_space(scrubintensity_layout, 6, 0)
+        scrubintensity_layout.addWidget(self.intensityscrub_slider)
+        scrubintensity_layout.addStretch(1)
+        scrubintensity_layout.addWidget(self.intensityscrub_value)
+        add_space(scrubintensity_layout, 20, 0)
+        scrubintensity_layout.setAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
+
+        intensity_layout.addLayout(scrubintensity_layout)
+        add_space(intensity_layout, 0, 10)
+
         modifiers_layout.addLayout(intensity_layout)
         add_space(modifiers_layout, 0, 6)
 
@@ -444,6 +660,7 @@ class LightInterfaceWindow(QMainWindow):
         # Bottom elements of light color
         add_space(lightcolor_bottomlayout, 20, 0)
         lightcolor_bottomlayout.addWidget(self.keyframecolor_checkbox)
+        lightcolor_bottomlayout.addWidget(self.livecolor_checkbox)
         lightcolor_bottomlayout.addStretch(1)
         lightcolor_bottomlayout.addWidget(self.applycolor_button)
         add_space(lightcolor_bottomlayout, 20, 0)
@@ -506,6 +723,7 @@ class LightInterfaceWindow(QMainWindow):
         # Bottom elements of shadow color
         add_space(shadowcolor_bottomlayout, 20, 0)
         shadowcolor_bottomlayout.addWidget(self.keyframeshadow_checkbox)
+        shadowcolor_bottomlayout.addWidget(self.liveshadow_checkbox)
         shadowcolor_bottomlayout.addStretch(1)
         shadowcolor_bottomlayout.addWidget(self.applyshadow_button)
         add_space(shadowcolor_bottomlayout, 20, 0)
@@ -547,6 +765,9 @@ class LightInterfaceWindow(QMainWindow):
         self.update_lightcolor_boxes(self.color_frame.color)
         self.update_shadowcolor_boxes(self.colorshadow_frame.color)
 
+        # Show a zero count on each type filter until lights are listed
+        self.update_type_counts()
+
         main_container.setLayout(main_layout)
         self.setWindowTitle('Light Interface')
         self.setObjectName('lightInterfaceUI')
@@ -587,43 +808,286 @@ class LightInterfaceWindow(QMainWindow):
     def populate_itemlist(self, lights_array, selected_array):
         """
         Fill the widgetlist with the passed array of lights
-        :param lights_array: Transform node names of lights in the current scene
+        :param lights_array: Array of (Transform node, light type) of lights in the current scene,
+        optionally followed by the MObjectHandle of the Transform node
         :param selected_array: Array of selected items in the scene
         :return:None
         """
         # Clear the current list clean
-        for item in self.lightsArray:
-            list_items = self.widgetlist.findItems(str(item),
-                                                   QtCore.Qt.MatchExactly)
-            self.widgetlist.removeItemWidget(list_items[0])
+        for record in self.lights:
+            self.widgetlist.removeItemWidget(self.widgetlist.item(record.row))
 
-        self.lightsArray = []
+        self.lights.clear()
         self.widgetlist.clear()
-        counter = 0
+        self.latest_light_selected = None
+
+        selected_names = set(str(item) for item in selected_array)
 
-        for item, light_type in lights_array:
-            self.lightsArray.append(str(item))
+        for light in lights_array:
+            record = self.lights.add(str(light[0]), light[1], light[2] if len(light) > 2 else None)
+            list_item = self.create_list_item(record)
 
-            # Create a ListWidgetItem with the light's name.
-            # This text will be hidden with the widgetlist's Stylesheet
-            list_item = QListWidgetItem(self.lightsArray[counter])
-            list_item.setSizeHint(QtCore.QSize(0, 50))
+            if record.name in selected_names:
+                list_item.setSelected(True)
+                self.latest_light_selected = record
 
-            # Create a Custom Widget with the light's name
-            # and an icon according to its type and render layer presence
-            custom_widget = CustomListWidgetItem(self.widgetlist,
-                                                 self.lightsArray[counter],
-                                                 os.path.join(self.filepath,
-                                                 'icon_' + light_type + '.png'))
+        # Every new item is shown; hide the ones that don't pass the current filters
+        self.visible_records = set(self.lights)
+        self.layer_records = self.lights.layer_records(self.current_render_layer)
+        self.refresh_filters()
 
-            self.widgetlist.addItem(list_item)
-            self.widgetlist.setItemWidget(list_item, custom_widget)
+    def create_list_item(self, record):
+        """
+        Create the widgetlist item of a light record, at the record's row
+        :param record: LightRecord
+        :return: QListWidgetItem
+        """
+        # Create a ListWidgetItem with the light's name.
+        # This text will be hidden with the widgetlist's Stylesheet
+        list_item = LightListItem(record)
+        list_item.setSizeHint(QtCore.QSize(0, 50))
 
-            if item in selected_array:
-                list_item.setSelected(True)
-                self.latest_light_selected = item
+        # Create a Custom Widget with the light's name
+        # and an icon according to its type and render layer presence
+        custom_widget = CustomListWidgetItem(self.widgetlist,
+                                             record.name,
+                                             self.light_icon(record.type))
+
+        self.widgetlist.insertItem(record.row, list_item)
+        self.widgetlist.setItemWidget(list_item, custom_widget)
+
+        return list_item
+
+    def insert_light(self, name, light_type, handle=None):
+        """
+        Add a single light to the widgetlist, at its sorted position,
+        without rebuilding the rest of the list
+        :param name: Transform node name of the light
+        :param light_type: nodeType of the light's shape
+        :param handle: Optional MObjectHandle of the light's Transform node
+        :return: The new LightRecord
+        """
+        return self.insert_lights([(name, light_type, handle)])[0]
+
+    def insert_lights(self, lights):
+        """
+        Add several lights to the widgetlist, at their sorted positions, filtering
+        and counting once, without rebuilding the rest of the list
+        :param lights: Array of (name, light type, MObjectHandle or None) tuples
+        :return: List of the new LightRecords
+        """
+        records = self.lights.insert_many(lights)
+
+        # Items are created in ascending row order, so every one lands on its record's row
+        for record in records:
+            self.create_list_item(record)
+
+        self.visible_records.update(records)
+
+        # The records were inserted by name; move them to their place in any other order
+        if not self.sorted_by_name():
+            self.sort_lights()
+
+        if self.search_matches is not None:
+            target = 'name' if ':' in self.search_text else 'short_name'
+            self.search_matches.update(record for record in records
+                                       if self.search_text in getattr(record, target))
+
+        self.apply_filters()
+        self.update_type_counts()
+        return records
+
+    def sort_fields(self):
+        """
+        :return: List of the fields the light list is sorted by, without repetitions
+        """
+        fields = [self.sort_combo.itemData(self.sort_combo.currentIndex()),
+                  self.thenby_combo.itemData(self.thenby_combo.currentIndex())]
+
+        return fields[:1] if fields[0] == fields[1] else fields
+
+    def sorted_by_name(self):
+        """
+        :return: True if the light list is sorted by ascending name, the order records are added in
+        """
+        return self.sort_fields() == ['name'] and not self.sortdescending_checkbox.isChecked()
+
+    def sort_lights(self):
+        """
+        Sort the widgetlist by the chosen fields. The sort keys are computed once per
+        light from its cached record; the items and their widgets are only moved
+        :return: None
+        """
+        key = self.lights.sort_key_function(self.sort_fields())
+
+        for record in self.lights:
+            self.widgetlist.item(record.row).sort_value = key(record)
+
+        if self.sortdescending_checkbox.isChecked():
+            self.widgetlist.sortItems(QtCore.Qt.DescendingOrder)
+        else:
+            self.widgetlist.sortItems(QtCore.Qt.AscendingOrder)
+
+        # Keep the records' rows in step with the new order of the items
+        self.lights.reorder([self.widgetlist.item(row).record
+                             for row in range(self.widgetlist.count())])
+
+    def remove_light(self, name):
+        """
+        Remove a single light from the widgetlist without rebuilding the rest of the list
+        :param name: Transform node name of the light
+        :return: None
+        """
+        self.remove_lights([name])
+
+    def remove_lights(self, names):
+        """
+        Remove several lights from the widgetlist, e.g. the lights of an unloaded
+        reference, reindexing and counting once, without rebuilding the rest of the list
+        :param names: Array of Transform node names; the ones that aren't listed are skipped
+        :return: None
+        """
+        records = self.lights.remove_many(names)
+
+        if not records:
+            return
+
+        if self.latest_light_selected in records:
+            self.latest_light_selected = None
+
+        self.visible_records.difference_update(records)
+        self.layer_records.difference_update(records)
+        if self.search_matches is not None:
+            self.search_matches.difference_update(records)
+
+        # Records keep their previous rows; take the items from the bottom up so those stay valid
+        for record in sorted(records, key=lambda record: record.row, reverse=True):
+            list_item = self.widgetlist.item(record.row)
+            self.widgetlist.removeItemWidget(list_item)
+            self.widgetlist.takeItem(record.row)
+
+        self.update_type_counts()
+
+    def rename_light(self, old_name, new_name):
+        """
+        Show a light's new name in the widgetlist
+        :param old_name: Previous Transform node name of the light
+        :param new_name: Current Transform node name of the light
+        :return: None
+        """
+        record = self.lights.rename(old_name, new_name)
+
+        if record is None:
+            return
+
+        list_item = self.widgetlist.item(record.row)
+        list_item.setText(new_name)
+        self.widgetlist.itemWidget(list_item).light_name.setText(new_name)
+
+        # The new name may not match the current search anymore
+        self.refresh_filters()
+
+    def light_icon(self, light_type):
+        """
+        Retrieves the icon of a light type, loading it from disk the first time
+        :param light_type: nodeType of a light's shape
+        :return: QPixmap
+        """
+        pixmap = self.icon_cache.get(light_type)
+
+        if pixmap is None:
+            pixmap = QPixmap(os.path.join(self.filepath, 'icon_' + light_type + '.png'))
+            self.icon_cache[light_type] = pixmap
+
+        return pixmap
+
+    def apply_filters(self):
+        """
+        Show the lights that pass the type filters, the current search and the
+        'Render Layer Only' mode; see eventHandlers.apply_filters().
+        :return: None
+        """
+        eventHandlers.apply_filters(self)
+
+    def refresh_filters(self):
+        """
+        Recompute the search matches from scratch, and update type counts and shown items.
+        :return: None
+        """
+        self.search_text = ''
+        self.search_matches = None
+        self.update_type_counts()
+        self.search_light(self.searchlight_tbox.text())
+
+    def update_type_counts(self):
+        """
+        Show the number of lights of each type in its filter button, and of each namespace in the namespace list
+        :return: None
+        """
+        for light_type, label in FILTER_TYPES:
+            self.type_buttons[light_type].setText(' %s %d ' % (label, self.lights.count(light_type)))
+
+        self.update_namespace_list()
+
+    def update_namespace_list(self):
+        """
+        Refill the namespace list with the namespaces of the listed lights and their counts,
+        keeping the selected ones selected. Namespaces that are gone stop being collapsed
+        :return: None
+        """
+        selected = set(self.selected_namespaces())
+        namespaces = self.lights.namespaces()
+        self.collapsed_namespaces &= set(namespace for namespace, _ in namespaces)
+
+        # Checking the new items shouldn't collapse or expand anything
+        self.namespace_list.blockSignals(True)
+        self.namespace_list.clear()
+
+        for namespace, count in namespaces:
+            item = QListWidgetItem('%s (%d)' % (namespace or ':', count))
+            item.setData(QtCore.Qt.UserRole, namespace)
+            item.setFlags(item.flags() | QtCore.Qt.ItemIsUserCheckable)
+            item.setCheckState(QtCore.Qt.Unchecked if namespace in self.collapsed_namespaces
+                               else QtCore.Qt.Checked)
+
+            self.namespace_list.addItem(item)
+            item.setSelected(namespace in selected)
+
+        self.namespace_list.blockSignals(False)
+
+    def selected_namespaces(self):
+        """
+        :return: List of the namespaces selected in the namespace list; '' is the root namespace
+        """
+        return [item.data(QtCore.Qt.UserRole) for item in self.namespace_list.selectedItems()]
+
+    def namespace_toggled(self, item):
+        """
+        A namespace has been checked or unchecked; expand or collapse its lights
+        :param item: QListWidgetItem of the namespace
+        :return: None
+        """
+        namespace = item.data(QtCore.Qt.UserRole)
+
+        if item.checkState() == QtCore.Qt.Checked:
+            self.collapsed_namespaces.discard(namespace)
+        else:
+            self.collapsed_namespaces.add(namespace)
+
+        self.apply_filters()
+
+    def set_namespaces_collapsed(self, state):
+        """
+        :param state: True to collapse the lights of every namespace, False to expand them
+        :return: None
+        """
+        if state:
+            self.collapsed_namespaces = set(self.lights.by_namespace)
+        else:
+            self.collapsed_namespaces = set()
 
-            counter += 1
+        self.update_namespace_list()
+        self.apply_filters()
 
     def receive_mayacolor(self, rgb_float_array):
         """
@@ -656,30 +1120,14 @@ class LightInterfaceWindow(QMainWindow):
         defaultRenderLayer and reset Render Layer Only mode.
         :return: None
         """
-        if self.current_render_layer == 'defaultRenderLayer':
-            self.renderlayer_button.setEnabled(False)
-            self.renderlayer_add.setEnabled(False)
-            self.renderlayer_remove.setEnabled(False)
-        else:
-            self.renderlayer_button.setEnabled(True)
-            self.renderlayer_add.setEnabled(True)
-            self.renderlayer_remove.setEnabled(True)
-
-        self.render_layer_off()
+        eventHandlers.render_change_trigger(self)
 
     def render_layer_off(self):
         """
         Render Layer Mode has been deactivated.
         :return: None
         """
-        self.render_layer_array = []
-        self.render_layer_only = False
-        # Change the Render Layer button text
-        self.renderlayer_button.setText('Show Current Render Layer Only')
-
-        # Go through each list item and unhide it
-        for i in range(self.widgetlist.count()):
-            self.widgetlist.item(i).setHidden(False)
+        eventHandlers.render_layer_off(self)
 
     def render_layer_on(self, layer_elements):
         """
@@ -687,19 +1135,14 @@ class LightInterfaceWindow(QMainWindow):
         :param layer_elements: Array of elements in the current Render Layer
         :return: None
         """
-        self.render_layer_array = layer_elements
+        self.lights.set_layer_members(self.current_render_layer, layer_elements)
+        self.layer_records = self.lights.layer_records(self.current_render_layer)
         self.render_layer_only = True
         # Change the Render Layer button text
         self.renderlayer_button.setText('Show All Lights')
 
-        # Go through each list item and hide or unhide it
-        for i in range(self.widgetlist.count()):
-            listitem = self.widgetlist.item(i)
-
-            if listitem.text() in self.render_layer_array:
-                listitem.setHidden(False)
-            else:
-                listitem.setHidden(True)
+        # Hide the items that aren't in the layer or don't pass the other filters
+        self.apply_filters()
 
     def search_light(self, letters):
         """
@@ -707,45 +1150,45 @@ class LightInterfaceWindow(QMainWindow):
         :param letters: String of characters that the user has typed
         :return: None
         """
-        # If Render Layer Only is on, show those lights that are in the window's
-        # render_layer_array and that match the 'Search Light' textbox content
-        if self.render_layer_only:
-            # Go through each list item and hide it or unhide it
-            for i in range(self.widgetlist.count()):
-                listitem = self.widgetlist.item(i)
-                match = listitem.text().find(letters)
-                if match >= 0 and listitem.text() in self.render_layer_array:
-                    listitem.setHidden(False)
-                else:
-                    listitem.setHidden(True)
+        # Searches match the names without their namespaces, unless they contain a ':'
+        target = 'name' if ':' in letters else 'short_name'
+
+        # An empty search matches every light
+        if not letters:
+            self.search_matches = None
+
+        # A search that contains the previous one can only narrow its matches down,
+        # as long as both are matched against the same part of the names
+        elif (self.search_matches is not None and self.search_text in letters and
+              (':' in self.search_text) == (':' in letters)):
+            self.search_matches = set(record for record in self.search_matches
+                                      if letters in getattr(record, target))
 
-        # Else do it the easier way
         else:
-            # Go through each list item and hide it or unhide it
-            for i in range(self.widgetlist.count()):
-                listitem = self.widgetlist.item(i)
-                match = listitem.text().find(letters)
-                if match < 0:
-                    listitem.setHidden(True)
-                else:
-                    listitem.setHidden(False)
+            self.search_matches = set(record for record in self.lights
+                                      if letters in getattr(record, target))
+
+        self.search_text = letters
+
+        # Combine the matches with the type filters and 'Render Layer Only' mode
+        self.apply_filters()
+
+    def selected_records(self):
+        """
+        Retrieves the records of the lights selected in the widgetlist
+        :return: List of LightRecords, in widgetlist order
+        """
+        rows = sorted(index.row() for index
+                      in self.widgetlist.selectionModel().selectedRows())
+        return [self.lights.records[row] for row in rows]
 
     def update_list_selection(self, selected_array):
         """
-        Updates the current widgetlist selection
+        Updates the current widgetlist selection; see eventHandlers.select_list_items()
         :param selected_array: Array of selected lights in the scene
-        :return:
+        :return: None
         """
-        self.latest_light_selected = None
-
-        for item in self.lightsArray:
-            listitem = self.widgetlist.findItems(item, QtCore.Qt.MatchExactly)
-
-            if item in selected_array:
-                listitem[0].setSelected(QtCore.Qt.Checked)
-                self.latest_light_selected = listitem[0].text()
-            else:
-                listitem[0].setSelected(QtCore.Qt.Unchecked)
+        eventHandlers.select_list_items(self, selected_array)
 
     def update_intensity_label(self, quantity=None):
         """
@@ -758,6 +1201,19 @@ class LightInterfaceWindow(QMainWindow):
         else:
             self.currentintensity_label.setText("%.2f" % quantity)
 
+    def scrub_stops(self):
+        """
+        :return: Exposure stops the intensity scrub slider is at
+        """
+        return self.intensityscrub_slider.value() / 100.0
+
+    def update_scrub_label(self, _=None):
+        """
+        Show the intensity scrub slider's exposure stops next to it
+        :return: None
+        """
+        self.intensityscrub_value.setText('%+.2f EV' % self.scrub_stops())
+
     def update_lightcolor_boxes(self, color):
         """
         Fill the light color text widgets with a certain string in
@@ -798,20 +1254,21 @@ class LightInterfaceWindow(QMainWindow):
 
     # ============ OVERRIDDEN FUNCTIONS ============
 
-    # When the window is closed, kill the MEvent Message Callback
+    # When the window is closed, kill the Maya API Callbacks
     def closeEvent(self, event):
         """
         Remove Maya API callbacks when the window is closed.
         :param event: Unused event parameter
         :return: None
         """
-        for idc in self.idCallback:
-            try:
-                OpenMaya.MEventMessage.removeCallback(idc)
-                print 'Callback removed'
+        # A persistent window is only hidden, keeping everything alive to reopen it
+        if self.persistent:
+            self.hide()
+            event.ignore()
+            return
 
-            except:
-                print "No Maya API Callback {} to close".format(idc)
+        self.callbacks.remove_all()
+        print 'Callbacks removed'
 
         event.accept()
 
@@ -826,7 +1283,9 @@ class LightInterfaceWindow(QMainWindow):
 
 class colorFrame(QFrame):
     """
-    QFrame subclass that opens a 'Choose Color' Dialog when being clicked on.
+    QFrame subclass that opens a non-modal 'Choose Color' Dialog when being clicked on.
+    While the dialog is open, it emits 'colorPreviewStarted()', 'colorPreviewed(QColor)'
+    for every color shown in it, and 'colorPreviewFinished(bool)' once it's accepted or not.
     """
 
     def __init__(self, parent, number, red, green, blue):
@@ -842,57 +1301,118 @@ class colorFrame(QFrame):
         super(colorFrame, self).__init__(parent)
 
         self.kind = number
-        self.hexadecimal = QLabel('', self)
         self.color = QColor(red, green, blue)
-        self.update_color(self.color)
 
-        vertical_layout = QVBoxLayout()
-        vertical_layout.addWidget(self.hexadecimal)
-        vertical_layout.setAlignment(QtCore.Qt.AlignCenter)
+        # Color the frame had when the dialog was opened, shown again if it's cancelled
+        self.previous_color = None
+
+        # Created on the first click, and reused afterwards
+        self.dialog = None
 
         self.setFrameStyle(QFrame.Panel | QFrame.Sunken)
         self.setLineWidth(1)
         self.setFixedSize(80, 80)
-        self.setLayout(vertical_layout)
 
     def update_color(self, color):
         """
-        Updates the current frame's QColor's value
+        Updates the current frame's QColor's value; it's shown on the next paint
         :param color: QColor
         :return: None
         """
-        self.color = color
-        self.setStyleSheet("background-color: %s" % self.color.name())
+        self.color = QColor(color)
+        self.update()
 
-        # Modify the BW color of the hex string according to black color value
-        if self.color.black() < 128:
-            self.hexadecimal.setStyleSheet('color:#000000')
-        else:
-            self.hexadecimal.setStyleSheet('color:#FFFFFF')
-        self.hexadecimal.setText(self.color.name())
+    def paintEvent(self, event):
+        """
+        Paint the color and its hexadecimal name, in black or white depending on the
+        color's black value, instead of restyling the frame on every change
+        :param event: QPaintEvent
+        :return: None
+        """
+        painter = QPainter(self)
+        painter.fillRect(self.contentsRect(), self.color)
+        painter.setPen(QtCore.Qt.black if self.color.black() < 128 else QtCore.Qt.white)
+        painter.drawText(self.contentsRect(), QtCore.Qt.AlignCenter, self.color.name())
+        painter.end()
+
+        super(colorFrame, self).paintEvent(event)
 
     def mousePressEvent(self, event):
         """
-        Display a QColorDialog when being clicked on
+        Display a non-modal QColorDialog when being clicked on
         :param event: Unused event parameter
         :return: None
         """
-        color = QColorDialog.getColor()
+        if self.dialog is None:
+            self.dialog = QColorDialog(self)
+            self.dialog.setModal(False)
+            self.connect(self.dialog, QtCore.SIGNAL('currentColorChanged(QColor)'), self.preview_color)
+            self.connect(self.dialog, QtCore.SIGNAL('finished(int)'), self.dialog_finished)
 
-        if color:
-            self.update_color(color)
-            self.parent().parent().parent().color_selected(color, self.kind)
+        if self.dialog.isVisible():
+            self.dialog.raise_()
+            return
+
+        self.previous_color = QColor(self.color)
+        self.emit(QtCore.SIGNAL('colorPreviewStarted()'))
+
+        self.dialog.setCurrentColor(self.color)
+        self.dialog.show()
+
+    def preview_color(self, color):
+        """
+        The color shown in the dialog changed
+        :param color: QColor
+        :return: None
+        """
+        self.update_color(color)
+        self.emit(QtCore.SIGNAL('colorPreviewed(QColor)'), color)
+
+    def dialog_finished(self, result):
+        """
+        The dialog was closed; keep its color if it was accepted, or go back to the previous one
+        :param result: QDialog result code
+        :return: None
+        """
+        accepted = result == QDialog.Accepted
+
+        if accepted:
+            self.update_color(self.dialog.selectedColor())
+            self.parent().parent().parent().color_selected(self.color, self.kind)
+        else:
+            self.update_color(self.previous_color)
+
+        self.emit(QtCore.SIGNAL('colorPreviewFinished(bool)'), accepted)
+
+
+class LightListItem(QListWidgetItem):
+    """
+    QListWidgetItem of a light record, compared by a sort key computed before sorting.
+    """
+
+    def __init__(self, record):
+        """
+        :param record: LightRecord shown by this item
+        :return: None
+        """
+        super(LightListItem, self).__init__(record.name)
+
+        self.record = record
+        self.sort_value = None
+
+    def __lt__(self, other):
+        return self.sort_value < other.sort_value
 
 
 class CustomListWidgetItem(QWidget):
     """
     Widget that shows a light's name and icon according to its nodeType.
     """
-    def __init__(self, parent, name, icon_path):
+    def __init__(self, parent, name, pixmap):
         """
         :param parent: Widget item that will contain this widget
         :param name: Name of the light
-        :param icon_path: Filepath of the image
+        :param pixmap: QPixmap with the icon of the light's type
         """
 
         super(CustomListWidgetItem, self).__init__(parent)
@@ -902,27 +1422,1121 @@ class CustomListWidgetItem(QWidget):
 
         light_icon = QLabel()
         light_icon.setFixedSize(38, 38)
-        pixmap = QImage(icon_path)
-        pixmap.load(icon_path)
-        light_icon.setPixmap(QPixmap.fromImage(pixmap))
+        light_icon.setPixmap(pixmap)
 
-        light_name = QLabel(name)
+        self.light_name = QLabel(name)
         font = QFont()
         font.setPointSize(10)
-        light_name.setFont(font)
-        light_name.setStyleSheet('color:#FFFFFF')
+        self.light_name.setFont(font)
+        self.light_name.setStyleSheet('color:#FFFFFF')
 
         spacer = QSpacerItem(10, 0)
         main_layout.addSpacerItem(spacer)
         main_layout.addWidget(light_icon)
         spacer = QSpacerItem(10, 0)
         main_layout.addSpacerItem(spacer)
-        main_layout.addWidget(light_name)
+        main_layout.addWidget(self.light_name)
         main_layout.setAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
 
         self.setLayout(main_layout)
 
 
+class LightInterfaceDialog(QDialog):
+    """
+    Base class of the window's dialogs: the window's dark background, and
+    buttons and labels styled like the window's own.
+    """
+
+    def __init__(self, parent=None):
+        """
+        :param parent: Window that will parent this dialog
+        :return: None
+        """
+        super(LightInterfaceDialog, self).__init__(parent)
+
+        background_palette = self.palette()
+        background_palette.setColor(self.backgroundRole(), QColor(46, 46, 46))
+        self.setPalette(background_palette)
+
+    @staticmethod
+    def new_button(text):
+        """
+        :param text: Text that the button will contain
+        :return: QPushButton
+        """
+        button = QPushButton('  ' + text + '  ')
+        button.setStyleSheet(BUTTON_STYLE)
+        button.setFixedHeight(25)
+        return button
+
+    @staticmethod
+    def new_label(text):
+        """
+        :param text: Text of the label
+        :return: QLabel
+        """
+        label = QLabel(text)
+        label.setStyleSheet(LABEL_STYLE)
+        return label
+
+
+class LayerMatrixDialog(LightInterfaceDialog):
+    """
+    Dialog with a lights-by-render-layers grid of membership checkboxes.
+    """
+
+    def __init__(self, parent=None):
+        """
+        :param parent: Window that will parent this dialog
+        :return: None
+        """
+        super(LayerMatrixDialog, self).__init__(parent)
+
+        # Row and column headers, kept to translate table cells into lights and layers
+        self.lights = []
+        self.layers = []
+
+        self.table = QTableWidget(self)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.table.setStyleSheet(INPUT_STYLE)
+
+        self.check_button = self.new_button('Check Selected')
+        self.uncheck_button = self.new_button('Uncheck Selected')
+        self.revert_button = self.new_button('Revert')
+        self.commit_button = self.new_button('Commit Changes')
+
+        self.pending_label = self.new_label('')
+        self.update_pending_label(0)
+
+        self.connect(self.check_button, QtCore.SIGNAL('clicked()'),
+                     lambda: self.set_selected_cells(True))
+        self.connect(self.uncheck_button, QtCore.SIGNAL('clicked()'),
+                     lambda: self.set_selected_cells(False))
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(self.check_button)
+        buttons_layout.addWidget(self.uncheck_button)
+        buttons_layout.addStretch(1)
+        buttons_layout.addWidget(self.pending_label)
+        buttons_layout.addWidget(self.revert_button)
+        buttons_layout.addWidget(self.commit_button)
+
+        main_layout = QVBoxLayout()
+        main_layout.addWidget(self.table)
+        main_layout.addLayout(buttons_layout)
+        self.setLayout(main_layout)
+
+        self.resize(700, 500)
+        self.setWindowTitle('Render Layer Membership')
+        self.setObjectName('lightInterfaceLayerMatrix')
+
+    def populate(self, lights, layers, is_member):
+        """
+        Rebuild the grid without emitting itemChanged signals.
+        :param lights: Transform node names of lights, one per row
+        :param layers: Render Layer names, one per column
+        :param is_member: Callable(light, layer) that returns the membership of a cell
+        :return: None
+        """
+        self.lights = list(lights)
+        self.layers = list(layers)
+
+        self.table.blockSignals(True)
+        self.table.clear()
+        self.table.setRowCount(len(self.lights))
+        self.table.setColumnCount(len(self.layers))
+        self.table.setVerticalHeaderLabels(self.lights)
+        self.table.setHorizontalHeaderLabels(self.layers)
+
+        for row, light in enumerate(self.lights):
+            for column, layer in enumerate(self.layers):
+                cell = QTableWidgetItem()
+                cell.setFlags(QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled |
+                              QtCore.Qt.ItemIsUserCheckable)
+                cell.setCheckState(QtCore.Qt.Checked if is_member(light, layer)
+                                   else QtCore.Qt.Unchecked)
+                self.table.setItem(row, column, cell)
+
+        self.table.blockSignals(False)
+
+    def cell_info(self, cell):
+        """
+        Translate a table cell into its light, layer and check state.
+        :param cell: QTableWidgetItem of the grid
+        :return: Tuple of (light name, layer name, boolean state)
+        """
+        return (self.lights[cell.row()], self.layers[cell.column()],
+                cell.checkState() == QtCore.Qt.Checked)
+
+    def set_selected_cells(self, state):
+        """
+        Check or uncheck every selected cell of the grid.
+        :param state: True to check, False to uncheck
+        :return: None
+        """
+        check_state = QtCore.Qt.Checked if state else QtCore.Qt.Unchecked
+
+        for cell in self.table.selectedItems():
+            cell.setCheckState(check_state)
+
+    def update_pending_label(self, count):
+        """
+        :param count: Number of uncommitted membership changes
+        :return: None
+        """
+        self.pending_label.setText('%d pending change(s)' % count)
+
+
+class SpatialSelectDialog(LightInterfaceDialog):
+    """
+    Dialog that selects lights by their position: around or inside the
+    bounds of the current selection, or inside a camera's view.
+    """
+
+    def __init__(self, parent=None):
+        """
+        :param parent: Window that will parent this dialog
+        :return: None
+        """
+        super(SpatialSelectDialog, self).__init__(parent)
+
+        self.radius_spinbox = QDoubleSpinBox()
+        self.radius_spinbox.setRange(0.0, 1000000.0)
+        self.radius_spinbox.setValue(10.0)
+        self.radius_spinbox.setStyleSheet(INPUT_STYLE)
+
+        self.near_button = self.new_button('Near Selection')
+        self.bounds_button = self.new_button('Inside Selection Bounds')
+
+        self.camera_combo = QComboBox()
+        self.camera_combo.setStyleSheet(BUTTON_STYLE)
+        self.camera_button = self.new_button('Visible From Camera')
+
+        self.status_label = self.new_label('')
+
+        radius_layout = QHBoxLayout()
+        radius_layout.addWidget(self.new_label('Radius / Padding:'))
+        radius_layout.addWidget(self.radius_spinbox)
+
+        selection_layout = QHBoxLayout()
+        selection_layout.addWidget(self.near_button)
+        selection_layout.addWidget(self.bounds_button)
+
+        camera_layout = QHBoxLayout()
+        camera_layout.addWidget(self.camera_combo, 1)
+        camera_layout.addWidget(self.camera_button)
+
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(radius_layout)
+        main_layout.addLayout(selection_layout)
+        main_layout.addLayout(camera_layout)
+        main_layout.addWidget(self.status_label)
+        self.setLayout(main_layout)
+
+        self.setWindowTitle('Spatial Selection')
+        self.setObjectName('lightInterfaceSpatialSelect')
+
+    def set_cameras(self, cameras):
+        """
+        :param cameras: Array of camera Transform names to choose from
+        :return: None
+        """
+        current = self.camera_combo.currentText()
+
+        self.camera_combo.clear()
+        self.camera_combo.addItems(cameras)
+
+        if current in cameras:
+            self.camera_combo.setCurrentIndex(cameras.index(current))
+
+    def set_status(self, count):
+        """
+        :param count: Number of lights selected by the latest query
+        :return: None
+        """
+        self.status_label.setText('%d light(s) selected' % count)
+
+
+class ContributionDialog(LightInterfaceDialog):
+    """
+    Dialog that ranks lights by their estimated contribution over a cloud of
+    sample points, and applies changes to the ranked lights.
+    """
+
+    def __init__(self, parent=None):
+        """
+        :param parent: Window that will parent this dialog
+        :return: None
+        """
+        super(ContributionDialog, self).__init__(parent)
+
+        self.points_button = self.new_button('Use Selection as Sample Points')
+        self.points_label = self.new_label('No sample points')
+        self.analyze_button = self.new_button('Rank Listed Lights')
+
+        self.table = QTableWidget(0, 4, self)
+        self.table.setHorizontalHeaderLabels(['Light', 'Type', 'Contribution', 'Share %'])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setStyleSheet(INPUT_STYLE)
+
+        self.threshold_spinbox = QDoubleSpinBox()
+        self.threshold_spinbox.setRange(0.0, 100.0)
+        self.threshold_spinbox.setValue(1.0)
+        self.threshold_spinbox.setSuffix(' %')
+        self.threshold_spinbox.setStyleSheet(INPUT_STYLE)
+        self.below_button = self.new_button('Pick Rows Below Share')
+
+        self.select_button = self.new_button('Select Lights')
+        self.intensity_button = self.new_button('Apply Window Intensity Change')
+        self.disable_button = self.new_button('Disable Lights')
+
+        self.connect(self.below_button, QtCore.SIGNAL('clicked()'), self.pick_rows_below)
+
+        points_layout = QHBoxLayout()
+        points_layout.addWidget(self.points_button)
+        points_layout.addWidget(self.points_label)
+        points_layout.addStretch(1)
+        points_layout.addWidget(self.analyze_button)
+
+        threshold_layout = QHBoxLayout()
+        threshold_layout.addWidget(self.threshold_spinbox)
+        threshold_layout.addWidget(self.below_button)
+        threshold_layout.addStretch(1)
+
+        actions_layout = QHBoxLayout()
+        actions_layout.addWidget(self.select_button)
+        actions_layout.addWidget(self.intensity_button)
+        actions_layout.addWidget(self.disable_button)
+
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(points_layout)
+        main_layout.addWidget(self.table)
+        main_layout.addLayout(threshold_layout)
+        main_layout.addLayout(actions_layout)
+        self.setLayout(main_layout)
+
+        self.resize(600, 500)
+        self.setWindowTitle('Light Contribution')
+        self.setObjectName('lightInterfaceContribution')
+
+    def populate(self, rows):
+        """
+        Fill the ranking table
+        :param rows: Array of (light name, light type, contribution, share percentage), most contributing first
+        :return: None
+        """
+        self.table.setRowCount(len(rows))
+
+        for row, (name, light_type, contribution, share) in enumerate(rows):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            self.table.setItem(row, 1, QTableWidgetItem(light_type))
+            self.table.setItem(row, 2, QTableWidgetItem('%.4g' % contribution))
+            self.table.setItem(row, 3, QTableWidgetItem('%.2f' % share))
+
+    def pick_rows_below(self):
+        """
+        Select the table rows whose share is below the threshold, as culling candidates
+        :return: None
+        """
+        threshold = self.threshold_spinbox.value()
+        model = self.table.model()
+        last_column = self.table.columnCount() - 1
+
+        # selectRow() replaces the selection, so every row goes in a single selection
+        selection = QItemSelection()
+        for row in range(self.table.rowCount()):
+            if float(self.table.item(row, 3).text()) < threshold:
+                selection.select(model.index(row, 0), model.index(row, last_column))
+
+        self.table.selectionModel().select(selection,
+                                           QItemSelectionModel.ClearAndSelect |
+                                           QItemSelectionModel.Rows)
+
+    def selected_names(self):
+        """
+        :return: List with the light names of the selected table rows
+        """
+        rows = sorted(set(index.row() for index in self.table.selectedIndexes()))
+        return [self.table.item(row, 0).text() for row in rows]
+
+    def set_point_count(self, count):
+        """
+        :param count: Number of sample points in use
+        :return: None
+        """
+        self.points_label.setText('%d sample point(s)' % count)
+
+
+class ExposureDialog(LightInterfaceDialog):
+    """
+    Dialog that balances the intensities of several lights in exposure stops,
+    previewing the new values before committing them.
+    """
+
+    def __init__(self, parent=None):
+        """
+        :param parent: Window that will parent this dialog
+        :return: None
+        """
+        super(ExposureDialog, self).__init__(parent)
+
+        # Items in the same order as the exposure module's balancing modes
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem('Normalize total exposure to')
+        self.mode_combo.addItem('Normalize mean exposure to')
+        self.mode_combo.addItem('Stops from reference light')
+        self.mode_combo.setStyleSheet(BUTTON_STYLE)
+
+        self.target_spinbox = QDoubleSpinBox()
+        self.target_spinbox.setRange(-32.0, 32.0)
+        self.target_spinbox.setSingleStep(0.5)
+        self.target_spinbox.setSuffix(' EV')
+        self.target_spinbox.setStyleSheet(INPUT_STYLE)
+
+        self.reference_combo = QComboBox()
+        self.reference_combo.setStyleSheet(BUTTON_STYLE)
+
+        self.preview_button = self.new_button('Preview')
+        self.commit_button = self.new_button('Commit')
+        self.commit_button.setEnabled(False)
+
+        self.table = QTableWidget(0, 6, self)
+        self.table.setHorizontalHeaderLabels(['Light', 'Intensity', 'EV', 'New Intensity', 'New EV', 'Stops'])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setStyleSheet(INPUT_STYLE)
+
+        mode_layout = QHBoxLayout()
+        mode_layout.addWidget(self.mode_combo)
+        mode_layout.addWidget(self.target_spinbox)
+        mode_layout.addStretch(1)
+
+        reference_layout = QHBoxLayout()
+        reference_layout.addWidget(self.new_label('Reference light:'))
+        reference_layout.addWidget(self.reference_combo, 1)
+
+        actions_layout = QHBoxLayout()
+        actions_layout.addStretch(1)
+        actions_layout.addWidget(self.preview_button)
+        actions_layout.addWidget(self.commit_button)
+
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(mode_layout)
+        main_layout.addLayout(reference_layout)
+        main_layout.addWidget(self.table)
+        main_layout.addLayout(actions_layout)
+        self.setLayout(main_layout)
+
+        # Any change of the settings makes the previewed values stale
+        self.connect(self.mode_combo, QtCore.SIGNAL('currentIndexChanged(int)'), self.invalidate)
+        self.connect(self.target_spinbox, QtCore.SIGNAL('valueChanged(double)'), self.invalidate)
+        self.connect(self.reference_combo, QtCore.SIGNAL('currentIndexChanged(int)'), self.invalidate)
+
+        self.resize(600, 450)
+        self.setWindowTitle('Exposure Balance')
+        self.setObjectName('lightInterfaceExposure')
+
+    def set_lights(self, names):
+        """
+        Set the lights to balance, which are also the reference light candidates
+        :param names: Array of light names
+        :return: None
+        """
+        self.reference_combo.clear()
+        self.reference_combo.addItems(names)
+        self.table.setRowCount(0)
+        self.invalidate()
+
+    def populate(self, rows):
+        """
+        Fill the preview table, and allow committing it
+        :param rows: Array of (name, intensity, EV, new intensity, new EV, stops changed) tuples
+        :return: None
+        """
+        def stop_text(value):
+            return '-' if value is None else '%+.2f' % value
+
+        self.table.setRowCount(len(rows))
+
+        for row, (name, intensity, stops, new_intensity, new_stops, change) in enumerate(rows):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            self.table.setItem(row, 1, QTableWidgetItem('%.4g' % intensity))
+            self.table.setItem(row, 2, QTableWidgetItem(stop_text(stops)))
+            self.table.setItem(row, 3, QTableWidgetItem('%.4g' % new_intensity))
+            self.table.setItem(row, 4, QTableWidgetItem(stop_text(new_stops)))
+            self.table.setItem(row, 5, QTableWidgetItem(stop_text(change)))
+
+        self.commit_button.setEnabled(bool(rows))
+
+    def invalidate(self, *_):
+        """
+        Forbid committing until the preview is computed again
+        :return: None
+        """
+        self.commit_button.setEnabled(False)
+
+
+class RigDiffDialog(LightInterfaceDialog):
+    """
+    Dialog that lists the differences between a light rig snapshot and the scene,
+    and lets the snapshot's values be applied back on the checked rows.
+    """
+
+    def __init__(self, parent=None):
+        """
+        :param parent: Window that will parent this dialog
+        :return: None
+        """
+        super(RigDiffDialog, self).__init__(parent)
+
+        self.summary_label = self.new_label('No differences')
+
+        self.table = QTableWidget(0, 5, self)
+        self.table.setHorizontalHeaderLabels(['Light', 'Change', 'Attribute', 'Snapshot', 'Scene'])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setStyleSheet(INPUT_STYLE)
+
+        self.checkall_button = self.new_button('Check All')
+        self.uncheckall_button = self.new_button('Uncheck All')
+        self.apply_button = self.new_button('Apply Snapshot Values on Checked Rows')
+
+        self.connect(self.checkall_button, QtCore.SIGNAL('clicked()'), lambda: self.set_all_checked(True))
+        self.connect(self.uncheckall_button, QtCore.SIGNAL('clicked()'), lambda: self.set_all_checked(False))
+
+        actions_layout = QHBoxLayout()
+        actions_layout.addWidget(self.checkall_button)
+        actions_layout.addWidget(self.uncheckall_button)
+        actions_layout.addStretch(1)
+        actions_layout.addWidget(self.apply_button)
+
+        main_layout = QVBoxLayout()
+        main_layout.addWidget(self.summary_label)
+        main_layout.addWidget(self.table)
+        main_layout.addLayout(actions_layout)
+        self.setLayout(main_layout)
+
+        self.resize(700, 500)
+        self.setWindowTitle('Light Rig Differences')
+        self.setObjectName('lightInterfaceRigDiff')
+
+    def populate(self, rows, summary):
+        """
+        Fill the differences table. Only the rows that can be applied get a checkbox.
+        :param rows: Array of (light name, change, field, snapshot value, scene value, applicable) tuples
+        :param summary: Text shown above the table
+        :return: None
+        """
+        self.summary_label.setText(summary)
+        self.table.setRowCount(len(rows))
+
+        for row, (name, change, field, snapshot_value, scene_value, applicable) in enumerate(rows):
+            name_item = QTableWidgetItem(name)
+
+            if applicable:
+                name_item.setFlags(name_item.flags() | QtCore.Qt.ItemIsUserCheckable)
+                name_item.setCheckState(QtCore.Qt.Unchecked)
+
+            # The field is kept in the item, as the Attribute column is only for display
+            name_item.setData(QtCore.Qt.UserRole, field)
+
+            self.table.setItem(row, 0, name_item)
+            self.table.setItem(row, 1, QTableWidgetItem(change))
+            self.table.setItem(row, 2, QTableWidgetItem(field))
+            self.table.setItem(row, 3, QTableWidgetItem(snapshot_value))
+            self.table.setItem(row, 4, QTableWidgetItem(scene_value))
+
+    def set_all_checked(self, state):
+        """
+        :param state: True to check every row that can be applied, False to uncheck them
+        :return: None
+        """
+        for row in range(self.table.rowCount()):
+            item = self.table.item(row, 0)
+
+            if item.flags() & QtCore.Qt.ItemIsUserCheckable:
+                item.setCheckState(QtCore.Qt.Checked if state else QtCore.Qt.Unchecked)
+
+    def checked_changes(self):
+        """
+        :return: List of (light name, field) tuples of the checked rows
+        """
+        changes = []
+
+        for row in range(self.table.rowCount()):
+            item = self.table.item(row, 0)
+
+            if item.flags() & QtCore.Qt.ItemIsUserCheckable and item.checkState() == QtCore.Qt.Checked:
+                changes.append((item.text(), item.data(QtCore.Qt.UserRole)))
+
+        return changes
+
+
+class BrushChart(QWidget):
+    """
+    Base class of the distribution charts. Maps values to pixels, and emits
+    'brushed(double,double,double,double)' with the x and y value ranges of the
+    rectangle dragged over it.
+    """
+
+    # Pixels kept free around the plotting area
+    MARGIN = 24
+
+    def __init__(self, parent=None):
+        """
+        :param parent: Widget parent of this chart
+        :return: None
+        """
+        super(BrushChart, self).__init__(parent)
+
+        # Value ranges shown along each axis
+        self.x_range = (0.0, 1.0)
+        self.y_range = (0.0, 1.0)
+
+        # Pixel corners of the rectangle being dragged, or None
+        self.brush_start = None
+        self.brush_end = None
+
+        self.setMinimumSize(300, 180)
+
+    def plot_rect(self):
+        """
+        :return: QRectF of the plotting area
+        """
+        return QtCore.QRectF(self.MARGIN, self.MARGIN / 2.0,
+                             max(self.width() - self.MARGIN * 1.5, 1),
+                             max(self.height() - self.MARGIN * 1.5, 1))
+
+    def to_pixel(self, x, y):
+        """
+        :param x: Value along the x axis
+        :param y: Value along the y axis
+        :return: QPointF inside the plotting area
+        """
+        rect = self.plot_rect()
+        x_span = (self.x_range[1] - self.x_range[0]) or 1.0
+        y_span = (self.y_range[1] - self.y_range[0]) or 1.0
+
+        return QtCore.QPointF(rect.left() + (x - self.x_range[0]) / x_span * rect.width(),
+                              rect.bottom() - (y - self.y_range[0]) / y_span * rect.height())
+
+    def to_value(self, point):
+        """
+        :param point: QPoint in widget coordinates
+        :return: (x, y) values at that point
+        """
+        rect = self.plot_rect()
+
+        return (self.x_range[0] + (point.x() - rect.left()) / rect.width() * (self.x_range[1] - self.x_range[0]),
+                self.y_range[0] + (rect.bottom() - point.y()) / rect.height() * (self.y_range[1] - self.y_range[0]))
+
+    def paint_frame(self, painter, x_label, y_label):
+        """
+        Paint the background, the axes' labels and their value ranges
+        :param painter: Active QPainter
+        :param x_label: Name of the x axis
+        :param y_label: Name of the y axis
+        :return: None
+        """
+        rect = self.plot_rect()
+
+        painter.fillRect(self.rect(), QColor(46, 46, 46))
+        painter.fillRect(rect, QColor(62, 62, 62))
+
+        painter.setPen(QColor(204, 204, 204))
+        painter.drawText(QtCore.QRectF(rect.left(), rect.bottom(), rect.width(), self.MARGIN),
+                         QtCore.Qt.AlignCenter, '%s  %.3g .. %.3g' % (x_label, self.x_range[0], self.x_range[1]))
+
+        painter.save()
+        painter.translate(0, rect.bottom())
+        painter.rotate(-90)
+        painter.drawText(QtCore.QRectF(0, 0, rect.height(), self.MARGIN),
+                         QtCore.Qt.AlignCenter, '%s  %.3g .. %.3g' % (y_label, self.y_range[0], self.y_range[1]))
+        painter.restore()
+
+    def paint_brush(self, painter):
+        """
+        Paint the rectangle being dragged, if any
+        :param painter: Active QPainter
+        :return: None
+        """
+        if self.brush_start is None:
+            return
+
+        painter.setPen(QColor(24, 148, 196))
+        painter.setBrush(QColor(24, 148, 196, 60))
+        painter.drawRect(QtCore.QRect(self.brush_start, self.brush_end).normalized())
+
+    def mousePressEvent(self, event):
+        self.brush_start = event.pos()
+        self.brush_end = event.pos()
+        self.update()
+
+    def mouseMoveEvent(self, event):
+        if self.brush_start is not None:
+            self.brush_end = event.pos()
+            self.update()
+
+    def mouseReleaseEvent(self, event):
+        if self.brush_start is None:
+            return
+
+        start_x, start_y = self.to_value(self.brush_start)
+        end_x, end_y = self.to_value(event.pos())
+
+        self.brush_start = None
+        self.brush_end = None
+        self.update()
+
+        self.emit(QtCore.SIGNAL('brushed(double,double,double,double)'),
+                  min(start_x, end_x), max(start_x, end_x), min(start_y, end_y), max(start_y, end_y))
+
+
+class HistogramChart(BrushChart):
+    """
+    Bar chart of how many lights fall in each intensity range.
+    """
+
+    def __init__(self, parent=None):
+        """
+        :param parent: Widget parent of this chart
+        :return: None
+        """
+        super(HistogramChart, self).__init__(parent)
+
+        self.counts = []
+        self.edges = []
+        self.x_label = 'Intensity'
+
+    def set_data(self, counts, edges, x_label):
+        """
+        :param counts: Array with the number of lights of each bar
+        :param edges: Array of len(counts) + 1 bar edges
+        :param x_label: Name of the x axis
+        :return: None
+        """
+        self.counts = counts
+        self.edges = edges
+        self.x_label = x_label
+
+        if edges:
+            self.x_range = (edges[0], edges[-1])
+            self.y_range = (0.0, float(max(counts)) or 1.0)
+
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        self.paint_frame(painter, self.x_label, 'Lights')
+
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(QColor(204, 204, 204))
+
+        for index, count in enumerate(self.counts):
+            if count:
+                painter.drawRect(QtCore.QRectF(self.to_pixel(self.edges[index], count),
+                                               self.to_pixel(self.edges[index + 1], 0)).normalized())
+
+        self.paint_brush(painter)
+        painter.end()
+
+
+class ScatterChart(BrushChart):
+    """
+    Scatter plot of the hue and value of the lights' colors, each point painted with its light's color.
+    """
+
+    def __init__(self, parent=None):
+        """
+        :param parent: Widget parent of this chart
+        :return: None
+        """
+        super(ScatterChart, self).__init__(parent)
+
+        # Lists of (x, y) points and QColors
+        self.points = []
+        self.colors = []
+
+    def set_data(self, points, colors):
+        """
+        :param points: Array of (hue, value) tuples
+        :param colors: Array of (r, g, b) floats, one per point
+        :return: None
+        """
+        self.points = points
+        self.colors = [QColor.fromRgbF(*[min(max(channel, 0.0), 1.0) for channel in color])
+                       for color in colors]
+
+        self.x_range = (0.0, 1.0)
+        self.y_range = (0.0, max([y for _, y in points] + [1.0]))
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        self.paint_frame(painter, 'Hue', 'Value')
+
+        for (x, y), color in zip(self.points, self.colors):
+            painter.setPen(color)
+            painter.drawEllipse(self.to_pixel(x, y), 2, 2)
+
+        self.paint_brush(painter)
+        painter.end()
+
+
+class DistributionDialog(LightInterfaceDialog):
+    """
+    Dialog with the intensity histogram and the hue/value scatter of the lights.
+    Dragging a rectangle over either chart selects the lights inside it.
+    """
+
+    def __init__(self, parent=None):
+        """
+        :param parent: Window that will parent this dialog
+        :return: None
+        """
+        super(DistributionDialog, self).__init__(parent)
+
+        self.scope_combo = QComboBox()
+        self.scope_combo.addItem('Listed Lights')
+        self.scope_combo.addItem('Selected Lights')
+        self.scope_combo.setStyleSheet(BUTTON_STYLE)
+
+        self.stops_checkbox = QCheckBox('Intensity in Stops (EV)')
+        self.stops_checkbox.setStyleSheet(LABEL_STYLE)
+
+        self.refresh_button = self.new_button('Refresh')
+
+        self.summary_label = self.new_label('')
+
+        self.histogram = HistogramChart(self)
+        self.scatter = ScatterChart(self)
+
+        options_layout = QHBoxLayout()
+        options_layout.addWidget(self.scope_combo)
+        options_layout.addWidget(self.stops_checkbox)
+        options_layout.addStretch(1)
+        options_layout.addWidget(self.refresh_button)
+
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(options_layout)
+        main_layout.addWidget(self.histogram, 1)
+        main_layout.addWidget(self.scatter, 1)
+        main_layout.addWidget(self.summary_label)
+        self.setLayout(main_layout)
+
+        self.resize(550, 600)
+        self.setWindowTitle('Light Distribution')
+        self.setObjectName('lightInterfaceDistribution')
+
+    def set_summary(self, text):
+        """
+        :param text: Text shown under the charts
+        :return: None
+        """
+        self.summary_label.setText(text)
+
+
+class LightGroupsDialog(LightInterfaceDialog):
+    """
+    Dialog that lists the scene's light groups, edits their members and applies
+    the window's intensity, color and shadow changes to a whole group.
+    """
+
+    def __init__(self, parent=None):
+        """
+        :param parent: Window that will parent this dialog
+        :return: None
+        """
+        super(LightGroupsDialog, self).__init__(parent)
+
+        self.table = QTableWidget(0, 2, self)
+        self.table.setHorizontalHeaderLabels(['Group', 'Lights'])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setStyleSheet(INPUT_STYLE)
+
+        self.name_textbox = QLineEdit()
+        self.name_textbox.setStyleSheet(INPUT_STYLE)
+        self.create_button = self.new_button('New Group from Selected Lights')
+
+        self.add_button = self.new_button('Add Selected Lights')
+        self.remove_button = self.new_button('Remove Selected Lights')
+        self.delete_button = self.new_button('Delete Group')
+
+        self.select_button = self.new_button('Select Lights')
+        self.intensity_button = self.new_button('Apply Intensity')
+        self.color_button = self.new_button('Apply Color')
+        self.shadow_button = self.new_button('Apply Shadow')
+        self.keyframe_button = self.new_button('Set Keyframe')
+
+        create_layout = QHBoxLayout()
+        create_layout.addWidget(self.name_textbox)
+        create_layout.addWidget(self.create_button)
+
+        members_layout = QHBoxLayout()
+        members_layout.addWidget(self.add_button)
+        members_layout.addWidget(self.remove_button)
+        members_layout.addWidget(self.delete_button)
+
+        actions_layout = QHBoxLayout()
+        actions_layout.addWidget(self.select_button)
+        actions_layout.addWidget(self.intensity_button)
+        actions_layout.addWidget(self.color_button)
+        actions_layout.addWidget(self.shadow_button)
+        actions_layout.addWidget(self.keyframe_button)
+
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(create_layout)
+        main_layout.addWidget(self.table)
+        main_layout.addLayout(members_layout)
+        main_layout.addLayout(actions_layout)
+        self.setLayout(main_layout)
+
+        self.resize(550, 400)
+        self.setWindowTitle('Light Groups')
+        self.setObjectName('lightInterfaceGroups')
+
+    def populate(self, groups):
+        """
+        Fill the groups table, keeping the current group selected if it still exists
+        :param groups: Array of (group name, number of lights) tuples
+        :return: None
+        """
+        current = self.current_group()
+        self.table.setRowCount(len(groups))
+
+        for row, (name, count) in enumerate(groups):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            self.table.setItem(row, 1, QTableWidgetItem(str(count)))
+
+            if name == current:
+                self.table.selectRow(row)
+
+    def current_group(self):
+        """
+        :return: Name of the selected group, or None
+        """
+        rows = self.table.selectionModel().selectedRows() if self.table.selectionModel() else []
+
+        if not rows:
+            return None
+
+        return self.table.item(rows[0].row(), 0).text()
+
+
+class BulkCreateDialog(LightInterfaceDialog):
+    """
+    Dialog that creates many copies of a template light, on a grid
+    or at the positions of the selected objects.
+    """
+
+    def __init__(self, parent=None):
+        """
+        :param parent: Window that will parent this dialog
+        :return: None
+        """
+        super(BulkCreateDialog, self).__init__(parent)
+
+        def new_spinbox(value):
+            spinbox = QSpinBox()
+            spinbox.setRange(1, 1000)
+            spinbox.setValue(value)
+            spinbox.setStyleSheet(INPUT_STYLE)
+            return spinbox
+
+        self.template_label = self.new_label('')
+
+        self.type_combo = QComboBox()
+        self.type_combo.setStyleSheet(BUTTON_STYLE)
+        self.type_combo.addItem('Same as Template', None)
+        for light_type, label in FILTER_TYPES:
+            self.type_combo.addItem(label, light_type)
+
+        self.columns_spinbox = new_spinbox(10)
+        self.rows_spinbox = new_spinbox(10)
+        self.layers_spinbox = new_spinbox(1)
+
+        self.spacing_spinbox = QDoubleSpinBox()
+        self.spacing_spinbox.setRange(0.0, 1000000.0)
+        self.spacing_spinbox.setValue(5.0)
+        self.spacing_spinbox.setStyleSheet(INPUT_STYLE)
+
+        self.grid_button = self.new_button('Create Grid')
+        self.selection_button = self.new_button('Create at Selected Objects')
+
+        self.status_label = self.new_label('')
+
+        type_layout = QHBoxLayout()
+        type_layout.addWidget(self.new_label('Light Type:'))
+        type_layout.addWidget(self.type_combo, 1)
+
+        grid_layout = QHBoxLayout()
+        grid_layout.addWidget(self.new_label('Grid:'))
+        grid_layout.addWidget(self.columns_spinbox)
+        grid_layout.addWidget(self.new_label('x'))
+        grid_layout.addWidget(self.rows_spinbox)
+        grid_layout.addWidget(self.new_label('x'))
+        grid_layout.addWidget(self.layers_spinbox)
+        grid_layout.addWidget(self.new_label('Spacing:'))
+        grid_layout.addWidget(self.spacing_spinbox)
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(self.grid_button)
+        buttons_layout.addWidget(self.selection_button)
+
+        main_layout = QVBoxLayout()
+        main_layout.addWidget(self.template_label)
+        main_layout.addLayout(type_layout)
+        main_layout.addLayout(grid_layout)
+        main_layout.addLayout(buttons_layout)
+        main_layout.addWidget(self.status_label)
+        self.setLayout(main_layout)
+
+        self.setWindowTitle('Bulk Create from Template')
+        self.setObjectName('lightInterfaceBulkCreate')
+
+    def set_template(self, name):
+        """
+        :param name: Transform name of the template light, or None
+        :return: None
+        """
+        self.template_label.setText('Template: %s' % (name or 'select a light in the list'))
+
+    def light_type(self):
+        """
+        :return: Light type chosen in the combobox, or None to use the template's
+        """
+        return self.type_combo.itemData(self.type_combo.currentIndex())
+
+    def grid_translations(self):
+        """
+        :return: List of (x, y, z) positions of the grid, centered on the origin
+        """
+        spacing = self.spacing_spinbox.value()
+        counts = (self.columns_spinbox.value(), self.layers_spinbox.value(), self.rows_spinbox.value())
+        offsets = [(count - 1) * spacing / 2.0 for count in counts]
+
+        return [(x * spacing - offsets[0], y * spacing - offsets[1], z * spacing - offsets[2])
+                for y in range(counts[1])
+                for z in range(counts[2])
+                for x in range(counts[0])]
+
+    def set_status(self, count):
+        """
+        :param count: Number of lights created by the latest click
+        :return: None
+        """
+        self.status_label.setText('Created %d light(s)' % count)
+
+
+class LintDialog(LightInterfaceDialog):
+    """
+    Dialog that lists the issues found by the light rig checks, and fixes the checked rows in batches.
+    """
+
+    def __init__(self, parent=None):
+        """
+        :param parent: Window that will parent this dialog
+        :return: None
+        """
+        super(LintDialog, self).__init__(parent)
+
+        self.summary_label = self.new_label('No issues')
+
+        self.table = QTableWidget(0, 3, self)
+        self.table.setHorizontalHeaderLabels(['Light', 'Check', 'Detail'])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setStyleSheet(INPUT_STYLE)
+
+        self.run_button = self.new_button('Run Checks')
+        self.select_button = self.new_button('Select Lights')
+        self.checkall_button = self.new_button('Check All')
+        self.uncheckall_button = self.new_button('Uncheck All')
+        self.fix_button = self.new_button('Fix Checked Rows')
+
+        self.connect(self.checkall_button, QtCore.SIGNAL('clicked()'), lambda: self.set_all_checked(True))
+        self.connect(self.uncheckall_button, QtCore.SIGNAL('clicked()'), lambda: self.set_all_checked(False))
+
+        actions_layout = QHBoxLayout()
+        actions_layout.addWidget(self.run_button)
+        actions_layout.addWidget(self.select_button)
+        actions_layout.addStretch(1)
+        actions_layout.addWidget(self.checkall_button)
+        actions_layout.addWidget(self.uncheckall_button)
+        actions_layout.addWidget(self.fix_button)
+
+        main_layout = QVBoxLayout()
+        main_layout.addWidget(self.summary_label)
+        main_layout.addWidget(self.table)
+        main_layout.addLayout(actions_layout)
+        self.setLayout(main_layout)
+
+        self.resize(650, 500)
+        self.setWindowTitle('Light Rig Checks')
+        self.setObjectName('lightInterfaceLint')
+
+    def populate(self, rows, summary):
+        """
+        Fill the issues table. Only the rows that can be fixed get a checkbox, checked.
+        :param rows: Array of (light name, check, check label, detail text, fixable) tuples
+        :param summary: Text shown above the table
+        :return: None
+        """
+        self.summary_label.setText(summary)
+        self.table.setRowCount(len(rows))
+
+        for row, (name, check, label, detail, fixable) in enumerate(rows):
+            name_item = QTableWidgetItem(name)
+
+            if fixable:
+                name_item.setFlags(name_item.flags() | QtCore.Qt.ItemIsUserCheckable)
+                name_item.setCheckState(QtCore.Qt.Checked)
+
+            # The check is kept in the item, as the Check column shows its label
+            name_item.setData(QtCore.Qt.UserRole, check)
+
+            self.table.setItem(row, 0, name_item)
+            self.table.setItem(row, 1, QTableWidgetItem(label))
+            self.table.setItem(row, 2, QTableWidgetItem(detail))
+
+    def set_all_checked(self, state):
+        """
+        :param state: True to check every row that can be fixed, False to uncheck them
+        :return: None
+        """
+        for row in range(self.table.rowCount()):
+            item = self.table.item(row, 0)
+
+            if item.flags() & QtCore.Qt.ItemIsUserCheckable:
+                item.setCheckState(QtCore.Qt.Checked if state else QtCore.Qt.Unchecked)
+
+    def checked_issues(self):
+        """
+        :return: Set of (check, light name) tuples of the checked rows
+        """
+        issues = set()
+
+        for row in range(self.table.rowCount()):
+            item = self.table.item(row, 0)
+
+            if item.flags() & QtCore.Qt.ItemIsUserCheckable and item.checkState() == QtCore.Qt.Checked:
+                issues.add((item.data(QtCore.Qt.UserRole), item.text()))
+
+        return issues
+
+    def selected_lights(self):
+        """
+        :return: List of the light names of the selected rows, without repetitions
+        """
+        rows = sorted(set(index.row() for index in self.table.selectionModel().selectedRows()))
+        names = [self.table.item(row, 0).text() for row in rows]
+
+        return sorted(set(names), key=names.index)
+
+
 def main():
     """
     Test function for PySide only window template
@@ -0,0 +1,128 @@
+__author__ = 'Carlos Montes'
+
+''' Cached Render Layer membership index, with membership edits committed in batches per layer. '''
+
+import maya.cmds as cmds
+
+
+class RenderLayerMembership(object):
+    """
+    Keeps the members of every non-default Render Layer in memory, and accumulates
+    membership edits so they can be sent to Maya grouped per layer.
+    """
+
+    def __init__(self):
+        """
+        :return: None
+        """
+        # Names of the Render Layers whose membership can be edited
+        self.layers = []
+
+        # Dictionary of Render Layer name -> set of member names, as of the last refresh or commit
+        self.members = {}
+
+        # Dictionary of Render Layer name -> {light name: True to add, False to remove}
+        self.pending = {}
+
+    def refresh(self):
+        """
+        Query Maya for every Render Layer and its members, discarding any pending edit.
+        :return: None
+        """
+        self.layers = [layer for layer in cmds.ls(type='renderLayer')
+                       if not layer.endswith('defaultRenderLayer')]
+
+        self.members = {}
+        for layer in self.layers:
+            self.members[layer] = set(cmds.editRenderLayerMembers(layer, query=True) or [])
+
+        self.pending = {}
+
+    def is_member(self, light, layer):
+        """
+        Tells whether a light is a member of a Render Layer, pending edits included.
+        :param light: Transform node name of the light
+        :param layer: Render Layer name
+        :return: Boolean
+        """
+        edits = self.pending.get(layer)
+        if edits is not None and light in edits:
+            return edits[light]
+
+        return light in self.members.get(layer, ())
+
+    def set_member(self, light, layer, state):
+        """
+        Stores a membership edit, without sending it to Maya yet. Setting a light back
+        to its cached membership cancels the edit.
+        :param light: Transform node name of the light
+        :param layer: Render Layer name
+        :param state: True to add the light to the layer, False to remove it
+        :return: None
+        """
+        edits = self.pending.setdefault(layer, {})
+
+        if state == (light in self.members.get(layer, ())):
+            edits.pop(light, None)
+        else:
+            edits[light] = state
+
+        if not edits:
+            del self.pending[layer]
+
+    def pending_count(self):
+        """
+        :return: Number of membership edits that haven't been committed
+        """
+        return sum(len(edits) for edits in self.pending.values())
+
+    def discard(self):
+        """
+        Forget every pending membership edit.
+        :return: None
+        """
+        self.pending = {}
+
+    def commit(self):
+        """
+        Send the pending edits to Maya, with at most one editRenderLayerMembers call
+        to add and one to remove for each edited Render Layer.
+        :return: Number of editRenderLayerMembers calls made
+        """
+        calls = 0
+
+        for layer, edits in self.pending.items():
+            added = [light for light, state in edits.items() if state]
+            removed = [light for light, state in edits.items() if not state]
+
+            if added:
+                self.edit_members(layer, added, True)
+                calls += 1
+
+            if removed:
+                self.edit_members(layer, removed, False)
+                calls += 1
+
+        self.pending = {}
+        return calls
+
+    def edit_members(self, layer, lights, state):
+        """
+        Add or remove lights from a Render Layer right away, with a single
+        editRenderLayerMembers call, and keep the cached members up to date.
+        :param layer: Render Layer name
+        :param lights: Array of light Transform node names
+        :param state: True to add the lights, False to remove them
+        :return: None
+        """
+        if not lights:
+            return
+
+        members = self.members.setdefault(layer, set())
+
+        if state:
+            cmds.editRenderLayerMembers(layer, lights)
+            members.update(lights)
+        else:
+            cmds.editRenderLayerMembers(layer, lights, remove=True)
+            members.difference_update(lights)
@@ -0,0 +1,289 @@
+__author__ = 'Carlos Montes'
+
+''' Snapshots of a scene's light rig, and differences between two snapshots. '''
+
+import json
+
+import maya.cmds as cmds
+
+import MayaSceneLights_applyChanges as applyChanges
+import MayaSceneLights_curveOptimizer as curveOptimizer
+
+
+# Attributes compared for every light, in the order the differences are reported
+FIELDS = ('type', 'intensity', 'color', 'shadowColor', 'keys', 'layers')
+
+# Fields that apply_differences() can set back on a light
+APPLICABLE_FIELDS = ('intensity', 'color', 'shadowColor', 'keys', 'layers')
+
+# Decimals kept from every float, so evaluation noise doesn't show up as a change
+PRECISION = 6
+
+
+class RigSnapshot(object):
+    """
+    Attribute records of a set of lights, hashed so that two snapshots are compared
+    by looking only at the lights whose hash differs.
+    """
+
+    def __init__(self, records=None):
+        """
+        :param records: Dictionary of light name -> record dictionary, as returned by light_record()
+        :return: None
+        """
+        # Dictionary of light name -> record dictionary
+        self.records = {}
+
+        # Dictionary of light name -> hash of its record
+        self.hashes = {}
+
+        for name, record in (records or {}).items():
+            self.set_record(name, record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def set_record(self, name, record):
+        """
+        :param name: Light name
+        :param record: Record dictionary, as returned by light_record()
+        :return: None
+        """
+        self.records[name] = record
+        self.hashes[name] = hash(record_key(record))
+
+    def save(self, path):
+        """
+        :param path: File path of the JSON snapshot to write
+        :return: None
+        """
+        with open(path, 'w') as snapshot_file:
+            json.dump(self.records, snapshot_file, sort_keys=True)
+
+    @classmethod
+    def load(cls, path):
+        """
+        :param path: File path of a JSON snapshot written by save()
+        :return: RigSnapshot
+        """
+        with open(path) as snapshot_file:
+            return cls(json.load(snapshot_file))
+
+    @classmethod
+    def from_scene(cls, lights, layer_members):
+        """
+        :param lights: Array of light Transform node names
+        :param layer_members: Dictionary of Render Layer name -> set of member names,
+        like RenderLayerMembership.members
+        :return: RigSnapshot of the lights that exist
+        """
+        # Invert the layer membership once instead of checking every layer for every light
+        light_layers = {}
+        for layer, members in layer_members.items():
+            for member in members:
+                light_layers.setdefault(member, []).append(layer)
+
+        snapshot = cls()
+        for light in lights:
+            if cmds.objExists(light):
+                snapshot.set_record(light, light_record(light, light_layers.get(light, [])))
+
+        return snapshot
+
+
+def light_record(light, layers):
+    """
+    Reads the attributes of a light that snapshots compare.
+    :param light: Light Transform node name
+    :param layers: Array of the Render Layers the light belongs to
+    :return: Dictionary with the light's type, intensity, color, shadowColor,
+    keys (attribute -> list of keys, as returned by curve_keys()) and layers
+    """
+    shapes = cmds.listRelatives(light, shapes=True, fullPath=True) or [light]
+
+    def rounded(values):
+        return [round(value, PRECISION) for value in values]
+
+    keys = {}
+
+    # Only the animated attributes are queried for keys
+    for attribute in curveOptimizer.CURVE_ATTRIBUTES:
+        plug = '%s.%s' % (shapes[0], attribute)
+
+        if cmds.listConnections(plug, source=True, destination=False, type='animCurve'):
+            keys[attribute] = curve_keys(plug)
+
+    return {
+        'type': cmds.nodeType(shapes[0]),
+        'intensity': round(cmds.getAttr('%s.intensity' % light), PRECISION),
+        'color': rounded(cmds.getAttr('%s.color' % light)[0]),
+        'shadowColor': rounded(cmds.getAttr('%s.shadowColor' % light)[0]),
+        'keys': keys,
+        'layers': sorted(layers)
+    }
+
+
+def curve_keys(plug):
+    """
+    Reads the keys of an animated plug with their tangents, so set_keys() can rebuild the same curve.
+    :param plug: 'node.attribute' name of an animated plug
+    :return: List with one [time, value, in tangent type, out tangent type, in angle, out angle,
+    in weight, out weight, tangents locked] list per key; weights are None on curves that
+    don't have weighted tangents
+    """
+    def query(**flags):
+        return cmds.keyTangent(plug, query=True, **flags) or []
+
+    def rounded(value):
+        return round(value, PRECISION) if value is not None else None
+
+    times = cmds.keyframe(plug, query=True, timeChange=True) or []
+    values = cmds.keyframe(plug, query=True, valueChange=True) or []
+    no_weights = [None] * len(times)
+
+    weighted = (query(weightedTangents=True) or [False])[0]
+
+    return [[rounded(time), rounded(value), in_type, out_type, rounded(in_angle), rounded(out_angle),
+             rounded(in_weight), rounded(out_weight), bool(lock)]
+            for time, value, in_type, out_type, in_angle, out_angle, in_weight, out_weight, lock
+            in zip(times, values,
+                   query(inTangentType=True), query(outTangentType=True),
+                   query(inAngle=True), query(outAngle=True),
+                   query(inWeight=True) if weighted else no_weights,
+                   query(outWeight=True) if weighted else no_weights,
+                   query(lock=True))]
+
+
+def record_key(record):
+    """
+    :param record: Record dictionary, as returned by light_record()
+    :return: Hashable tuple with the same contents as the record
+    """
+    return (record['type'],
+            record['intensity'],
+            tuple(record['color']),
+            tuple(record['shadowColor']),
+            tuple((attribute, tuple(tuple(key) for key in keys))
+                  for attribute, keys in sorted(record['keys'].items())),
+            tuple(record['layers']))
+
+
+def diff(old, new):
+    """
+    Compares two snapshots of a light rig.
+    :param old: RigSnapshot
+    :param new: RigSnapshot
+    :return: Dictionary with the sorted lists of 'added' and 'removed' light names, and
+    'changed', a dictionary of light name -> list of the fields that differ
+    """
+    changed = {}
+
+    for name, new_hash in new.hashes.items():
+        old_hash = old.hashes.get(name)
+
+        # Equal hashes mean equal records; only the rest are compared field by field
+        if old_hash is None or old_hash == new_hash:
+            continue
+
+        old_record = old.records[name]
+        new_record = new.records[name]
+        fields = [field for field in FIELDS if old_record[field] != new_record[field]]
+
+        if fields:
+            changed[name] = fields
+
+    return {
+        'added': sorted(name for name in new.hashes if name not in old.hashes),
+        'removed': sorted(name for name in old.hashes if name not in new.hashes),
+        'changed': changed
+    }
+
+
+def apply_differences(snapshot, changes, layer_index):
+    """
+    Sets the values a snapshot holds for some fields back on the scene's lights.
+    Lights that share a value are changed with a single applyChanges call.
+    :param snapshot: RigSnapshot holding the values to set
+    :param changes: Array of (light name, field) tuples; fields outside APPLICABLE_FIELDS are skipped
+    :param layer_index: RenderLayerMembership used to edit the Render Layer membership
+    :return: Number of (light name, field) changes applied
+    """
+    # Dictionary of (field, value key) -> list of lights that get that value
+    batches = {}
+    applied = 0
+
+    for name, field in changes:
+        if field not in APPLICABLE_FIELDS or name not in snapshot.records or not cmds.objExists(name):
+            continue
+
+        value = snapshot.records[name][field]
+
+        if field == 'keys':
+            set_keys(name, value)
+        elif field == 'layers':
+            set_layers(name, value, layer_index)
+        else:
+            value_key = tuple(value) if isinstance(value, list) else value
+            batches.setdefault((field, value_key), []).append(name)
+
+        applied += 1
+
+    for (field, value), lights in batches.items():
+        if field == 'intensity':
+            applyChanges.change_intensity(value, 0, lights, False)
+        else:
+            applyChanges.change_color(list(value), lights, False, 1 if field == 'color' else 2)
+
+    return applied
+
+
+def set_keys(light, keys):
+    """
+    Replaces the keys of a light's intensity, color and shadow color curves, with their tangents.
+    :param light: Light Transform node name
+    :param keys: Dictionary of attribute -> list of keys, as returned by curve_keys(); keys of
+    older snapshots, [time, value] only, get Maya's default tangents
+    :return: None
+    """
+    for attribute in curveOptimizer.CURVE_ATTRIBUTES:
+        cmds.cutKey(light, attribute=attribute, clear=True)
+
+        attribute_keys = keys.get(attribute, [])
+
+        for key in attribute_keys:
+            cmds.setKeyframe(light, attribute=attribute, time=key[0], value=key[1])
+
+        tangent_keys = [key for key in attribute_keys if len(key) > 2]
+
+        if not tangent_keys:
+            continue
+
+        # Weights can only be set once the curve has weighted tangents
+        weighted = tangent_keys[0][6] is not None
+        cmds.keyTangent(light, attribute=attribute, edit=True, weightedTangents=weighted)
+
+        for time, _, in_type, out_type, in_angle, out_angle, in_weight, out_weight, lock in tangent_keys:
+            flags = {'inAngle': in_angle, 'outAngle': out_angle}
+            if weighted:
+                flags.update(inWeight=in_weight, outWeight=out_weight)
+
+            # Angles first, then the types: non-fixed types recompute the angles they were saved from
+            cmds.keyTangent(light, attribute=attribute, time=(time, time), edit=True, lock=False, **flags)
+            cmds.keyTangent(light, attribute=attribute, time=(time, time), edit=True,
+                            inTangentType=in_type, outTangentType=out_type)
+            cmds.keyTangent(light, attribute=attribute, time=(time, time), edit=True, lock=lock)
+
+
+def set_layers(light, layers, layer_index):
+    """
+    Adds or removes a light from the Render Layers so it belongs to exactly the given ones.
+    :param light: Light Transform node name
+    :param layers: Array of Render Layer names
+    :param layer_index: RenderLayerMembership, refreshed
+    :return: None
+    """
+    for layer in layer_index.layers:
+        state = layer in layers
+
+        if state != (light in layer_index.members.get(layer, ())):
+            layer_index.edit_members(layer, [light], state)
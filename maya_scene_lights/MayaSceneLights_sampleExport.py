@@ -0,0 +1,166 @@
+__author__ = 'Carlos Montes'
+
+''' Samples light attributes over a frame range in one pass and streams them to CSV or .npy files. '''
+
+import csv
+import struct
+
+import maya.OpenMaya as OpenMaya
+
+
+# Light attributes exported by default, one column per light and attribute
+EXPORT_ATTRIBUTES = ('intensity', 'colorR', 'colorG', 'colorB',
+                     'shadColorR', 'shadColorG', 'shadColorB')
+
+
+class CsvWriter(object):
+    """
+    Writes sampled rows to a CSV file as they come, with a header of column names.
+    """
+
+    def __init__(self, path, columns, row_count):
+        """
+        :param path: File path of the CSV file
+        :param columns: Array of column names
+        :param row_count: Number of rows that will be written; unused by CSV files
+        :return: None
+        """
+        self.file = open(path, 'wb')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write(self, row):
+        """
+        :param row: Array of floats
+        :return: None
+        """
+        self.writer.writerow(['%.9g' % value for value in row])
+
+    def close(self):
+        self.file.close()
+
+
+class NpyWriter(object):
+    """
+    Writes sampled rows to a NumPy .npy file of float64 as they come, without needing
+    NumPy. The column names are written to a '.columns.txt' file next to it.
+    """
+
+    def __init__(self, path, columns, row_count):
+        """
+        :param path: File path of the .npy file
+        :param columns: Array of column names
+        :param row_count: Number of rows that will be written, needed by the .npy header
+        :return: None
+        """
+        self.row_struct = struct.Struct('<%dd' % len(columns))
+
+        with open(path + '.columns.txt', 'w') as columns_file:
+            columns_file.write('\n'.join(columns) + '\n')
+
+        header = "{'descr': '<f8', 'fortran_order': False, 'shape': (%d, %d), }" % (row_count, len(columns))
+
+        # The magic string, version and header length take 10 bytes; data starts 64-byte aligned
+        padding = 64 - (10 + len(header) + 1) % 64
+        header += ' ' * (padding % 64) + '\n'
+
+        self.file = open(path, 'wb')
+        self.file.write(b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin1'))
+
+    def write(self, row):
+        """
+        :param row: Array of floats
+        :return: None
+        """
+        self.file.write(self.row_struct.pack(*row))
+
+    def close(self):
+        self.file.close()
+
+
+def frame_range(start, end, step=1.0):
+    """
+    :param start: First frame
+    :param end: Last frame, included
+    :param step: Frames between samples
+    :return: List of frames to sample
+    """
+    count = int((end - start) / float(step) + 1e-6) + 1
+    return [start + index * step for index in range(max(count, 0))]
+
+
+def light_plugs(lights, attributes=EXPORT_ATTRIBUTES):
+    """
+    Looks up the plugs to sample. Plugs that can't be found, because the light or
+    the attribute doesn't exist, are left out with a warning.
+    :param lights: Array of light Transform node names
+    :param attributes: Array of light attribute names
+    :return: Tuple of (list of 'light.attribute' column names, list of MPlugs)
+    """
+    columns = []
+    plugs = []
+    missing = []
+    selection = OpenMaya.MSelectionList()
+
+    for light in lights:
+        for attribute in attributes:
+            plug = OpenMaya.MPlug()
+            try:
+                selection.clear()
+                selection.add('%s.%s' % (light, attribute))
+                selection.getPlug(0, plug)
+            except RuntimeError:
+                missing.append('%s.%s' % (light, attribute))
+                continue
+
+            columns.append('%s.%s' % (light, attribute))
+            plugs.append(plug)
+
+    if missing:
+        OpenMaya.MGlobal.displayWarning('Not exported, plug(s) not found: %s%s' % (
+            ', '.join(missing[:10]), ' and %d more' % (len(missing) - 10) if len(missing) > 10 else ''))
+
+    return columns, plugs
+
+
+def sample_plugs(plugs, frames):
+    """
+    Evaluates every plug at every frame, with frames in the outer loop,
+    without changing the scene's current time.
+    :param plugs: Array of MPlugs
+    :param frames: Array of frames
+    :return: Generator of (frame, list of plug values) tuples
+    """
+    unit = OpenMaya.MTime.uiUnit()
+
+    for frame in frames:
+        context = OpenMaya.MDGContext(OpenMaya.MTime(frame, unit))
+        yield frame, [plug.asDouble(context) for plug in plugs]
+
+
+def export_samples(lights, start, end, path, attributes=EXPORT_ATTRIBUTES, step=1.0):
+    """
+    Samples light attributes over a frame range and streams one row per frame to a file.
+    Files ending in '.npy' are written as NumPy arrays, any other one as CSV. The first
+    column holds the frame.
+    :param lights: Array of light Transform node names
+    :param start: First frame
+    :param end: Last frame, included
+    :param path: File path to write
+    :param attributes: Array of light attribute names to sample
+    :param step: Frames between samples
+    :return: Number of rows written
+    """
+    columns, plugs = light_plugs(lights, attributes)
+    frames = frame_range(start, end, step)
+
+    writer_class = NpyWriter if path.lower().endswith('.npy') else CsvWriter
+    writer = writer_class(path, ['frame'] + columns, len(frames))
+
+    try:
+        for frame, values in sample_plugs(plugs, frames):
+            writer.write([frame] + values)
+    finally:
+        writer.close()
+
+    return len(frames)
@@ -0,0 +1,235 @@
+__author__ = 'Carlos Montes'
+
+''' Solos and mutes many lights at once through a single undoable DG modifier, and restores them exactly. '''
+
+import maya.cmds as cmds
+import maya.OpenMaya as OpenMaya
+import maya.OpenMayaMPx as OpenMayaMPx
+
+import mayautils
+
+
+COMMAND_NAME = 'lightInterfaceSetPlugs'
+
+# Attributes switched by each mode; visibility hides the light, emit keeps it visible but dark
+MODE_ATTRIBUTES = {
+    'visibility': ('visibility',),
+    'emit': ('emitDiffuse', 'emitSpecular')
+}
+
+
+def light_plugs(lights, mode):
+    """
+    Looks up the plugs a mode switches. Lights or attributes that don't exist, like
+    the emit attributes of ambient lights, are skipped.
+    :param lights: Array of light Transform node names
+    :param mode: Key of MODE_ATTRIBUTES
+    :return: List of (plug name, MPlug) tuples
+    """
+    plugs = []
+    selection = OpenMaya.MSelectionList()
+
+    for light in lights:
+        for attribute in MODE_ATTRIBUTES[mode]:
+            name = '%s.%s' % (light, attribute)
+            plug = OpenMaya.MPlug()
+            try:
+                selection.clear()
+                selection.add(name)
+                selection.getPlug(0, plug)
+            except RuntimeError:
+                continue
+
+            plugs.append((name, plug))
+
+    return plugs
+
+
+def plug_path(plug):
+    """
+    :param plug: MPlug of a DAG node's attribute
+    :return: 'node.attribute' name of the plug, with the node's shortest unique DAG path
+    """
+    path = OpenMaya.MDagPath()
+    OpenMaya.MDagPath.getAPathTo(plug.node(), path)
+    return '%s.%s' % (path.partialPathName(), OpenMaya.MFnAttribute(plug.attribute()).name())
+
+
+def set_plugs(plugs, values):
+    """
+    Sets many boolean plugs as a single undo step, through the lightInterfaceSetPlugs command.
+    :param plugs: Array of 'node.attribute' plug names
+    :param values: Array of booleans, in the same order as plugs
+    :return: Number of plugs written
+    """
+    if not plugs:
+        return 0
+
+    mayautils.load_plugin(__file__)
+    return getattr(cmds, COMMAND_NAME)(plug=list(plugs), value=[bool(value) for value in values])
+
+
+class SoloMute(object):
+    """
+    Switches lights on and off in batches. The state every plug had before it was first
+    switched is kept in a state vector, so restore() brings back exactly that state.
+    """
+
+    def __init__(self):
+        """
+        :return: None
+        """
+        # Plug names in the order they were saved, and
+        # plug name -> (MPlug, MObjectHandle of its node, original value)
+        self.saved_order = []
+        self.saved = {}
+
+    def __len__(self):
+        return len(self.saved)
+
+    def solo(self, lights, all_lights, mode):
+        """
+        Switch on some lights and switch off every other one.
+        :param lights: Array of light Transform node names to keep on
+        :param all_lights: Array of every light Transform node name
+        :param mode: Key of MODE_ATTRIBUTES
+        :return: Number of plugs written
+        """
+        return self._switch(light_plugs(all_lights, mode), set(lights))
+
+    def mute(self, lights, mode, state=False):
+        """
+        Switch some lights off, or back on.
+        :param lights: Array of light Transform node names
+        :param mode: Key of MODE_ATTRIBUTES
+        :param state: False to mute the lights, True to unmute them
+        :return: Number of plugs written
+        """
+        return self._switch(light_plugs(lights, mode), set(lights) if state else set())
+
+    def restore(self):
+        """
+        Write back the values the switched plugs had before they were first switched,
+        as a single undo step, and forget them. Plugs of deleted lights are skipped.
+        :return: Number of plugs written
+        """
+        plugs = []
+        values = []
+
+        for name in self.saved_order:
+            plug, handle, value = self.saved[name]
+
+            if handle.isValid():
+                plugs.append(plug_path(plug))
+                values.append(value)
+
+        count = set_plugs(plugs, values)
+        self.clear()
+        return count
+
+    def clear(self):
+        """
+        Forget the saved state vector, e.g. when another scene is opened.
+        :return: None
+        """
+        self.saved_order = []
+        self.saved = {}
+
+    def _switch(self, plugs, lights_on):
+        """
+        Save the original value of the plugs that haven't been saved yet, then
+        write the new values as a single undo step.
+        :param plugs: Array of (plug name, MPlug) tuples
+        :param lights_on: Set of light Transform node names whose plugs are switched on
+        :return: Number of plugs written
+        """
+        for name, plug in plugs:
+            if name not in self.saved:
+                self.saved[name] = (plug, OpenMaya.MObjectHandle(plug.node()), plug.asBool())
+                self.saved_order.append(name)
+
+        return set_plugs([name for name, _ in plugs],
+                         [name.rsplit('.', 1)[0] in lights_on for name, _ in plugs])
+
+
+class SetPlugsCommand(OpenMayaMPx.MPxCommand):
+    """
+    lightInterfaceSetPlugs -plug node.attribute -value on/off [-plug ... -value ...]
+    Sets every boolean plug with the same MDGModifier, so undo and redo are a single
+    step. Plugs that can't be found are skipped; the result is the number of plugs set.
+    """
+
+    def __init__(self):
+        OpenMayaMPx.MPxCommand.__init__(self)
+        self.modifier = OpenMaya.MDGModifier()
+        self.count = 0
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, arguments):
+        database = OpenMaya.MArgDatabase(self.syntax(), arguments)
+        uses = database.numberOfFlagUses('-p')
+
+        if database.numberOfFlagUses('-v') != uses:
+            raise RuntimeError('Every -plug needs a -value')
+
+        selection = OpenMaya.MSelectionList()
+
+        for use in range(uses):
+            plug_arguments = OpenMaya.MArgList()
+            database.getFlagArgumentList('-p', use, plug_arguments)
+            value_arguments = OpenMaya.MArgList()
+            database.getFlagArgumentList('-v', use, value_arguments)
+
+            plug = OpenMaya.MPlug()
+            try:
+                selection.clear()
+                selection.add(plug_arguments.asString(0))
+                selection.getPlug(0, plug)
+            except RuntimeError:
+                continue
+
+            self.modifier.newPlugValueBool(plug, value_arguments.asBool(0))
+            self.count += 1
+
+        self.redoIt()
+
+    def redoIt(self):
+        self.modifier.doIt()
+        self.setResult(self.count)
+
+    def undoIt(self):
+        self.modifier.undoIt()
+
+    @staticmethod
+    def creator():
+        return OpenMayaMPx.asMPxPtr(SetPlugsCommand())
+
+    @staticmethod
+    def syntax_creator():
+        syntax = OpenMaya.MSyntax()
+        syntax.addFlag('-p', '-plug', OpenMaya.MSyntax.kString)
+        syntax.makeFlagMultiUse('-p')
+        syntax.addFlag('-v', '-value', OpenMaya.MSyntax.kBoolean)
+        syntax.makeFlagMultiUse('-v')
+
+        return syntax
+
+
+def initializePlugin(plugin):
+    """
+    Registers the command when Maya loads this module as a plugin.
+    :param plugin: MObject of the plugin
+    :return: None
+    """
+    mayautils.register_command(plugin, COMMAND_NAME, SetPlugsCommand)
+
+
+def uninitializePlugin(plugin):
+    """
+    Deregisters the command when Maya unloads this module as a plugin.
+    :param plugin: MObject of the plugin
+    :return: None
+    """
+    mayautils.deregister_command(plugin, COMMAND_NAME)
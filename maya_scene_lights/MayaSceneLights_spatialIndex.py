@@ -0,0 +1,246 @@
+__author__ = 'Carlos Montes'
+
+''' KD-tree of light world-space positions, for radius, box and camera frustum queries. '''
+
+import math
+
+
+class SpatialIndex(object):
+    """
+    KD-tree over light positions. Moved, added and removed lights are kept in a small
+    dirty set that is checked linearly, and the tree is rebuilt once that set grows
+    past a fraction of the lights.
+    """
+
+    # Fraction of lights that can be dirty before the tree is rebuilt
+    REBUILD_FRACTION = 0.125
+
+    # Minimum number of dirty lights before the tree is rebuilt
+    REBUILD_MINIMUM = 32
+
+    def __init__(self):
+        """
+        :return: None
+        """
+        # Dictionary of light name -> (x, y, z) world-space position
+        self.positions = {}
+
+        # Names whose position in the tree is stale, missing or removed
+        self.dirty = set()
+
+        # Root node of the tree, as [name, point, axis, left, right, box_min, box_max]
+        self.root = None
+
+    def __len__(self):
+        return len(self.positions)
+
+    def build(self, positions):
+        """
+        Rebuild the whole tree.
+        :param positions: Dictionary of light name -> (x, y, z) world-space position
+        :return: None
+        """
+        self.positions = dict(positions)
+        self.dirty = set()
+        self.root = self._build_node(list(self.positions.items()), 0)
+
+    def update(self, name, position):
+        """
+        Move a light, or add it if it isn't indexed yet.
+        :param name: Light name
+        :param position: (x, y, z) world-space position
+        :return: None
+        """
+        self.positions[name] = tuple(position)
+        self._mark_dirty(name)
+
+    def remove(self, name):
+        """
+        Stop indexing a light.
+        :param name: Light name
+        :return: None
+        """
+        if self.positions.pop(name, None) is not None:
+            self._mark_dirty(name)
+
+    def sync(self, positions):
+        """
+        Update the lights whose position differs from the indexed one, add the
+        new ones and remove the ones that are missing.
+        :param positions: Dictionary of light name -> (x, y, z) world-space position
+        :return: Number of lights that changed
+        """
+        changed = 0
+
+        for name in [name for name in self.positions if name not in positions]:
+            self.remove(name)
+            changed += 1
+
+        for name, position in positions.items():
+            if self.positions.get(name) != tuple(position):
+                self.update(name, position)
+                changed += 1
+
+        return changed
+
+    def radius(self, center, distance):
+        """
+        :param center: (x, y, z) center of the sphere
+        :param distance: Radius of the sphere
+        :return: List of names of the lights inside the sphere
+        """
+        squared = distance * distance
+
+        def overlaps(box_min, box_max):
+            gap = 0.0
+            for axis in range(3):
+                if center[axis] < box_min[axis]:
+                    gap += (box_min[axis] - center[axis]) ** 2
+                elif center[axis] > box_max[axis]:
+                    gap += (center[axis] - box_max[axis]) ** 2
+            return gap <= squared
+
+        def contains(point):
+            return sum((point[axis] - center[axis]) ** 2 for axis in range(3)) <= squared
+
+        return self._query(overlaps, contains)
+
+    def box(self, corner_min, corner_max):
+        """
+        :param corner_min: (x, y, z) lowest corner of an axis-aligned box
+        :param corner_max: (x, y, z) highest corner of an axis-aligned box
+        :return: List of names of the lights inside the box
+        """
+        def overlaps(box_min, box_max):
+            return all(box_min[axis] <= corner_max[axis] and box_max[axis] >= corner_min[axis]
+                       for axis in range(3))
+
+        def contains(point):
+            return all(corner_min[axis] <= point[axis] <= corner_max[axis] for axis in range(3))
+
+        return self._query(overlaps, contains)
+
+    def frustum(self, planes):
+        """
+        :param planes: Array of (nx, ny, nz, d) planes whose normals point inwards,
+        as returned by frustum_planes()
+        :return: List of names of the lights inside every plane
+        """
+        def overlaps(box_min, box_max):
+            for nx, ny, nz, d in planes:
+                # Corner of the box that is furthest along the plane's normal
+                x = box_max[0] if nx >= 0 else box_min[0]
+                y = box_max[1] if ny >= 0 else box_min[1]
+                z = box_max[2] if nz >= 0 else box_min[2]
+                if nx * x + ny * y + nz * z + d < 0:
+                    return False
+            return True
+
+        def contains(point):
+            return all(nx * point[0] + ny * point[1] + nz * point[2] + d >= 0
+                       for nx, ny, nz, d in planes)
+
+        return self._query(overlaps, contains)
+
+    def _build_node(self, items, depth):
+        """
+        Recursively build a subtree, splitting at the median of the axis with the widest spread.
+        :param items: Array of (name, (x, y, z)) tuples
+        :param depth: Depth of the node, used when every axis has the same spread
+        :return: Node list, or None for an empty subtree
+        """
+        if not items:
+            return None
+
+        box_min = tuple(min(point[axis] for _, point in items) for axis in range(3))
+        box_max = tuple(max(point[axis] for _, point in items) for axis in range(3))
+
+        spreads = [box_max[axis] - box_min[axis] for axis in range(3)]
+        axis = spreads.index(max(spreads)) if max(spreads) > 0 else depth % 3
+
+        items.sort(key=lambda item: item[1][axis])
+        median = len(items) // 2
+        name, point = items[median]
+
+        return [name, point, axis,
+                self._build_node(items[:median], depth + 1),
+                self._build_node(items[median + 1:], depth + 1),
+                box_min, box_max]
+
+    def _mark_dirty(self, name):
+        """
+        Remember that a light's position in the tree is stale, rebuilding when too many are.
+        :param name: Light name
+        :return: None
+        """
+        self.dirty.add(name)
+
+        if len(self.dirty) > max(self.REBUILD_MINIMUM, len(self.positions) * self.REBUILD_FRACTION):
+            self.build(self.positions)
+
+    def _query(self, overlaps, contains):
+        """
+        Walk the tree, skipping the subtrees whose bounds don't overlap the query region,
+        then check the dirty lights one by one.
+        :param overlaps: Callable(box_min, box_max) that tells whether a region may hold results
+        :param contains: Callable(point) that tells whether a point is a result
+        :return: List of light names
+        """
+        results = []
+        stack = [self.root] if self.root is not None else []
+
+        while stack:
+            name, point, axis, left, right, box_min, box_max = stack.pop()
+
+            if not overlaps(box_min, box_max):
+                continue
+
+            if name not in self.dirty and contains(point):
+                results.append(name)
+
+            if left is not None:
+                stack.append(left)
+            if right is not None:
+                stack.append(right)
+
+        for name in self.dirty:
+            point = self.positions.get(name)
+            if point is not None and contains(point):
+                results.append(name)
+
+        return results
+
+
+def frustum_planes(eye, view, up, right, horizontal_fov, vertical_fov, near, far):
+    """
+    Compute the six planes of a perspective camera's view frustum.
+    :param eye: (x, y, z) world-space position of the camera
+    :param view: Normalized (x, y, z) viewing direction
+    :param up: Normalized (x, y, z) up direction
+    :param right: Normalized (x, y, z) right direction
+    :param horizontal_fov: Horizontal field of view, in radians
+    :param vertical_fov: Vertical field of view, in radians
+    :param near: Near clipping distance
+    :param far: Far clipping distance
+    :return: List of (nx, ny, nz, d) planes, with normals pointing inside the frustum
+    """
+    def plane(normal, point):
+        return (normal[0], normal[1], normal[2],
+                -(normal[0] * point[0] + normal[1] * point[1] + normal[2] * point[2]))
+
+    def combine(a, scale_a, b, scale_b):
+        return tuple(a[axis] * scale_a + b[axis] * scale_b for axis in range(3))
+
+    half_width = math.tan(horizontal_fov / 2.0)
+    half_height = math.tan(vertical_fov / 2.0)
+
+    near_point = combine(eye, 1.0, view, near)
+    far_point = combine(eye, 1.0, view, far)
+
+    # Side planes go through the eye; their normals lean from the side direction towards the view
+    return [plane(view, near_point),
+            plane(tuple(-component for component in view), far_point),
+            plane(combine(view, half_width, right, 1.0), eye),
+            plane(combine(view, half_width, right, -1.0), eye),
+            plane(combine(view, half_height, up, 1.0), eye),
+            plane(combine(view, half_height, up, -1.0), eye)]
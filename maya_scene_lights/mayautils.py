@@ -2,24 +2,281 @@
 
 ''' Utility functions, context managers and decorators related to Maya functionality. '''
 
-import pymel.core as pmc
+import os
+
+import maya.cmds as cmds
+import maya.OpenMaya as OpenMaya
+import maya.OpenMayaMPx as OpenMayaMPx
+
+
+def transform_name(node):
+    """
+    Retrieves the shortest unique name of a DAG node's Transform.
+    :param node: MObject of a Transform or a shape node
+    :return: String with the Transform's partial path name
+    """
+    path = OpenMaya.MDagPath()
+    OpenMaya.MDagPath.getAPathTo(node, path)
+
+    if not node.hasFn(OpenMaya.MFn.kTransform):
+        path.pop()
+
+    return path.partialPathName()
+
+
+def node_handles(names):
+    """
+    Retrieves an MObjectHandle for each of several nodes, with a single selection list.
+    :param names: Array of node names
+    :return: List of MObjectHandles, None where the node doesn't exist
+    """
+    handles = []
+    selection = OpenMaya.MSelectionList()
+
+    for name in names:
+        node = OpenMaya.MObject()
+        try:
+            selection.clear()
+            selection.add(name)
+            selection.getDependNode(0, node)
+        except RuntimeError:
+            handles.append(None)
+            continue
+
+        handles.append(OpenMaya.MObjectHandle(node))
+
+    return handles
+
+
+def light_names(lights):
+    """
+    Resolves lights given by name or by MObjectHandle to their current Transform names,
+    so a handle keeps pointing to its light after a rename.
+    :param lights: Array of light Transform node names and/or MObjectHandles
+    :return: List of names; handles of deleted nodes are left out
+    """
+    names = []
+
+    for light in lights:
+        if isinstance(light, OpenMaya.MObjectHandle):
+            if light.isValid():
+                names.append(transform_name(light.object()))
+        else:
+            names.append(light)
+
+    return names
+
+
+def world_positions(names):
+    """
+    Retrieves the world-space translation of several DAG nodes through the Maya API.
+    :param names: Array of DAG node names
+    :return: Dictionary of name -> (x, y, z); nodes that don't exist are left out
+    """
+    positions = {}
+    selection = OpenMaya.MSelectionList()
+    path = OpenMaya.MDagPath()
+
+    for name in names:
+        try:
+            selection.clear()
+            selection.add(name)
+            selection.getDagPath(0, path)
+        except RuntimeError:
+            continue
+
+        matrix = path.inclusiveMatrix()
+        positions[name] = (matrix(3, 0), matrix(3, 1), matrix(3, 2))
+
+    return positions
+
+
+def camera_frustum(camera):
+    """
+    Retrieves what's needed to compute the view frustum of a perspective camera.
+    :param camera: Name of the camera's Transform or shape node
+    :return: Tuple of (eye, view, up, right, horizontal fov, vertical fov, near, far),
+    with vectors as (x, y, z) tuples in world space and angles in radians
+    """
+    selection = OpenMaya.MSelectionList()
+    selection.add(camera)
+    path = OpenMaya.MDagPath()
+    selection.getDagPath(0, path)
+
+    if path.node().hasFn(OpenMaya.MFn.kTransform):
+        path.extendToShape()
+
+    fn_camera = OpenMaya.MFnCamera(path)
+
+    if fn_camera.isOrtho():
+        raise RuntimeError('Orthographic camera %s has no perspective frustum' % camera)
+
+    def as_tuple(vector):
+        return vector.x, vector.y, vector.z
+
+    world = OpenMaya.MSpace.kWorld
+
+    return (as_tuple(fn_camera.eyePoint(world)),
+            as_tuple(fn_camera.viewDirection(world)),
+            as_tuple(fn_camera.upDirection(world)),
+            as_tuple(fn_camera.rightDirection(world)),
+            fn_camera.horizontalFieldOfView(),
+            fn_camera.verticalFieldOfView(),
+            fn_camera.nearClippingPlane(),
+            fn_camera.farClippingPlane())
+
+
+def load_plugin(module_file):
+    """
+    Loads a module that registers a command as a Maya plugin, unless it's loaded already.
+    :param module_file: __file__ of the module; its .py source is loaded, even if it was imported compiled
+    :return: None
+    """
+    path = os.path.splitext(os.path.abspath(module_file))[0] + '.py'
+
+    if not cmds.pluginInfo(path, query=True, loaded=True):
+        cmds.loadPlugin(path, quiet=True)
+
+
+def register_command(plugin, name, command):
+    """
+    Registers a command from a plugin module's initializePlugin().
+    :param plugin: MObject of the plugin
+    :param name: Name of the command
+    :param command: MPxCommand subclass, with creator() and syntax_creator() static methods
+    :return: None
+    """
+    OpenMayaMPx.MFnPlugin(plugin, __author__, '1.0', 'Any').registerCommand(
+        name, command.creator, command.syntax_creator)
+
+
+def deregister_command(plugin, name):
+    """
+    Deregisters a command from a plugin module's uninitializePlugin().
+    :param plugin: MObject of the plugin
+    :param name: Name of the command
+    :return: None
+    """
+    OpenMayaMPx.MFnPlugin(plugin).deregisterCommand(name)
+
+
+def require_numpy(feature):
+    """
+    Imports NumPy for a feature that needs it. Features import it the first time they
+    run, so it isn't loaded with the window.
+    :param feature: Name of the feature, for the error message
+    :return: numpy module
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError('%s needs NumPy, which is not available in this Maya session' % feature)
+
+    return numpy
 
 
 # Context manager that opens an undo chunk when entered, and closes it on exit
 class undo_chunk(object):
     def __enter__(self):
-        pmc.undoInfo(openChunk=True)
+        cmds.undoInfo(openChunk=True)
         
     def __exit__(self, *_):
-        pmc.undoInfo(closeChunk=True)
+        cmds.undoInfo(closeChunk=True)
 
 
 # Create and close an undo chunk, and undo  in case of an error
 class undo_on_error(object):
     def __enter__(self):
-        pmc.undoInfo(openChunk=True)
+        cmds.undoInfo(openChunk=True)
         
     def __exit__(self, exc_type, exc_val, exc_tb):
-        pmc.undoInfo(closeChunk=True)
+        cmds.undoInfo(closeChunk=True)
         if exc_val is not None:
-            pmc.undo()
\ No newline at end of file
+            cmds.undo()
+
+
+class CallbackRegistry(object):
+    """
+    Keeps Maya API callback ids by name, so that there is never more than one live
+    callback per name and every callback can be removed deterministically.
+    """
+
+    def __init__(self):
+        """
+        :return: None
+        """
+        # Dictionary of callback name -> Maya API callback id
+        self.callbacks = {}
+
+        # Names of the callbacks that only make sense for the currently open scene
+        self.scene_scoped = set()
+
+    def __contains__(self, name):
+        return name in self.callbacks
+
+    def __len__(self):
+        return len(self.callbacks)
+
+    def add(self, name, callback_id, scene_scoped=False):
+        """
+        Register a callback id under a name, removing the callback previously registered with it.
+        :param name: Name that identifies the callback
+        :param callback_id: Id returned by a Maya API add*Callback function
+        :param scene_scoped: True if the callback must be removed when another scene is opened
+        :return: None
+        """
+        self.remove(name)
+        self.callbacks[name] = callback_id
+
+        if scene_scoped:
+            self.scene_scoped.add(name)
+
+    def remove(self, name):
+        """
+        Remove the callback registered under a name, if any.
+        :param name: Name that identifies the callback
+        :return: True if a callback was registered under that name
+        """
+        callback_id = self.callbacks.pop(name, None)
+        self.scene_scoped.discard(name)
+
+        if callback_id is None:
+            return False
+
+        try:
+            OpenMaya.MMessage.removeCallback(callback_id)
+        except RuntimeError:
+            print "No Maya API Callback {} to close".format(name)
+
+        return True
+
+    def remove_all(self):
+        """
+        Remove every registered callback.
+        :return: None
+        """
+        for name in list(self.callbacks):
+            self.remove(name)
+
+    def remove_scene_scoped(self):
+        """
+        Remove the callbacks that were registered for the currently open scene only.
+        :return: None
+        """
+        for name in list(self.scene_scoped):
+            self.remove(name)
+
+    def active(self):
+        """
+        :return: Sorted list with the names of the live callbacks
+        """
+        return sorted(self.callbacks)
+
+    def report(self):
+        """
+        :return: Human readable summary of the live callbacks
+        """
+        lines = ['%d live Maya API callback(s)' % len(self)]
+        lines.extend('  %s%s' % (name, ' (scene)' if name in self.scene_scoped else '')
+                     for name in self.active())
+        return '\n'.join(lines)
\ No newline at end of file